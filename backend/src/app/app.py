@@ -1,23 +1,22 @@
-from pathlib import Path
-from flask import Flask, request
+from flask import Flask, Response, request, stream_with_context
 from flask_cors import CORS
 import argparse
-import multiprocessing
 import os
+import threading
 import time
 from uuid import UUID, uuid4
 
-from ..components.pipeline_runner import PipelineRunner
 from ..components.data_loader import AppDataLoader
 from ..components.logger_component import AppLogger
 import logging
-from silero_vad import load_silero_vad
-from speechbrain.inference.classifiers import EncoderClassifier
-import torch
-from faster_whisper import WhisperModel
 from ..dataclasses.inputs.caption import CaptionInput
 from ..dataclasses.inputs.caption_status import CaptionStatus
 from ..dataclasses.inputs.status import Status
+from .job_broker import JobBroker
+from .job_cost import estimate_job_cost
+from .status_index import StatusIndex
+from .worker_pool import start_host_pool
+from .worker_registry import WorkerRegistry
 
 
 parser = argparse.ArgumentParser()
@@ -28,123 +27,96 @@ PROD = os.environ.get("MAC_PROD", "1") == "1"
 app = Flask(__name__)
 CORS(app)
 
-MP_CTX = multiprocessing.get_context("spawn")
+# size of the host's inference worker pool; each worker holds its own copy of the models
+NUM_WORKERS = int(os.environ.get("MAC_NUM_WORKERS", "1"))
+# torch/CTranslate2 threads per worker, 0 splits the cores evenly between workers
+THREADS_PER_WORKER = int(os.environ.get("MAC_THREADS_PER_WORKER", "0"))
+# /caption answers 429 when a new job would wait longer than this (estimated
+# seconds, shortest-job-first) before a worker on this host picks it up
+MAX_WAIT_S = float(os.environ.get("MAC_MAX_WAIT_SECONDS", "3600"))
+# spawn (and warm) the inference workers at boot instead of on the first /caption
+START_POOL_ON_BOOT = os.environ.get("MAC_START_POOL_ON_BOOT", "1") == "1"
+# how often /caption/events re-reads the status index, and how long one stream lives
+# before the client (EventSource) is told to reconnect
+SSE_POLL_INTERVAL_S = float(os.environ.get("MAC_SSE_POLL_INTERVAL_S", "0.5"))
+SSE_MAX_STREAM_S = float(os.environ.get("MAC_SSE_MAX_STREAM_S", "300"))
+SSE_KEEPALIVE_S = 15
+# jobs this host has never seen are looked up in S3, much less often
+SSE_S3_POLL_INTERVAL_S = 5.0
 
-_worker_proc = None
-_job_queue = None
+_broker: JobBroker | None = None
+_status_index: StatusIndex | None = None
+_status_loader: AppDataLoader | None = None
+_worker_registry: WorkerRegistry | None = None
+_stores_lock = threading.Lock()
 
 
-def load_asr_model() -> WhisperModel:
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    compute_type = "float16" if torch.cuda.is_available() else "float32"
-    return WhisperModel("small", device=device, compute_type=compute_type)
+def _get_broker() -> JobBroker:
+    global _broker
 
+    with _stores_lock:
+        if _broker is None:
+            _broker = JobBroker()
+        return _broker
 
-def load_slid_model():
-    return EncoderClassifier.from_hparams(
-        source="speechbrain/lang-id-voxlingua107-ecapa",
-        savedir=Path(__file__).parent.parent
-        / "pretrained_models"
-        / "lang-id-voxlingua107-ecapa",
-    )
 
+def _get_status_index() -> StatusIndex:
+    global _status_index
 
-def load_vad_model():
-    return load_silero_vad()
+    with _stores_lock:
+        if _status_index is None:
+            _status_index = StatusIndex()
+        return _status_index
 
 
-def _worker_main(job_queue: multiprocessing.Queue):
-    """
-    Long-lived worker process:
-    - loads models once
-    - processes jobs sequentially
-    """
-    # Load models ONCE here (most reliable + avoids per-job spikes).
-    vad_model = load_vad_model()
-    slid_model = load_slid_model()
-    asr_model = load_asr_model()
+def _get_worker_registry() -> WorkerRegistry:
+    global _worker_registry
 
-    while True:
-        job = job_queue.get()
-        if job is None:
-            # shutdown sentinel
-            break
+    with _stores_lock:
+        if _worker_registry is None:
+            _worker_registry = WorkerRegistry()
+        return _worker_registry
 
-        job_id_str = job["job_id"]
-        payload = job["payload"]
-        prod_mode = job["prod_mode"]
 
-        job_id = UUID(job_id_str)
-
-        logger = AppLogger(
-            log_suffix=f"job_{job_id_str}", level=logging.INFO, prod=prod_mode
-        )
-        loader = AppDataLoader(logger=logger, prod=prod_mode)
+def _get_status_loader() -> AppDataLoader:
+    """One S3 loader per web process for status fallbacks, instead of one per poll."""
+    global _status_loader
 
-        try:
-            # mark as pending (again) in case caller failed before writing it
-            status_obj = CaptionStatus(
-                job_id=job_id, status=Status.PENDING, message="Processing started"
-            )
-            loader.upload_status_file(status_obj)
-
-            input_data = CaptionInput(**payload)
-
-            runner = PipelineRunner(
-                file_path=input_data.upload_url,
-                vad_model=vad_model,
-                slid_model=slid_model,
-                asr_model=asr_model,
-                convert_to=input_data.convert_to,
-                explicit_langs=input_data.explicit_langs,
-                prod=prod_mode,
-            )
-
-            s3_download_url: str = runner.run(
-                caption_color=input_data.caption_color,
-                font_size=input_data.font_size,
-                stroke_width=input_data.stroke_width,
-            )
-
-            status_obj = CaptionStatus(
-                job_id=job_id,
-                status=Status.COMPLETED,
-                output_url=s3_download_url,
-                message="Processing completed successfully",
-            )
-            loader.upload_status_file(status_obj)
-
-        except Exception as e:
-            logger.logger.error(f"Job {job_id_str} failed: {e}")
-            status_obj = CaptionStatus(
-                job_id=job_id, status=Status.FAILED, message=str(e)
-            )
-            loader.upload_status_file(status_obj)
-        finally:
-            logger.stop()
-            # If you do any local temp files, do cleanup here for prod
-            if prod_mode:
-                try:
-                    loader.cleanup_temp_files()
-                except Exception:
-                    pass
+    with _stores_lock:
+        if _status_loader is None:
+            logger = AppLogger(log_suffix="status_check", level=logging.INFO, prod=PROD)
+            _status_loader = AppDataLoader(logger=logger, prod=PROD)
+        return _status_loader
 
 
 def _ensure_worker_started():
     """
-    Start a single long-lived worker process lazily (on first /caption call).
-    Designed for the "I only need 1–2 users" scenario.
+    Make sure the host's inference pool is running (lazily, on /caption calls).
+    Only the first web process to grab the pool lock starts workers; every
+    other gunicorn worker just submits to the shared broker.
     """
-    global _worker_proc, _job_queue
+    start_host_pool(num_workers=NUM_WORKERS, threads_per_worker=THREADS_PER_WORKER)
+
 
-    if _worker_proc is not None and _worker_proc.is_alive():
+def _start_pool_on_boot():
+    """
+    Spawn the inference workers when the app boots, so models are loaded and
+    warmed before the first /caption arrives and jobs a previous run left in
+    the broker (deploy, crash) are drained right away.
+    """
+    if not START_POOL_ON_BOOT:
         return
 
-    # (Re)create queue + worker
-    _job_queue = MP_CTX.Queue(maxsize=8)  # small queue to avoid runaway memory
-    _worker_proc = MP_CTX.Process(target=_worker_main, args=(_job_queue,))
-    _worker_proc.daemon = False
-    _worker_proc.start()
+    try:
+        backlog = _get_broker().backlog()
+        if backlog["queued"] or backlog["running"]:
+            print(
+                f"Resuming {backlog['queued']} queued and {backlog['running']} interrupted job(s)"
+            )
+        _ensure_worker_started()
+    except Exception as e:
+        # /caption retries lazily, don't keep the web process from booting
+        print(f"Could not start inference pool on boot: {e}")
 
 
 if PROD:
@@ -154,6 +126,8 @@ else:
     app.config["MODE"] = "dev"
     print("Running in DEVELOPMENT mode")
 
+_start_pool_on_boot()
+
 
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -161,6 +135,38 @@ def health_check():
     return "OK", 200
 
 
+@app.route("/ready", methods=["GET"])
+def ready_check():
+    """
+    503 until at least one inference worker on this host has loaded and warmed
+    its models. Reports every worker's state and per-model load/warm-up times.
+    """
+    try:
+        workers = _get_worker_registry().workers()
+    except Exception as e:
+        return {"ready": False, "message": f"Error reading worker registry: {str(e)}"}, 503
+
+    ready_workers = sum(w["state"] == "ready" for w in workers)
+    body = {
+        "ready": ready_workers > 0,
+        "ready_workers": ready_workers,
+        "workers_expected": NUM_WORKERS,
+        "workers": workers,
+    }
+    return body, 200 if body["ready"] else 503
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Host queue depth and estimated backlog, for autoscaling."""
+    backlog = _get_broker().backlog()
+    backlog["workers"] = NUM_WORKERS
+    backlog["backlog_seconds_per_worker"] = round(
+        backlog["backlog_seconds"] / max(1, NUM_WORKERS), 1
+    )
+    return backlog, 200
+
+
 @app.route("/presigned", methods=["GET"])
 def presigned_s3():
     filename = request.args.get("filename")
@@ -191,16 +197,23 @@ def caption():
 
     job_id = uuid4()
 
-    # Write a "queued/accepted" status immediately so polling works even if worker is booting.
     logger = AppLogger(log_suffix="status_accept", level=logging.INFO, prod=PROD)
     loader = AppDataLoader(logger=logger, prod=PROD)
     try:
+        # cheap header-only probe so scheduling/admission can weigh the job by its length
+        try:
+            duration_s = loader.probe_duration(input_data.upload_url)
+        except Exception:
+            duration_s = None  # estimate_job_cost falls back to a pessimistic guess
+        est_cost = estimate_job_cost(input_data, duration_s)
+
+        # Write a "queued/accepted" status immediately so polling works even if worker is booting.
         status_obj = CaptionStatus(
             job_id=job_id,
             status=Status.PENDING,
             message="Job accepted and queued",
         )
-        loader.upload_status_file(status_obj)
+        _get_status_index().publish(status_obj, loader)
     finally:
         logger.stop()
         if PROD:
@@ -209,27 +222,33 @@ def caption():
             except Exception:
                 pass
 
-    # Start worker if needed and enqueue job as plain dict (avoid pickle issues).
+    # Start workers if needed and enqueue job as plain dict (avoid pickle issues).
     _ensure_worker_started()
-    assert _job_queue is not None
 
     payload = input_data.model_dump(mode="json")
     try:
-        _job_queue.put(
-            {"job_id": str(job_id), "payload": payload, "prod_mode": PROD},
-            block=False,
+        accepted = _get_broker().submit(
+            job_id=str(job_id),
+            payload=payload,
+            prod_mode=PROD,
+            est_cost=est_cost,
+            num_workers=NUM_WORKERS,
+            max_wait_s=MAX_WAIT_S,
         )
     except Exception:
-        # Queue full or worker down
+        accepted = False
+
+    if not accepted:
+        # Queue full or workers down
         fail_logger = AppLogger(log_suffix="status_reject", level=logging.INFO, prod=PROD)
         fail_loader = AppDataLoader(logger=fail_logger, prod=PROD)
         try:
             status_obj = CaptionStatus(
                 job_id=job_id,
                 status=Status.FAILED,
-                message="Server busy: job queue is full",
+                message=f"Server busy: estimated wait exceeds {MAX_WAIT_S:.0f}s",
             )
-            fail_loader.upload_status_file(status_obj)
+            _get_status_index().publish(status_obj, fail_loader)
         finally:
             fail_logger.stop()
         return {"job_id": str(job_id), "message": "Server busy"}, 429
@@ -237,6 +256,44 @@ def caption():
     return {"job_id": str(job_id), "message": "Job accepted and processing started"}, 202
 
 
+@app.route("/caption", methods=["DELETE"])
+def cancel_caption():
+    """
+    Cancel a job. Queued jobs are removed immediately; running jobs are
+    signalled and stop at their next stage/segment/frame check, after which
+    the worker publishes the CANCELLED status itself.
+    """
+    if "job_id" not in request.args:
+        return "job_id is required", 400
+    try:
+        job_id = UUID(request.args.get("job_id"))
+    except ValueError as e:
+        return f"Invalid job_id: {str(e)}", 400
+
+    try:
+        state = _get_broker().cancel(str(job_id))
+    except Exception as e:
+        return f"Error cancelling job: {str(e)}", 500
+
+    if state is None:
+        return {"job_id": str(job_id), "message": "Job not found or already finished"}, 404
+
+    if state == "running":
+        return {"job_id": str(job_id), "message": "Cancellation requested"}, 202
+
+    # never reached a worker, so nobody else will record the outcome
+    logger = AppLogger(log_suffix="status_cancel", level=logging.INFO, prod=PROD)
+    loader = AppDataLoader(logger=logger, prod=PROD)
+    try:
+        status_obj = CaptionStatus(
+            job_id=job_id, status=Status.CANCELLED, message="Job cancelled"
+        )
+        _get_status_index().publish(status_obj, loader)
+    finally:
+        logger.stop()
+    return {"job_id": str(job_id), "message": "Job cancelled"}, 200
+
+
 @app.route("/caption/status", methods=["GET"])
 def caption_status():
     try:
@@ -245,17 +302,92 @@ def caption_status():
 
         job_id = UUID(request.args.get("job_id"))
 
-        logger = AppLogger(log_suffix="status_check", level=logging.INFO, prod=PROD)
-        loader = AppDataLoader(logger=logger, prod=PROD)
-
-        current_status: CaptionStatus = loader.get_caption_status(job_id)
-        logger.stop()
-
-        return current_status.model_dump(by_alias=True, mode="json"), 200
+        status_index = _get_status_index()
+        cached = status_index.get(job_id)
+        if cached is None:
+            # job wasn't submitted on this host (or the spool was wiped), ask S3
+            try:
+                current_status: CaptionStatus = _get_status_loader().get_caption_status(
+                    job_id
+                )
+            except Exception as e:
+                # says nothing about the job, the client should just ask again
+                return f"Status temporarily unavailable: {str(e)}", 503
+            if current_status.status.is_terminal:
+                # terminal statuses never change, keep them local from now on
+                status_index.put(current_status)
+            cached = StatusIndex.serialize(current_status)
+
+        body, etag = cached
+        response = app.response_class(body, status=200, mimetype="application/json")
+        response.set_etag(etag)
+        # turns into an empty 304 when If-None-Match matches
+        return response.make_conditional(request)
     except Exception as e:
         return f"Error checking status: {str(e)}", 500
 
 
+@app.route("/caption/events", methods=["GET"])
+def caption_events():
+    """
+    Server-sent events stream of a job's status/progress. Sends a `progress`
+    event whenever the job's status changes and a final `done` event once it
+    is COMPLETED/FAILED/CANCELLED. Event ids are the status ETag, so a reconnecting
+    EventSource (Last-Event-ID) doesn't get the unchanged state again.
+    """
+    if "job_id" not in request.args:
+        return "job_id is required", 400
+    try:
+        job_id = UUID(request.args.get("job_id"))
+    except ValueError as e:
+        return f"Invalid job_id: {str(e)}", 400
+
+    status_index = _get_status_index()
+    last_etag = request.headers.get("Last-Event-ID")
+
+    def stream():
+        nonlocal last_etag
+        started = time.monotonic()
+        last_sent = started
+
+        # tell EventSource how long to wait before reconnecting
+        yield "retry: 2000\n\n"
+
+        while time.monotonic() - started < SSE_MAX_STREAM_S:
+            cached = status_index.get(job_id)
+            poll_interval = SSE_POLL_INTERVAL_S
+            if cached is None:
+                poll_interval = SSE_S3_POLL_INTERVAL_S
+                try:
+                    current_status = _get_status_loader().get_caption_status(job_id)
+                except Exception:
+                    # a failed read isn't a status, try again on the next poll
+                    time.sleep(poll_interval)
+                    continue
+                cached = StatusIndex.serialize(current_status)
+
+            body, etag = cached
+            terminal = CaptionStatus.model_validate_json(body).status.is_terminal
+            if etag != last_etag:
+                last_etag = etag
+                last_sent = time.monotonic()
+                event = "done" if terminal else "progress"
+                yield f"id: {etag}\nevent: {event}\ndata: {body}\n\n"
+            elif time.monotonic() - last_sent > SSE_KEEPALIVE_S:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            if terminal:
+                return
+            time.sleep(poll_interval)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 if __name__ == "__main__":
     args = parser.parse_args()
     # Local dev only
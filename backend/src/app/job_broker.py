@@ -0,0 +1,272 @@
+import json
+import os
+import time
+from typing import Optional
+
+from .local_store import LocalStore
+
+# Shortest-job-first with aging: a queued job's priority is its estimated cost
+# minus AGING_RATE * seconds waited, lowest first. With a rate of 1.0 a long job
+# waits at most about its own cost before it overtakes fresh short jobs.
+AGING_RATE = float(os.environ.get("MAC_SJF_AGING_RATE", "1.0"))
+# a running job whose worker hasn't heartbeated for this long is handed out again
+LEASE_SECONDS = float(os.environ.get("MAC_JOB_LEASE_SECONDS", "120"))
+# deliveries before a job is dead-lettered instead of retried (crashes/lost leases only)
+MAX_ATTEMPTS = int(os.environ.get("MAC_JOB_MAX_ATTEMPTS", "3"))
+
+
+def worker_lease_id(pid: int, boot_id: str) -> str:
+    """
+    Who holds a lease: unique per worker process, so a replacement worker in
+    the same pool slot (or an orphan of a previous pool) is never mistaken
+    for the worker that claimed the job.
+    """
+    return f"{pid}-{boot_id}"
+
+
+class JobBroker(LocalStore):
+    """
+    SQLite-backed job queue shared by all gunicorn workers on a host.
+
+    Web processes `submit()` jobs with an estimated cost, the host's single
+    inference pool `claim()`s them shortest-job-first (with aging so long jobs
+    can't starve). Because the queue lives in one file, admission control sees
+    the whole host's backlog instead of one web process's share of it.
+
+    Delivery is at-least-once: a claimed job holds a lease its worker renews
+    with `heartbeat()`, and only `finish()` removes it. Jobs whose lease
+    runs out are claimed again; after MAX_ATTEMPTS deliveries they are moved
+    to the 'dead' state instead and kept for inspection.
+    """
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id      TEXT PRIMARY KEY,
+                payload     TEXT NOT NULL,
+                prod_mode   INTEGER NOT NULL,
+                state       TEXT NOT NULL,
+                worker_id   TEXT,
+                enqueued_at REAL NOT NULL,
+                started_at  REAL,
+                est_cost    REAL NOT NULL DEFAULT 0,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                lease_expires_at REAL,
+                last_error  TEXT
+            )
+            """
+        )
+        # spool databases created before these columns existed
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "est_cost" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN est_cost REAL NOT NULL DEFAULT 0")
+        if "cancel_requested" not in columns:
+            conn.execute(
+                "ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0"
+            )
+        if "attempts" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires_at REAL")
+            conn.execute("ALTER TABLE jobs ADD COLUMN last_error TEXT")
+
+    def _wait_ahead_seconds(self, conn, est_cost: float, now: float) -> float:
+        """Worker-seconds that would run before a new job of `est_cost` under SJF + aging."""
+        (queued_ahead,) = conn.execute(
+            "SELECT COALESCE(SUM(est_cost), 0) FROM jobs WHERE state = 'queued' AND est_cost - ? * (? - enqueued_at) <= ?",
+            (AGING_RATE, now, est_cost),
+        ).fetchone()
+        (running_left,) = conn.execute(
+            "SELECT COALESCE(SUM(MAX(est_cost - (? - started_at), 0)), 0) FROM jobs WHERE state = 'running'",
+            (now,),
+        ).fetchone()
+        return queued_ahead + running_left
+
+    def submit(
+        self,
+        job_id: str,
+        payload: dict,
+        prod_mode: bool,
+        est_cost: float,
+        num_workers: int,
+        max_wait_s: float,
+    ) -> bool:
+        """
+        Enqueue a job unless it would wait more than `max_wait_s` before a
+        worker picks it up. Returns False if the host is too backed up.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            wait_s = self._wait_ahead_seconds(conn, est_cost, now) / max(1, num_workers)
+            if wait_s > max_wait_s:
+                conn.execute("ROLLBACK")
+                return False
+
+            conn.execute(
+                "INSERT INTO jobs (job_id, payload, prod_mode, state, enqueued_at, est_cost) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, json.dumps(payload), int(prod_mode), now, est_cost),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, worker_id: str) -> Optional[dict]:
+        """
+        Atomically take the highest priority queued job for lease holder `worker_id` and
+        lease it for LEASE_SECONDS, or None if the queue is empty. The
+        returned "attempts" counts this delivery; past MAX_ATTEMPTS the caller
+        should `dead_letter()` the job instead of running it.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT job_id, payload, prod_mode, attempts FROM jobs WHERE state = 'queued' ORDER BY est_cost - ? * (? - enqueued_at), enqueued_at LIMIT 1",
+                (AGING_RATE, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET state = 'running', worker_id = ?, started_at = ?, lease_expires_at = ?, attempts = attempts + 1 WHERE job_id = ?",
+                (worker_id, now, now + LEASE_SECONDS, row["job_id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return {
+            "job_id": row["job_id"],
+            "payload": json.loads(row["payload"]),
+            "prod_mode": bool(row["prod_mode"]),
+            "attempts": row["attempts"] + 1,
+        }
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease on a running job. False if the worker no longer holds it."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND worker_id = ? AND state = 'running'",
+            (time.time() + LEASE_SECONDS, job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def dead_letter(self, job_id: str, reason: str):
+        """Park a job that keeps failing to complete, it won't be claimed again."""
+        self._connect().execute(
+            "UPDATE jobs SET state = 'dead', worker_id = NULL, lease_expires_at = NULL, last_error = ? WHERE job_id = ?",
+            (reason, job_id),
+        )
+
+    def dead_letters(self) -> list[dict]:
+        rows = self._connect().execute(
+            "SELECT job_id, attempts, enqueued_at, last_error FROM jobs WHERE state = 'dead' ORDER BY enqueued_at"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _requeue_expired(self, conn, now: float) -> int:
+        # jobs whose worker stopped heartbeating become visible again
+        return conn.execute(
+            "UPDATE jobs SET state = 'queued', worker_id = NULL, started_at = NULL, lease_expires_at = NULL, last_error = 'lease expired' WHERE state = 'running' AND lease_expires_at < ?",
+            (now,),
+        ).rowcount
+
+    def requeue_expired(self) -> int:
+        """
+        Put running jobs whose lease ran out back in the queue. Unlike
+        requeue_running() this never takes a job from a worker that is still
+        heartbeating, e.g. one left behind by a previous pool owner.
+        """
+        return self._requeue_expired(self._connect(), time.time())
+
+    def requeue_running(self, worker_id: Optional[str] = None) -> int:
+        """
+        Put jobs whose worker died back in the queue (all running jobs, or only
+        lease holder `worker_id`'s). They keep their enqueued_at, so they don't lose their
+        place, and resume from their checkpoints. Returns how many were requeued.
+        """
+        query = "UPDATE jobs SET state = 'queued', worker_id = NULL, started_at = NULL, lease_expires_at = NULL, last_error = 'worker died' WHERE state = 'running'"
+        params: tuple = ()
+        if worker_id is not None:
+            query += " AND worker_id = ?"
+            params = (worker_id,)
+        return self._connect().execute(query, params).rowcount
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a job. Queued jobs are dropped right away, running ones are
+        flagged for their worker to notice. Returns the state the job was in
+        ("queued" / "running") or None if the broker doesn't know it.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT state FROM jobs WHERE job_id = ? AND state IN ('queued', 'running')",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+
+            if row["state"] == "queued":
+                conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            else:
+                conn.execute(
+                    "UPDATE jobs SET cancel_requested = 1 WHERE job_id = ?", (job_id,)
+                )
+            conn.execute("COMMIT")
+            return row["state"]
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        row = self._connect().execute(
+            "SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return row is not None and bool(row["cancel_requested"])
+
+    def finish(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        """
+        Acknowledge a job once its worker is done with it (its outcome lives in
+        the status file). With `worker_id`, only if that worker still holds the
+        lease, so a stalled worker can't drop a job that was handed out again.
+        """
+        query = "DELETE FROM jobs WHERE job_id = ? AND state != 'dead'"
+        params: tuple = (job_id,)
+        if worker_id is not None:
+            query += " AND worker_id = ?"
+            params = (job_id, worker_id)
+        return self._connect().execute(query, params).rowcount == 1
+
+    def backlog(self) -> dict[str, float]:
+        """Queue depth and estimated worker-seconds of outstanding work, for admission and autoscaling."""
+        now = time.time()
+        row = self._connect().execute(
+            """
+            SELECT
+                COALESCE(SUM(state = 'queued'), 0) AS queued,
+                COALESCE(SUM(state = 'running'), 0) AS running,
+                COALESCE(SUM(state = 'dead'), 0) AS dead,
+                COALESCE(SUM(CASE WHEN state = 'queued' THEN est_cost END), 0) AS queued_s,
+                COALESCE(SUM(CASE WHEN state = 'running' THEN MAX(est_cost - (? - started_at), 0) END), 0) AS running_s
+            FROM jobs
+            """,
+            (now,),
+        ).fetchone()
+        return {
+            "queued": row["queued"],
+            "running": row["running"],
+            "dead": row["dead"],
+            "backlog_seconds": round(row["queued_s"] + row["running_s"], 1),
+        }
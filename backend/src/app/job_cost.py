@@ -0,0 +1,33 @@
+import os
+from typing import Optional
+
+from ..dataclasses.inputs.caption import CaptionInput
+
+# Rough worker-seconds a job costs: a fixed overhead (download, model warm
+# caches, upload) plus a per-second-of-video rate for VAD/SLID/ASR/encode.
+COST_OVERHEAD_S = float(os.environ.get("MAC_COST_OVERHEAD_S", "20"))
+COST_PER_VIDEO_S = float(os.environ.get("MAC_COST_PER_VIDEO_S", "1.0"))
+# translation is a network round trip per segment
+TRANSLATE_COST_PER_VIDEO_S = float(
+    os.environ.get("MAC_TRANSLATE_COST_PER_VIDEO_S", "0.05")
+)
+# share of the per-second rate left when only timed text is produced (no render/encode)
+TEXT_OUTPUT_COST_FACTOR = float(os.environ.get("MAC_TEXT_OUTPUT_COST_FACTOR", "0.6"))
+# used when the duration can't be probed, pessimistic on purpose
+UNKNOWN_DURATION_S = float(os.environ.get("MAC_UNKNOWN_DURATION_S", "600"))
+
+
+def estimate_job_cost(
+    input_data: CaptionInput, duration_s: Optional[float]
+) -> float:
+    """Estimated worker-seconds to caption a video of `duration_s` seconds."""
+    if duration_s is None:
+        duration_s = UNKNOWN_DURATION_S
+
+    per_second = COST_PER_VIDEO_S
+    if input_data.output_format != "video":
+        per_second *= TEXT_OUTPUT_COST_FACTOR
+    if input_data.convert_to:
+        per_second += TRANSLATE_COST_PER_VIDEO_S
+
+    return COST_OVERHEAD_S + duration_s * per_second
@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+# Local state shared by every process on the host (web workers + inference pool)
+SPOOL_DIR = Path(
+    os.environ.get(
+        "MAC_SPOOL_DIR", Path(__file__).resolve().parent.parent.parent / "spool"
+    )
+)
+DEFAULT_DB_PATH = SPOOL_DIR / "broker.sqlite3"
+
+
+class LocalStore:
+    """
+    Base for the host-local SQLite tables (job broker, status index).
+
+    Keeps one connection per thread (gthread workers can't share them) and
+    puts the database in WAL mode so readers never block the writer.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None so transactions are explicit (BEGIN IMMEDIATE)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        raise NotImplementedError
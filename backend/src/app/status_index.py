@@ -0,0 +1,60 @@
+import hashlib
+import time
+from typing import Optional
+from uuid import UUID
+
+from ..components.data_loader import AppDataLoader
+from ..dataclasses.inputs.caption_status import CaptionStatus
+from .local_store import LocalStore
+
+
+class StatusIndex(LocalStore):
+    """
+    Host-local index of job statuses in front of the S3 status files.
+
+    The worker and /caption write every status here first and then through to
+    S3 for durability, so /caption/status is a single SQLite primary-key read
+    instead of an S3 GetObject. Each entry carries an ETag derived from the
+    serialized status so pollers can use If-None-Match.
+    """
+
+    def _init_schema(self):
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_status (
+                job_id     TEXT PRIMARY KEY,
+                body       TEXT NOT NULL,
+                etag       TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+
+    @staticmethod
+    def serialize(caption_status: CaptionStatus) -> tuple[str, str]:
+        body = caption_status.model_dump_json(by_alias=True)
+        etag = hashlib.sha1(body.encode("utf-8")).hexdigest()
+        return body, etag
+
+    def put(self, caption_status: CaptionStatus) -> str:
+        body, etag = self.serialize(caption_status)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO job_status (job_id, body, etag, updated_at) VALUES (?, ?, ?, ?)",
+            (str(caption_status.job_id), body, etag, time.time()),
+        )
+        return etag
+
+    def get(self, job_id: UUID) -> Optional[tuple[str, str]]:
+        """Returns (status json, etag) or None if this host has never seen the job."""
+        row = self._connect().execute(
+            "SELECT body, etag FROM job_status WHERE job_id = ?", (str(job_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        return row["body"], row["etag"]
+
+    def publish(self, caption_status: CaptionStatus, loader: AppDataLoader) -> str:
+        """Record a status locally, then write it through to S3."""
+        etag = self.put(caption_status)
+        loader.upload_status_file(caption_status)
+        return etag
@@ -0,0 +1,342 @@
+from pathlib import Path
+import ctypes
+import logging
+import os
+import shutil
+import signal
+import threading
+import time
+from uuid import UUID
+
+import torch
+from silero_vad import load_silero_vad, get_speech_timestamps
+from speechbrain.inference.classifiers import EncoderClassifier
+from faster_whisper import WhisperModel
+
+from ..components.pipeline_runner import PipelineRunner
+from ..components.vad_engine import VAD_ENGINE
+from ..components.cnn_vad_model import load_cnn_vad
+from ..components.data_loader import AppDataLoader
+from ..components.logger_component import AppLogger
+from ..components.progress_reporter import ProgressReporter
+from ..components.cancellation import CancellationToken, JobCancelled
+from ..components.result_cache import RESULT_CACHE_ENABLED
+from ..dataclasses.inputs.caption import CaptionInput
+from ..dataclasses.inputs.caption_status import CaptionStatus
+from ..dataclasses.inputs.status import Status
+from .job_broker import JobBroker, LEASE_SECONDS, MAX_ATTEMPTS, worker_lease_id
+from .status_index import StatusIndex
+from .worker_registry import WorkerRegistry
+
+
+def load_asr_model(num_threads: int = 0) -> WhisperModel:
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    compute_type = "float16" if torch.cuda.is_available() else "float32"
+    # cpu_threads=0 lets CTranslate2 pick its own default
+    return WhisperModel(
+        "small", device=device, compute_type=compute_type, cpu_threads=num_threads
+    )
+
+
+def load_slid_model():
+    return EncoderClassifier.from_hparams(
+        source="speechbrain/lang-id-voxlingua107-ecapa",
+        savedir=Path(__file__).parent.parent
+        / "pretrained_models"
+        / "lang-id-voxlingua107-ecapa",
+    )
+
+
+def load_vad_model(engine: str = VAD_ENGINE):
+    if engine == "cnn":
+        return load_cnn_vad()
+    return load_silero_vad()
+
+
+# how long an idle worker waits before polling the broker again
+POLL_INTERVAL_S = 0.5
+# sample rate of the synthetic warm-up clip, all three models accept 16kHz
+WARMUP_SAMPLE_RATE = 16000
+
+
+def warm_up_models(vad_model, slid_model, asr_model) -> dict[str, float]:
+    """
+    Push one second of low noise through each model so the first real job
+    doesn't pay for lazy kernel init/allocations. Returns seconds per model.
+    """
+    clip = torch.randn(WARMUP_SAMPLE_RATE) * 0.01
+    timings = {}
+
+    start = time.perf_counter()
+    if VAD_ENGINE == "cnn":
+        # one batch of 40x40 mel patches
+        with torch.inference_mode():
+            vad_model(torch.zeros(1, 1, 40, 40))
+    else:
+        get_speech_timestamps(clip, vad_model, sampling_rate=WARMUP_SAMPLE_RATE)
+    timings["vad"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slid_model.classify_batch(clip)
+    timings["slid"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    # transcribe() is lazy, consume the generator so decoding actually runs
+    segments, _ = asr_model.transcribe(clip.numpy(), language="en")
+    list(segments)
+    timings["asr"] = time.perf_counter() - start
+
+    return timings
+
+
+# prctl option: signal to receive when the parent exits (linux/prctl.h)
+PR_SET_PDEATHSIG = 1
+
+
+def _exit_with_parent(parent_pid: int):
+    """
+    Have the kernel SIGTERM this worker when the process owning the pool dies
+    (Linux only, elsewhere the claim loop's parent check is all there is).
+    """
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+    except (OSError, AttributeError):
+        pass
+    if os.getppid() != parent_pid:
+        os._exit(0)  # the owner died before the signal was armed
+
+
+def _worker_main(
+    worker_id: int,
+    stop_event,
+    num_threads: int,
+    db_path: Path,
+    boot_id: str,
+    parent_pid: int,
+):
+    """
+    Long-lived worker process:
+    - exits with the process owning the pool, never outlives it as an orphan
+    - pins torch/CTranslate2 to its share of the cores
+    - loads models once and warms them up with a synthetic clip
+    - reports load/warm-up times and readiness to the WorkerRegistry (/ready)
+    - claims jobs from the host's broker and processes them sequentially
+    """
+    _exit_with_parent(parent_pid)
+    # `worker_id` is the pool slot (logs, /ready), the broker knows this process by its lease id
+    lease_id = worker_lease_id(os.getpid(), boot_id)
+    started_at = time.time()
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+
+    registry = WorkerRegistry(db_path)
+    models: dict[str, dict] = {}
+    registry.update(worker_id, "loading", models, started_at)
+
+    # Load models ONCE here (most reliable + avoids per-job spikes).
+    loaded = {}
+    for name, load in (
+        ("vad", load_vad_model),
+        ("slid", load_slid_model),
+        ("asr", lambda: load_asr_model(num_threads=num_threads)),
+    ):
+        start = time.perf_counter()
+        loaded[name] = load()
+        models[name] = {"load_seconds": round(time.perf_counter() - start, 2), "warm": False}
+        registry.update(worker_id, "loading", models, started_at)
+    vad_model, slid_model, asr_model = loaded["vad"], loaded["slid"], loaded["asr"]
+
+    registry.update(worker_id, "warming", models, started_at)
+    try:
+        for name, seconds in warm_up_models(vad_model, slid_model, asr_model).items():
+            models[name].update(warm=True, warmup_seconds=round(seconds, 2))
+    except Exception as e:
+        # a cold model is slower, not broken, so still take jobs
+        print(f"Worker {worker_id} warm-up failed: {e}", flush=True)
+
+    ready_at = time.time()
+    registry.update(worker_id, "ready", models, started_at, ready_at=ready_at)
+    print(
+        f"metric=worker_cold_start_seconds worker={worker_id} value={ready_at - started_at:.2f} "
+        + " ".join(f"{name}_load_seconds={m['load_seconds']}" for name, m in models.items()),
+        flush=True,
+    )
+
+    broker = JobBroker(db_path)
+    status_index = StatusIndex(db_path)
+
+    while not stop_event.is_set():
+        if os.getppid() != parent_pid:
+            print(f"Worker {worker_id} lost its pool owner, exiting", flush=True)
+            break
+        job = broker.claim(lease_id)
+        if job is None:
+            stop_event.wait(POLL_INTERVAL_S)
+            continue
+
+        # survives a worker crash, so the requeued job can skip finished stages
+        checkpoint_dir = Path(db_path).parent / "jobs" / job["job_id"]
+
+        if job["attempts"] > MAX_ATTEMPTS:
+            _dead_letter_job(job, broker, status_index)
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+            continue
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=_heartbeat,
+            args=(broker, job["job_id"], lease_id, heartbeat_stop),
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            _run_job(
+                job,
+                worker_id=worker_id,
+                broker=broker,
+                status_index=status_index,
+                vad_model=vad_model,
+                slid_model=slid_model,
+                asr_model=asr_model,
+                num_threads=num_threads,
+                result_cache_dir=(
+                    Path(db_path).parent / "result_cache" if RESULT_CACHE_ENABLED else None
+                ),
+                checkpoint_dir=checkpoint_dir,
+            )
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+            # if our lease was lost the job belongs to another worker now, leave its checkpoints alone
+            if broker.finish(job["job_id"], worker_id=lease_id):
+                shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+
+def _heartbeat(broker: JobBroker, job_id: str, lease_id: str, stop_event):
+    # renew the lease well before it runs out; runs beside the pipeline in the worker process
+    while not stop_event.wait(LEASE_SECONDS / 3):
+        try:
+            broker.heartbeat(job_id, lease_id)
+        except Exception as e:
+            print(f"Heartbeat for job {job_id} failed: {e}", flush=True)
+
+
+def _dead_letter_job(job: dict, broker: JobBroker, status_index: StatusIndex):
+    """A job that crashed/stalled its worker MAX_ATTEMPTS times: park it and report FAILED."""
+    job_id_str = job["job_id"]
+    reason = f"Gave up after {MAX_ATTEMPTS} attempts (worker crashed or stalled each time)"
+    broker.dead_letter(job_id_str, reason)
+
+    logger = AppLogger(
+        log_suffix=f"job_{job_id_str}", level=logging.INFO, prod=job["prod_mode"]
+    )
+    loader = AppDataLoader(logger=logger, prod=job["prod_mode"])
+    try:
+        logger.logger.error(f"Job {job_id_str} dead-lettered: {reason}")
+        status_obj = CaptionStatus(
+            job_id=UUID(job_id_str), status=Status.FAILED, message=reason
+        )
+        status_index.publish(status_obj, loader)
+    finally:
+        logger.stop()
+
+
+def _run_job(
+    job: dict,
+    worker_id: int,
+    broker: JobBroker,
+    status_index: StatusIndex,
+    vad_model,
+    slid_model,
+    asr_model,
+    num_threads: int,
+    result_cache_dir: Path | None = None,
+    checkpoint_dir: Path | None = None,
+):
+    job_id_str = job["job_id"]
+    payload = job["payload"]
+    prod_mode = job["prod_mode"]
+
+    job_id = UUID(job_id_str)
+
+    logger = AppLogger(
+        log_suffix=f"job_{job_id_str}", level=logging.INFO, prod=prod_mode
+    )
+    logger.logger.info(f"Worker {worker_id} picked up job {job_id_str}")
+    loader = AppDataLoader(logger=logger, prod=prod_mode)
+
+    try:
+        # mark as pending (again) in case caller failed before writing it
+        status_obj = CaptionStatus(
+            job_id=job_id, status=Status.PENDING, message="Processing started"
+        )
+        status_index.publish(status_obj, loader)
+
+        input_data = CaptionInput(**payload)
+
+        def publish_progress(snapshot: dict):
+            # local only: progress changes too often to write through to S3 each time
+            try:
+                status_index.put(
+                    CaptionStatus(
+                        job_id=job_id,
+                        status=Status.PENDING,
+                        message=f"Processing: {snapshot['stage']}",
+                        **snapshot,
+                    )
+                )
+            except Exception as e:
+                # never fail a job because progress couldn't be recorded
+                logger.logger.warning(f"Could not record progress for {job_id_str}: {e}")
+
+        runner = PipelineRunner(
+            file_path=input_data.upload_url,
+            vad_model=vad_model,
+            slid_model=slid_model,
+            asr_model=asr_model,
+            convert_to=input_data.convert_to,
+            explicit_langs=input_data.explicit_langs,
+            output_format=input_data.output_format,
+            encoder_profile=input_data.encoder_profile or None,
+            num_threads=num_threads,
+            progress=ProgressReporter(on_update=publish_progress),
+            # DELETE /caption flags the job in the broker, the pipeline polls it
+            cancel_token=CancellationToken(
+                lambda: broker.is_cancel_requested(job_id_str)
+            ),
+            result_cache_dir=result_cache_dir,
+            checkpoint_dir=checkpoint_dir,
+            prod=prod_mode,
+        )
+
+        s3_download_url: str = runner.run(
+            caption_color=input_data.caption_color,
+            font_size=input_data.font_size,
+            stroke_width=input_data.stroke_width,
+        )
+
+        status_obj = CaptionStatus(
+            job_id=job_id,
+            status=Status.COMPLETED,
+            output_url=s3_download_url,
+            message="Processing completed successfully",
+        )
+        status_index.publish(status_obj, loader)
+
+    except JobCancelled:
+        logger.logger.info(f"Job {job_id_str} cancelled")
+        status_obj = CaptionStatus(
+            job_id=job_id, status=Status.CANCELLED, message="Job cancelled"
+        )
+        status_index.publish(status_obj, loader)
+    except Exception as e:
+        logger.logger.error(f"Job {job_id_str} failed: {e}")
+        status_obj = CaptionStatus(job_id=job_id, status=Status.FAILED, message=str(e))
+        status_index.publish(status_obj, loader)
+    finally:
+        logger.stop()
+        # If you do any local temp files, do cleanup here for prod
+        if prod_mode:
+            try:
+                loader.cleanup_temp_files()
+            except Exception:
+                pass
@@ -0,0 +1,166 @@
+import fcntl
+import multiprocessing
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+from .job_broker import JobBroker, worker_lease_id
+from .local_store import DEFAULT_DB_PATH, SPOOL_DIR
+from .worker_registry import WorkerRegistry
+from .worker import _worker_main
+
+# held by whichever process on the host owns the inference pool
+POOL_LOCK_PATH = SPOOL_DIR / "pool.lock"
+
+
+def default_threads_per_worker(num_workers: int) -> int:
+    """Split the machine's cores evenly between workers (at least 1 each)."""
+    return max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+
+class WorkerPool:
+    """
+    Fixed-size pool of long-lived inference workers.
+
+    Every worker loads VAD/SLID/ASR once and pulls jobs from the host's
+    JobBroker, so an idle worker is always the one that takes the next job.
+    Each worker is pinned to `threads_per_worker` torch/CTranslate2 threads so
+    N workers don't oversubscribe the cores. A supervisor thread restarts
+    workers that die (e.g. OOM) and puts their job back in the queue, where it
+    resumes from its stage checkpoints. Workers exit when the process owning
+    the pool dies, so a takeover never runs next to orphans of the old pool.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 1,
+        threads_per_worker: int = 0,
+        db_path: Path = DEFAULT_DB_PATH,
+        target: Callable = _worker_main,
+        supervise_interval: float = 5.0,
+    ):
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be at least 1, got {num_workers}")
+
+        self.ctx = multiprocessing.get_context("spawn")
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker or default_threads_per_worker(
+            num_workers
+        )
+        self.db_path = Path(db_path)
+        self.target = target
+        self.supervise_interval = supervise_interval
+
+        self._procs: list[Optional[multiprocessing.process.BaseProcess]] = [
+            None
+        ] * num_workers
+        # broker lease holder of each slot's current process (see worker_lease_id)
+        self._lease_ids: list[Optional[str]] = [None] * num_workers
+        self._stop_event = self.ctx.Event()
+        self._lock = threading.Lock()
+        self._supervisor: Optional[threading.Thread] = None
+        self._broker: Optional[JobBroker] = None
+
+    def start(self):
+        self._broker = JobBroker(self.db_path)
+        # The previous owner's workers exit with it, but may still be finishing
+        # up; their jobs come back once their leases run out, never earlier.
+        requeued = self._broker.requeue_expired()
+        if requeued:
+            print(f"Requeued {requeued} interrupted job(s)", flush=True)
+        # readiness rows of the previous owner's workers are meaningless now
+        WorkerRegistry(self.db_path).reset()
+
+        # the supervisor spawns the workers too: their parent-death signal fires
+        # when the spawning *thread* exits, and only the supervisor lives as long as the pool
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+
+    def _ensure_worker_alive(self, idx: int):
+        proc = self._procs[idx]
+        if proc is not None and proc.is_alive():
+            return
+
+        if proc is not None and self._broker is not None:
+            # worker died mid-job, hand its job to the next free worker
+            self._broker.requeue_running(worker_id=self._lease_ids[idx])
+
+        boot_id = uuid.uuid4().hex[:12]
+        proc = self.ctx.Process(
+            target=self.target,
+            args=(
+                idx,
+                self._stop_event,
+                self.threads_per_worker,
+                self.db_path,
+                boot_id,
+                os.getpid(),
+            ),
+        )
+        proc.daemon = False
+        proc.start()
+        self._procs[idx] = proc
+        self._lease_ids[idx] = worker_lease_id(proc.pid, boot_id)
+
+    def _supervise(self):
+        while True:
+            with self._lock:
+                for idx in range(self.num_workers):
+                    self._ensure_worker_alive(idx)
+            if self._stop_event.wait(self.supervise_interval):
+                return
+
+    def is_alive(self) -> bool:
+        return any(proc is not None and proc.is_alive() for proc in self._procs)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Ask workers to exit after their current job and wait for them."""
+        self._stop_event.set()
+        with self._lock:
+            for proc in self._procs:
+                if proc is not None:
+                    proc.join(timeout=timeout)
+
+
+_host_pool: Optional[WorkerPool] = None
+_host_pool_lock_file = None
+_host_pool_mutex = threading.Lock()
+
+
+def start_host_pool(
+    num_workers: int,
+    threads_per_worker: int = 0,
+    db_path: Path = DEFAULT_DB_PATH,
+) -> Optional[WorkerPool]:
+    """
+    Start the host's single inference pool if no other process owns it yet.
+
+    Ownership is an exclusive flock on POOL_LOCK_PATH, so with `gunicorn -w N`
+    exactly one web process runs the models and the others only submit to the
+    broker. The lock is released by the kernel if the owner dies, letting the
+    next caller take over. Returns the pool if this process owns it.
+    """
+    global _host_pool, _host_pool_lock_file
+
+    with _host_pool_mutex:
+        if _host_pool is not None:
+            return _host_pool
+
+        POOL_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(POOL_LOCK_PATH, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None  # another process on this host owns the pool
+
+        _host_pool_lock_file = lock_file
+        _host_pool = WorkerPool(
+            num_workers=num_workers,
+            threads_per_worker=threads_per_worker,
+            db_path=db_path,
+        )
+        _host_pool.start()
+        return _host_pool
@@ -0,0 +1,90 @@
+import json
+import os
+import time
+from typing import Optional
+
+from .local_store import LocalStore
+
+
+class WorkerRegistry(LocalStore):
+    """
+    Host-local record of each inference worker's boot progress: per-model load
+    and warm-up times and whether it is ready for jobs. Workers write it, any
+    gunicorn web process can read it for /ready.
+    """
+
+    def _init_schema(self):
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id  INTEGER PRIMARY KEY,
+                pid        INTEGER NOT NULL,
+                state      TEXT NOT NULL,
+                models     TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                ready_at   REAL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+
+    def reset(self):
+        """Forget workers from a previous pool, called when a pool takes over the host."""
+        self._connect().execute("DELETE FROM workers")
+
+    def update(
+        self,
+        worker_id: int,
+        state: str,
+        models: dict,
+        started_at: float,
+        ready_at: Optional[float] = None,
+    ):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO workers (worker_id, pid, state, models, started_at, ready_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                worker_id,
+                os.getpid(),
+                state,
+                json.dumps(models),
+                started_at,
+                ready_at,
+                time.time(),
+            ),
+        )
+
+    def workers(self) -> list[dict]:
+        rows = self._connect().execute(
+            "SELECT * FROM workers ORDER BY worker_id"
+        ).fetchall()
+
+        result = []
+        for row in rows:
+            state = row["state"]
+            if not _pid_alive(row["pid"]):
+                state = "dead"  # supervisor will replace it, it'll re-register
+            result.append(
+                {
+                    "worker_id": row["worker_id"],
+                    "pid": row["pid"],
+                    "state": state,
+                    "models": json.loads(row["models"]),
+                    "cold_start_seconds": (
+                        round(row["ready_at"] - row["started_at"], 2)
+                        if row["ready_at"] is not None
+                        else None
+                    ),
+                }
+            )
+        return result
+
+
+def _pid_alive(pid: int) -> bool:
+    # workers live on the same host, signal 0 only checks the process exists
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -3,21 +3,34 @@ from ..dataclasses.audio_segment import AudioSegment, unknown_language
 from faster_whisper import WhisperModel
 from faster_whisper.tokenizer import _LANGUAGE_CODES
 from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from .cancellation import CancellationToken
 
 
 class ASRModel:
-    def __init__(self, logger: AppLogger, model: WhisperModel, prod=False):
+    def __init__(
+        self,
+        logger: AppLogger,
+        model: WhisperModel,
+        max_workers: int | None = None,
+        prod=False,
+    ):
         self.logger = logger
         self.prod = prod
         self.allowed_sample_rates = [
             16000
         ]  # made up for this moment, just matches the other models
         self.model = model
+        # threads transcribing segments concurrently, None = ThreadPoolExecutor default
+        self.max_workers = max_workers
         self.allowed_langs = [str(lang_code) for lang_code in _LANGUAGE_CODES]
         self.logger.logger.info("ASRModel initialized")
 
     def transcribe_segments(
-        self, audio_segments: list[AudioSegment]
+        self,
+        audio_segments: list[AudioSegment],
+        on_segment_done: Optional[Callable[[], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> list[AudioSegment]:
         assert all(seg.lang != unknown_language for seg in audio_segments), (
             "All segments must have a known language before transcription."
@@ -27,6 +40,9 @@ class ASRModel:
             idx_seg: tuple[int, AudioSegment],
         ) -> tuple[int, AudioSegment]:
             idx, seg = idx_seg
+            # queued segments bail out immediately once the job is cancelled
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             segments, info = self.model.transcribe(
                 audio=seg.audio.numpy(), language=seg.lang, word_timestamps=True
             )
@@ -35,13 +51,16 @@ class ASRModel:
             # debugging, double make sure not None
             if seg.text == None:
                 seg.text = ""
+
+            if on_segment_done is not None:
+                on_segment_done()
             return idx, seg
 
         self.logger.logger.info(
             f"Beginning transcription for {len(audio_segments)} audio segments"
         )
         try:
-            with ThreadPoolExecutor() as executor:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                 results = list(
                     executor.map(transcribe_segment, enumerate(audio_segments))
                 )
@@ -0,0 +1,246 @@
+import math
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import torch
+from moviepy.config import FFMPEG_BINARY
+
+from .logger_component import AppLogger
+
+# keep decoded audio in a memory-mapped file in the job's temp dir instead of the heap
+PCM_MMAP = os.environ.get("MAC_PCM_MMAP", "1") == "1"
+
+# audio codecs the mp4 muxer accepts as-is, anything else has to be re-encoded
+MP4_AUDIO_CODECS = {"aac", "mp3", "ac3", "eac3", "alac", "opus", "flac"}
+
+
+def _ffmpeg_pcm_command(
+    source: str, sample_rate: int, output: str = "pipe:1"
+) -> list[str]:
+    # mono float32 at the models' rate, ffmpeg does the downmix and resampling
+    # same binary moviepy uses (system ffmpeg or the imageio-ffmpeg download)
+    return [
+        FFMPEG_BINARY,
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        source,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "f32le",
+        output,
+    ]
+
+
+def load_pcm(pcm_path: Path) -> torch.Tensor:
+    """
+    Memory-map a raw f32le PCM file as a 1-D tensor. Pages are read on demand
+    and, being clean file-backed memory, can be dropped again by the kernel,
+    so slicing segments out of hours of audio doesn't pin it all in RSS.
+    """
+    if Path(pcm_path).stat().st_size == 0:
+        return torch.empty(0)
+    # copy-on-write: torch wants a writable array, nothing is ever written back
+    return torch.from_numpy(np.memmap(pcm_path, dtype=np.float32, mode="c"))
+
+
+def decode_audio_to_pcm_file(
+    path: Path, sample_rate: int, pcm_path: Path
+) -> torch.Tensor:
+    """Decode a file's audio track into `pcm_path` and return it memory-mapped (see load_pcm)."""
+    result = subprocess.run(
+        _ffmpeg_pcm_command(str(path), sample_rate, output=str(pcm_path)),
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to decode audio of {path} ({result.returncode}): {result.stderr.decode(errors='replace').strip()}"
+        )
+    return load_pcm(pcm_path)
+
+
+def decode_audio_file(
+    path: Path, sample_rate: int, expected_duration_s: Optional[float] = None
+) -> torch.Tensor:
+    """
+    Decode a file's audio track straight to mono float32 at `sample_rate`.
+
+    ffmpeg writes into one buffer preallocated from the expected duration, so
+    the only full-size allocation is the 4 bytes/sample result (no float64
+    stereo copy at the source rate, no resampler copies).
+    """
+    capacity = math.ceil((expected_duration_s or 0) * sample_rate) + sample_rate
+    buffer = np.empty(capacity, dtype=np.float32)
+    filled = 0  # bytes
+
+    proc = subprocess.Popen(
+        _ffmpeg_pcm_command(str(path), sample_rate),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # drained on the side so a chatty ffmpeg can't block on a full stderr pipe
+    stderr: list[bytes] = []
+    stderr_thread = threading.Thread(
+        target=lambda: stderr.append(proc.stderr.read()), daemon=True
+    )
+    stderr_thread.start()
+
+    try:
+        while True:
+            if filled == buffer.nbytes:
+                # duration was underestimated, grow by half
+                buffer = np.resize(buffer, buffer.size + buffer.size // 2 + sample_rate)
+            view = memoryview(buffer).cast("B")[filled:]
+            n = proc.stdout.readinto(view)
+            if not n:
+                break
+            filled += n
+    finally:
+        returncode = proc.wait()
+        stderr_thread.join()
+
+    if returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to decode audio of {path} ({returncode}): {b''.join(stderr).decode(errors='replace').strip()}"
+        )
+
+    return torch.from_numpy(buffer[: filled // 4])
+
+
+def probe_audio_codec(path: Path) -> Optional[str]:
+    """Codec name of the first audio stream in `path`, None if it has no audio."""
+    # without an output ffmpeg only prints the input's streams (and exits 1)
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-i", str(path)], capture_output=True
+    )
+    match = re.search(
+        r"Stream #\S+.*?: Audio: ([\w-]+)", result.stderr.decode(errors="replace")
+    )
+    return match.group(1) if match else None
+
+
+def mp4_audio_codec(path: Path) -> str:
+    """
+    Audio codec to write `path`'s soundtrack into an mp4 with: "copy" keeps
+    the original stream bit-exact, only codecs mp4 can't hold (wmav2 from
+    wmv, raw PCM from avi/mov, ...) are re-encoded to aac.
+    """
+    codec = probe_audio_codec(path)
+    return "copy" if codec is None or codec in MP4_AUDIO_CODECS else "aac"
+
+
+class StreamingAudioDecoder:
+    """
+    Decodes a video's audio track with ffmpeg while its bytes are still
+    arriving. A writer thread feeds `chunks` into ffmpeg's stdin. A reader
+    thread collects mono float32 PCM at `sample_rate` from stdout.
+
+    ffmpeg can't seek a pipe, so containers that keep their index at the end
+    (mp4 without faststart) fail here; callers should fall back to decoding
+    the finished file.
+
+    With `pcm_path` the PCM goes to that file instead and is returned
+    memory-mapped (see load_pcm).
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        sample_rate: int,
+        logger: AppLogger,
+        pcm_path: Optional[Path] = None,
+    ):
+        self.chunks = chunks
+        self.sample_rate = sample_rate
+        self.logger = logger
+        self.pcm_path = pcm_path
+
+        self._proc: Optional[subprocess.Popen] = None
+        self._pcm = bytearray()
+        self._stderr = b""
+        self._feed_error: Optional[BaseException] = None
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> "StreamingAudioDecoder":
+        self._proc = subprocess.Popen(
+            _ffmpeg_pcm_command(
+                "pipe:0",
+                self.sample_rate,
+                output=str(self.pcm_path) if self.pcm_path else "pipe:1",
+            ),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._threads = [
+            threading.Thread(target=self._feed, daemon=True),
+            threading.Thread(target=self._read_pcm, daemon=True),
+            threading.Thread(target=self._read_stderr, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _feed(self):
+        try:
+            for chunk in self.chunks:
+                self._proc.stdin.write(chunk)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early, its return code tells us why
+        except BaseException as e:
+            self._feed_error = e
+        finally:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def _read_pcm(self):
+        while chunk := self._proc.stdout.read(1024 * 1024):
+            self._pcm += chunk
+
+    def _read_stderr(self):
+        self._stderr = self._proc.stderr.read()
+
+    def result(self) -> torch.Tensor:
+        """Wait for ffmpeg to finish and return the decoded mono waveform."""
+        for thread in self._threads:
+            thread.join()
+        returncode = self._proc.wait()
+
+        if self._feed_error is not None:
+            raise self._feed_error
+        if returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to decode streamed audio ({returncode}): {self._stderr.decode(errors='replace').strip()}"
+            )
+
+        if self.pcm_path is not None:
+            audio = load_pcm(self.pcm_path)
+        else:
+            # whole float32 samples only, a torn last sample can't be decoded
+            usable = len(self._pcm) - len(self._pcm) % 4
+            audio = torch.from_numpy(
+                np.frombuffer(self._pcm, dtype=np.float32, count=usable // 4)
+            )
+        self.logger.logger.info(
+            f"Decoded {audio.numel() / self.sample_rate:.1f}s of streamed audio at {self.sample_rate} Hz"
+        )
+        return audio
+
+    def close(self):
+        """Stop decoding early (e.g. the result came from the cache)."""
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
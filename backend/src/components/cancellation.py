@@ -0,0 +1,47 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside the pipeline once a job's cancellation has been requested."""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag checked by the pipeline between stages,
+    between segments and while encoding frames.
+
+    `is_cancelled` is polled at most once per `min_interval` seconds (it may
+    hit the job broker), the answer is cached in between. Once cancelled the
+    token stays cancelled.
+    """
+
+    def __init__(
+        self,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        min_interval: float = 0.5,
+    ):
+        self.is_cancelled = is_cancelled
+        self.min_interval = min_interval
+        self._cancelled = False
+        self._last_checked = 0.0
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self._cancelled = True
+
+    def cancelled(self) -> bool:
+        if self._cancelled or self.is_cancelled is None:
+            return self._cancelled
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_checked >= self.min_interval:
+                self._last_checked = now
+                self._cancelled = bool(self.is_cancelled())
+        return self._cancelled
+
+    def raise_if_cancelled(self):
+        if self.cancelled():
+            raise JobCancelled("Job was cancelled")
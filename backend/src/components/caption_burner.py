@@ -0,0 +1,710 @@
+import math
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from fontTools.ttLib import TTFont
+from moviepy.config import FFMPEG_BINARY
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from .audio_decoder import mp4_audio_codec
+from .cancellation import CancellationToken
+from .encoder_profiles import EncoderProfile, get_encoder_profile
+from .logger_component import AppLogger
+from ..dataclasses.audio_segment import AudioSegment
+
+# "ffmpeg" burns an ASS file in with libass in one native pass,
+# "moviepy" composites TextClips frame by frame in Python (the old path)
+RENDER_ENGINE = os.environ.get("MAC_RENDER_ENGINE", "ffmpeg")
+RENDER_ENGINES = ("ffmpeg", "moviepy")
+
+# same layout as VideoProcessor.embed_captions: text wrapped to 80% of the
+# width, centered, bottom edge 8% above the frame bottom, 10px TextClip margin
+CAPTION_WIDTH = 0.8
+BOTTOM_MARGIN = 0.08
+TEXT_MARGIN_PX = 10
+
+# parallel ffmpeg encoders per video, 0 = one per two threads the worker may use
+ENCODE_CHUNKS = int(os.environ.get("MAC_ENCODE_CHUNKS", "0"))
+# videos are only split into chunks at least this long (process startup isn't free)
+MIN_CHUNK_SECONDS = float(os.environ.get("MAC_ENCODE_MIN_CHUNK_SECONDS", "20"))
+# re-encode only the GOPs that show a caption and stream-copy the rest
+SMART_RENDER = os.environ.get("MAC_SMART_RENDER", "1") == "1"
+# h264 flavours our yuv420p libx264 pieces can be spliced into
+SMART_RENDER_PROFILES = {"Baseline", "Constrained Baseline", "Main", "High"}
+
+
+@dataclass
+class BurnChunk:
+    """A keyframe-aligned range of the timeline that is encoded on its own."""
+
+    start: float
+    end: Optional[float]  # None runs to the end of the video
+    copy: bool = False  # no captions in range, stream-copied instead of re-encoded
+
+
+class CaptionBurner:
+    """
+    Burns captions into a video with ffmpeg's `ass` filter instead of moviepy
+    compositing. The captions are written as an ASS script laid out like the
+    TextClips, then decoded, drawn and encoded by ffmpeg without any frame
+    passing through Python.
+    """
+
+    def __init__(self, logger: AppLogger, prod=False):
+        self.logger = logger
+        self.prod = prod
+        self._font_cache: dict[str, tuple[str, float]] = {}
+
+    @staticmethod
+    def probe_video(video_path: Path) -> dict:
+        """Size, fps, duration and codec straight from ffmpeg, without opening a reader."""
+        infos = ffmpeg_parse_infos(str(video_path))
+        width, height = infos["video_size"]
+        return {
+            "width": int(width),
+            "height": int(height),
+            "fps": float(infos.get("video_fps") or 0),
+            "duration": float(infos.get("duration") or 0),
+            "codec": infos.get("video_codec_name"),
+            "profile": infos.get("video_profile"),
+            **CaptionBurner.probe_color(video_path),
+        }
+
+    @staticmethod
+    def probe_color(video_path: Path) -> dict:
+        """pix_fmt, color_range, colorspace, color_primaries and color_trc of the first video stream (None where unknown)."""
+        result = subprocess.run(
+            [FFMPEG_BINARY, "-hide_banner", "-i", str(video_path)], capture_output=True
+        )
+        return CaptionBurner.parse_color(result.stderr.decode(errors="replace"))
+
+    @staticmethod
+    def parse_color(ffmpeg_info: str) -> dict:
+        # "Video: h264 (High) (avc1 / 0x31637661), yuv420p(tv, bt470bg/bt709/bt709, progressive), 1280x720 ..."
+        color = dict.fromkeys(
+            ("pix_fmt", "color_range", "colorspace", "color_primaries", "color_trc")
+        )
+        match = re.search(r"Video: [^,\n]*, (\w+)(?:\(([^)]*)\))?", ffmpeg_info)
+        if match is None:
+            return color
+        color["pix_fmt"] = match.group(1)
+        for token in (match.group(2) or "").split(", "):
+            if token in ("tv", "pc"):
+                color["color_range"] = token
+            elif re.fullmatch(r"[\w-]+(/[\w-]+/[\w-]+)?", token) and token != "progressive":
+                # one name when space, primaries and transfer agree
+                parts = token.split("/")
+                color["colorspace"], color["color_primaries"], color["color_trc"] = (
+                    parts if len(parts) == 3 else parts * 3
+                )
+        return color
+
+    @staticmethod
+    def color_options(info: dict) -> list[str]:
+        """
+        x264 output flags tagging re-encoded video with the source's color
+        matrix, primaries and transfer, so players treat copied and
+        re-encoded GOPs alike.
+        """
+        options = []
+        for key in ("colorspace", "color_primaries", "color_trc"):
+            if info.get(key) not in (None, "unknown"):
+                options += [f"-{key}", info[key]]
+        return options
+
+    @staticmethod
+    def ass_color(hex_color: str) -> str:
+        # "#RRGGBB" -> ASS "&H00BBGGRR" (alpha first, 00 is opaque)
+        rgb = hex_color.lstrip("#")
+        return f"&H00{rgb[4:6]}{rgb[2:4]}{rgb[0:2]}".upper()
+
+    @staticmethod
+    def format_timestamp(seconds: float) -> str:
+        centis = max(0, round(seconds * 100))
+        hours, centis = divmod(centis, 360_000)
+        minutes, centis = divmod(centis, 6000)
+        secs, centis = divmod(centis, 100)
+        return f"{hours:d}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+    @staticmethod
+    def escape_text(text: str) -> str:
+        # keep libass from reading user text as override tags or line breaks
+        text = text.strip().replace("\\", "\\\u200b")
+        text = text.replace("{", "\\{").replace("}", "\\}")
+        return text.replace("\r\n", "\\N").replace("\n", "\\N")
+
+    def font_info(self, font_path: str) -> tuple[str, float]:
+        """
+        Family name libass looks the font up by, and the factor from a PIL
+        font size to an ASS one: PIL sizes the em square, libass (like VSFilter)
+        sizes ascent + descent, which is taller.
+        """
+        if font_path not in self._font_cache:
+            font = TTFont(font_path, lazy=True)
+            family = font["name"].getDebugName(1)
+            os2 = font["OS/2"]
+            scale = (os2.usWinAscent + os2.usWinDescent) / font["head"].unitsPerEm
+            self._font_cache[font_path] = (family, scale)
+        return self._font_cache[font_path]
+
+    def to_ass(
+        self,
+        audio_segments: list[AudioSegment],
+        width: int,
+        height: int,
+        caption_color: str,
+        font_size: int,
+        stroke_width: int,
+        pick_font: Callable[[str], str],
+        start: float = 0.0,
+        end: Optional[float] = None,
+    ) -> str:
+        """
+        ASS script for the captions between `start` and `end` (None = the end
+        of the video), timed relative to `start` so a chunk encoded on its own
+        gets just its own captions.
+        """
+        captioned = [
+            seg
+            for seg in audio_segments
+            if seg.text and seg.end_time > start and (end is None or seg.start_time < end)
+        ]
+
+        # one style per font, since libass can't fall back across our font files
+        styles: dict[str, str] = {}
+        events = []
+        for seg in captioned:
+            font_path = pick_font(seg.text)
+            if font_path not in styles:
+                styles[font_path] = f"Caption{len(styles)}"
+            events.append(
+                f"Dialogue: 0,{self.format_timestamp(seg.start_time - start)},"
+                f"{self.format_timestamp(seg.end_time - start)},{styles[font_path]},,0,0,0,,"
+                f"{self.escape_text(seg.text)}"
+            )
+
+        side_margin = round(width * (1 - CAPTION_WIDTH) / 2) + TEXT_MARGIN_PX
+        bottom_margin = int(height * BOTTOM_MARGIN) + TEXT_MARGIN_PX
+        style_lines = []
+        for font_path, style_name in styles.items():
+            family, scale = self.font_info(font_path)
+            style_lines.append(
+                f"Style: {style_name},{family},{font_size * scale:.1f},"
+                f"{self.ass_color(caption_color)},{self.ass_color(caption_color)},"
+                f"&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,{stroke_width},0,"
+                f"2,{side_margin},{side_margin},{bottom_margin},1"
+            )
+
+        return "\n".join(
+            [
+                "[Script Info]",
+                "ScriptType: v4.00+",
+                f"PlayResX: {width}",
+                f"PlayResY: {height}",
+                "WrapStyle: 0",
+                "ScaledBorderAndShadow: yes",
+                "",
+                "[V4+ Styles]",
+                "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, "
+                "OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, "
+                "ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+                "Alignment, MarginL, MarginR, MarginV, Encoding",
+                *style_lines,
+                "",
+                "[Events]",
+                "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+                *events,
+                "",
+            ]
+        )
+
+    def write_ass(
+        self,
+        audio_segments: list[AudioSegment],
+        path: Path,
+        width: int,
+        height: int,
+        caption_color: str,
+        font_size: int,
+        stroke_width: int,
+        pick_font: Callable[[str], str],
+        start: float = 0.0,
+        end: Optional[float] = None,
+    ) -> Path:
+        script = self.to_ass(
+            audio_segments,
+            width,
+            height,
+            caption_color,
+            font_size,
+            stroke_width,
+            pick_font,
+            start=start,
+            end=end,
+        )
+        Path(path).write_text(script, encoding="utf-8")
+        self.logger.logger.info(
+            f"Wrote ASS captions for {len(audio_segments)} segments to {path}"
+        )
+        return Path(path)
+
+    @staticmethod
+    def _filter_path(path: Path) -> str:
+        # paths inside a filtergraph need ':' '\' and quotes escaped
+        escaped = str(path).replace("\\", "\\\\").replace(":", "\\:")
+        return "'" + escaped.replace("'", "'\\''") + "'"
+
+    def keyframe_times(self, video_path: Path) -> list[float]:
+        """
+        Timestamps the video can be cut at without re-encoding (see
+        cut_points), read from the packets alone, nothing is decoded.
+        """
+        result = subprocess.run(
+            [
+                FFMPEG_BINARY,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                str(video_path),
+                "-map",
+                "0:v:0",
+                "-c",
+                "copy",
+                "-f",
+                "framecrc",
+                "-",
+            ],
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            self.logger.logger.warning(
+                f"Could not list keyframes of {video_path}, encoding it in one piece"
+            )
+            return []
+        return self.cut_points(result.stdout.decode(errors="replace"))
+
+    @staticmethod
+    def cut_points(framecrc: str) -> list[float]:
+        """
+        Seconds of the keyframes in ffmpeg `framecrc` output (packets in decode
+        order) that no later packet is displayed before. A keyframe flag alone
+        also covers open-GOP I-frames, whose leading B-frames reference the
+        previous GOP; a piece starting there would not decode on its own.
+        """
+        timebase = None  # (num, den)
+        packets: list[tuple[int, bool]] = []  # (pts, keyframe) in decode order
+        for line in framecrc.splitlines():
+            if line.startswith("#tb"):
+                num, den = line.split(":", 1)[1].strip().split("/")
+                timebase = (int(num), int(den))
+                continue
+            if line.startswith("#") or not line.strip():
+                continue
+            fields = [field.strip() for field in line.split(",")]
+            # flags are only printed when they aren't exactly "keyframe"
+            flags = next((int(f[2:], 16) for f in fields[6:] if f.startswith("F=")), 1)
+            packets.append((int(fields[2]), bool(flags & 1)))
+        if timebase is None:
+            return []
+
+        cuts = []
+        earliest_after = math.inf
+        for pts, key in reversed(packets):
+            if key and pts <= earliest_after:
+                cuts.append(pts * timebase[0] / timebase[1])
+            earliest_after = min(earliest_after, pts)
+        return sorted(cuts)
+
+    @staticmethod
+    def split_at_keyframes(
+        keyframes: list[float],
+        duration: float,
+        chunks: int,
+        min_chunk_seconds: float = MIN_CHUNK_SECONDS,
+    ) -> list[BurnChunk]:
+        """
+        Cut the timeline into up to `chunks` ranges of roughly equal length,
+        each starting on a keyframe so no chunk decodes frames it then drops.
+        """
+        if min_chunk_seconds > 0:
+            chunks = min(chunks, int(duration // min_chunk_seconds))
+        boundaries: list[float] = []
+        for i in range(1, max(1, chunks)):
+            target = duration * i / chunks
+            after = boundaries[-1] if boundaries else 0.0
+            candidates = [k for k in keyframes if after < k < duration]
+            if candidates:
+                boundaries.append(min(candidates, key=lambda k: abs(k - target)))
+
+        starts = [0.0] + boundaries
+        ends: list[Optional[float]] = boundaries + [None]
+        return [BurnChunk(start=s, end=e) for s, e in zip(starts, ends)]
+
+    @staticmethod
+    def split_by_captions(
+        plan: list[BurnChunk],
+        keyframes: list[float],
+        audio_segments: list[AudioSegment],
+    ) -> list[BurnChunk]:
+        """
+        Split each chunk of `plan` into its GOPs, mark the GOPs no caption
+        overlaps as copies and merge neighbours of the same kind. Re-encoded
+        runs never merge across chunks so they still encode in parallel.
+        """
+        intervals = [(seg.start_time, seg.end_time) for seg in audio_segments if seg.text]
+        result: list[BurnChunk] = []
+        for chunk in plan:
+            chunk_end = math.inf if chunk.end is None else chunk.end
+            starts = [chunk.start] + [k for k in keyframes if chunk.start < k < chunk_end]
+            ends: list[Optional[float]] = starts[1:] + [chunk.end]
+            first = True
+            for start, end in zip(starts, ends):
+                stop = math.inf if end is None else end
+                copy = not any(s < stop and e > start for s, e in intervals)
+                previous = result[-1] if result else None
+                if (
+                    previous is not None
+                    and previous.copy == copy
+                    and previous.end == start
+                    and (copy or not first)
+                ):
+                    previous.end = end
+                else:
+                    result.append(BurnChunk(start=start, end=end, copy=copy))
+                first = False
+        return result
+
+    @staticmethod
+    def can_smart_render(info: dict) -> bool:
+        # copied GOPs and our libx264 pieces have to be one decodable h264 stream
+        # with the same pixels: the pieces are limited-range yuv420p, splicing
+        # them between full-range (yuvj420p/pc) GOPs would jump in brightness
+        return (
+            info.get("codec") == "h264"
+            and info.get("profile") in SMART_RENDER_PROFILES
+            and info.get("pix_fmt") == "yuv420p"
+            and info.get("color_range") != "pc"
+        )
+
+    def plan_chunks(
+        self,
+        video_path: Path,
+        duration: float,
+        chunks: int = ENCODE_CHUNKS,
+        audio_segments: Optional[list[AudioSegment]] = None,
+    ) -> list[BurnChunk]:
+        """
+        Keyframe-aligned ranges to burn `video_path` in: up to `chunks` for
+        parallel encoders, and with `audio_segments` (smart rendering) split
+        further so uncaptioned GOPs are stream-copied.
+        """
+        parallel = chunks > 1 and duration >= 2 * MIN_CHUNK_SECONDS
+        if not parallel and audio_segments is None:
+            return [BurnChunk(start=0.0, end=None)]
+
+        keyframes = self.keyframe_times(video_path)
+        plan = (
+            self.split_at_keyframes(keyframes, duration, chunks)
+            if parallel
+            else [BurnChunk(start=0.0, end=None)]
+        )
+        if audio_segments is not None and keyframes:
+            plan = self.split_by_captions(plan, keyframes, audio_segments)
+
+        copied = sum(
+            (duration if c.end is None else c.end) - c.start for c in plan if c.copy
+        )
+        self.logger.logger.info(
+            f"Burning {video_path} in {len(plan)} chunks starting at {[c.start for c in plan]}, "
+            f"{copied:.1f}s of {duration:.1f}s stream-copied"
+        )
+        return plan
+
+    def _ffmpeg_command(
+        self,
+        video_path: Path,
+        ass_path: Path,
+        fonts_dir: Path,
+        profile: EncoderProfile,
+        threads: int,
+        input_options=(),
+        output_options=(),
+    ) -> list[str]:
+        # decoder, filter graph and x264 all get `threads`, otherwise ffmpeg
+        # sizes the first two for the whole machine
+        return [
+            FFMPEG_BINARY,
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-nostats",
+            "-progress",
+            "pipe:1",
+            "-filter_threads",
+            str(threads),
+            *input_options,
+            "-threads",
+            str(threads),
+            "-i",
+            str(video_path),
+            "-vf",
+            f"ass={self._filter_path(ass_path)}:fontsdir={self._filter_path(fonts_dir)}",
+            "-map",
+            "0:v:0",
+            "-c:v",
+            "libx264",
+            *profile.x264_args(),
+            *output_options,
+            "-threads",
+            str(threads),
+        ]
+
+    def _run(
+        self,
+        command: list[str],
+        on_frame: Optional[Callable[[int], None]] = None,
+        should_stop: Optional[Callable[[], None]] = None,
+    ):
+        proc = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        # drained on the side: a damaged input can log enough errors to fill the
+        # pipe, which would block ffmpeg and with it the progress loop below
+        stderr: list[bytes] = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr.append(proc.stderr.read()), daemon=True
+        )
+        stderr_thread.start()
+        try:
+            # -progress writes key=value blocks, one per update
+            for line in proc.stdout:
+                key, _, value = line.decode(errors="replace").strip().partition("=")
+                if should_stop is not None:
+                    should_stop()
+                if key == "frame" and on_frame is not None and value.isdigit():
+                    on_frame(int(value))
+            proc.wait()
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            stderr_thread.join()
+
+        if proc.returncode != 0:
+            message = b"".join(stderr).decode(errors="replace").strip()
+            self.logger.logger.error(f"Error burning captions: {message}")
+            raise RuntimeError(
+                f"ffmpeg failed to burn captions ({proc.returncode}): {message}"
+            )
+
+    def _piece_command(
+        self,
+        video_path: Path,
+        chunk: BurnChunk,
+        ass_path: Optional[Path],
+        fonts_dir: Path,
+        fps: float,
+        profile: EncoderProfile,
+        threads: int,
+        piece_path: Path,
+        output_options=(),
+    ) -> list[str]:
+        input_options = ["-ss", f"{chunk.start:.6f}"]
+        if chunk.end is not None:
+            # stop half a frame early so the next chunk's keyframe isn't in this one too
+            length = chunk.end - chunk.start - (0.5 / fps if fps else 0)
+            input_options += ["-t", f"{length:.6f}"]
+
+        if chunk.copy:
+            # starts on a keyframe, so the packets can be taken over as they are
+            return [
+                FFMPEG_BINARY,
+                "-y",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-nostats",
+                "-progress",
+                "pipe:1",
+                *input_options,
+                "-i",
+                str(video_path),
+                "-map",
+                "0:v:0",
+                "-c:v",
+                "copy",
+                "-an",
+                str(piece_path),
+            ]
+
+        command = self._ffmpeg_command(
+            video_path, ass_path, fonts_dir, profile, threads, input_options, output_options
+        )
+        return command + ["-an", str(piece_path)]
+
+    def burn(
+        self,
+        video_path: Path,
+        chunks: list[tuple[BurnChunk, Optional[Path]]],
+        output_path: Path,
+        fonts_dir: Path,
+        fps: float = 0,
+        total_frames: Optional[int] = None,
+        on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        max_parallel: Optional[int] = None,
+        encoder_profile: Optional[EncoderProfile] = None,
+        threads: Optional[int] = None,
+        color_options: Sequence[str] = (),
+    ) -> Path:
+        """
+        Draw each chunk's ASS script onto its range of the video and encode
+        it; chunks marked `copy` (no ASS script) are stream-copied instead.
+        Video is libx264 with `encoder_profile`'s settings (the deployment
+        default if None), the audio stream is copied untouched (re-encoded to
+        aac only if mp4 can't hold it).
+
+        A single encoded chunk is one ffmpeg pass. Otherwise up to
+        `max_parallel` ffmpeg processes write video-only MPEG-TS pieces (h264
+        parameter sets in-band) that the concat demuxer joins without
+        re-encoding, muxed with the original audio. Copied and re-encoded
+        pieces carry different SPS/PPS, so a mix of them is tagged avc3,
+        which keeps the parameter sets in-band instead of only the first
+        piece's in the avcC box.
+
+        `color_options` (see color_options()) tag the x264 output like the
+        source. `threads` is the whole encode's thread budget (all cores if None),
+        split between the encoders running at once unless the profile pins
+        a per-encoder count.
+
+        `on_progress` gets (frames done, total frames); a cancelled token
+        kills ffmpeg and raises.
+        """
+        audio_codec = mp4_audio_codec(video_path)
+        profile = encoder_profile or get_encoder_profile()
+        threads = threads or os.cpu_count() or 1
+        should_stop = cancel_token.raise_if_cancelled if cancel_token else None
+
+        def report(frames: int):
+            if on_progress is not None:
+                on_progress(frames, total_frames)
+
+        if len(chunks) == 1 and not chunks[0][0].copy:
+            _, ass_path = chunks[0]
+            self.logger.logger.info(
+                f"Burning captions into {video_path} with ffmpeg ({profile.name} profile)"
+            )
+            command = self._ffmpeg_command(
+                video_path,
+                ass_path,
+                fonts_dir,
+                profile,
+                profile.threads or threads,
+                output_options=color_options,
+            )
+            command += ["-map", "0:a:0?", "-c:a", audio_codec, str(output_path)]
+            self._run(command, on_frame=report, should_stop=should_stop)
+            self.logger.logger.info(f"Successfully burned captions into {output_path}")
+            return Path(output_path)
+
+        encoders = sum(1 for chunk, _ in chunks if not chunk.copy)
+        workers = max(1, min(len(chunks), max_parallel or len(chunks)))
+        self.logger.logger.info(
+            f"Burning captions into {video_path}: {encoders} re-encoded and "
+            f"{len(chunks) - encoders} copied pieces, {workers} at a time ({profile.name} profile)"
+        )
+        # split the budget between the encoders instead of each x264 taking all of it
+        piece_threads = profile.threads or max(1, threads // max(1, min(workers, encoders)))
+        frames_done = [0] * len(chunks)
+        lock = threading.Lock()
+        failed = threading.Event()
+
+        mixed = any(chunk.copy for chunk, _ in chunks) and encoders > 0
+        with tempfile.TemporaryDirectory(dir=Path(output_path).parent) as work_dir:
+            pieces = [Path(work_dir) / f"chunk_{i:03d}.ts" for i in range(len(chunks))]
+
+            def encode(i: int):
+                chunk, ass_path = chunks[i]
+
+                def on_frame(frames: int):
+                    with lock:
+                        frames_done[i] = frames
+                        total = sum(frames_done)
+                    report(total)
+
+                def stop():
+                    if failed.is_set():
+                        raise RuntimeError("another chunk failed")
+                    if should_stop is not None:
+                        should_stop()
+
+                command = self._piece_command(
+                    video_path,
+                    chunk,
+                    ass_path,
+                    fonts_dir,
+                    fps,
+                    profile,
+                    piece_threads,
+                    pieces[i],
+                    color_options,
+                )
+                try:
+                    self._run(command, on_frame=on_frame, should_stop=stop)
+                except BaseException:
+                    failed.set()
+                    raise
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(encode, i) for i in range(len(chunks))]:
+                    future.result()
+
+            # exact durations keep the joined timestamps continuous, whatever
+            # each piece's container reports
+            concat_list = Path(work_dir) / "chunks.txt"
+            entries = []
+            for (chunk, _), piece in zip(chunks, pieces):
+                entries.append(f"file '{piece}'\n")
+                if chunk.end is not None:
+                    entries.append(f"duration {chunk.end - chunk.start:.6f}\n")
+            concat_list.write_text("".join(entries), encoding="utf-8")
+            self._run(
+                [
+                    FFMPEG_BINARY,
+                    "-y",
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-i",
+                    str(concat_list),
+                    "-i",
+                    str(video_path),
+                    "-map",
+                    "0:v:0",
+                    "-map",
+                    "1:a:0?",
+                    "-c:v",
+                    "copy",
+                    *(["-tag:v", "avc3"] if mixed else []),
+                    "-c:a",
+                    audio_codec,
+                    str(output_path),
+                ]
+            )
+
+        self.logger.logger.info(f"Successfully burned captions into {output_path}")
+        return Path(output_path)
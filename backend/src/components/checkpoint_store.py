@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from .logger_component import AppLogger
+
+
+class CheckpointStore:
+    """
+    Compact per-job stage outputs (VAD timestamps, segment languages,
+    transcripts, translations) kept as JSON files in the job's spool directory.
+
+    If the worker dies mid-job the next attempt loads these and skips the
+    stages that already finished. Only small metadata is stored; audio is
+    re-extracted from the video when an earlier stage still has to run.
+    """
+
+    def __init__(self, job_dir: Path, logger: AppLogger):
+        self.job_dir = Path(job_dir)
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logger
+
+    def _path(self, stage: str) -> Path:
+        return self.job_dir / f"{stage}.json"
+
+    def load(self, stage: str) -> Optional[Any]:
+        try:
+            data = json.loads(self._path(stage).read_text())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # a torn/corrupt checkpoint just means the stage runs again
+            self.logger.logger.warning(f"Ignoring unreadable checkpoint '{stage}': {e}")
+            return None
+
+        self.logger.logger.info(f"Loaded checkpoint '{stage}' from {self.job_dir}")
+        return data
+
+    def save(self, stage: str, data: Any):
+        try:
+            # write-then-rename so a crash mid-write never leaves a partial file behind
+            fd, tmp_path = tempfile.mkstemp(dir=self.job_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(stage))
+        except Exception as e:
+            # checkpoints are an optimization, never fail the job over one
+            self.logger.logger.warning(f"Could not save checkpoint '{stage}': {e}")
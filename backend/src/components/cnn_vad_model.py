@@ -0,0 +1,147 @@
+from .logger_component import AppLogger
+from .vad_engine import VADEngine
+import importlib.util
+import os
+import torch
+from pathlib import Path
+from typing import Callable, Optional
+
+# where models/'s VAD training pipeline copies its weights and model definitions
+CNN_VAD_DIR = Path(__file__).resolve().parent.parent.parent / "model"
+
+# mel front end and patching exactly as VADPipeline builds its training data
+SAMPLE_RATE = 16000
+N_FFT = 512
+HOP_LENGTH = N_FFT // 2
+NUM_MEL_BANDS = 40
+PATCH_FRAMES = NUM_MEL_BANDS  # patches are square, 40 mel frames = 0.64 s
+PATCH_HOP = PATCH_FRAMES // 2
+PATCH_HOP_SECONDS = PATCH_HOP * HOP_LENGTH / SAMPLE_RATE
+
+# TorchScript export (models/ VADModelExporter) loaded instead of the state_dict when
+# present: no Python model class needed, int8 by default. Empty = always the state_dict
+CNN_VAD_TORCHSCRIPT = os.environ.get("MAC_CNN_VAD_TORCHSCRIPT", "vad_model_int8.ts")
+
+# patch probability at or above which it counts as speech
+CNN_VAD_THRESHOLD = float(os.environ.get("MAC_CNN_VAD_THRESHOLD", "0.5"))
+# patches per forward pass
+CNN_VAD_BATCH_SIZE = int(os.environ.get("MAC_CNN_VAD_BATCH_SIZE", "1024"))
+
+
+def _load_definition(name: str, model_dir: Path):
+    # the definitions sit next to the weights as plain files, not as a package
+    spec = importlib.util.spec_from_file_location(f"cnn_vad_{name}", model_dir / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+def load_cnn_vad(model_dir: Path = CNN_VAD_DIR) -> torch.nn.Module:
+    scripted = model_dir / CNN_VAD_TORCHSCRIPT
+    if CNN_VAD_TORCHSCRIPT and scripted.is_file():
+        return torch.jit.load(str(scripted), map_location="cpu").eval()
+    network = _load_definition("VADModel", model_dir)()
+    network.load_state_dict(
+        torch.load(model_dir / "vad_model.pth", map_location="cpu", weights_only=True)
+    )
+    return network.eval()
+
+
+class CNNVADModel(VADEngine):
+    """
+    The "cnn" VAD engine: the 40x40 mel-patch classifier trained in
+    models/src/VAD/training, run over the whole waveform in large batches.
+    """
+
+    def __init__(self, model, logger: AppLogger, prod=False, model_dir: Path = CNN_VAD_DIR):
+        super().__init__(model=model, logger=logger, prod=prod)
+        self.mel_spec = _load_definition("MelSpecPipeline", model_dir)(
+            n_fft=N_FFT, sample_rate=SAMPLE_RATE, n_mel=NUM_MEL_BANDS, hop_length=HOP_LENGTH
+        )
+        self.threshold = CNN_VAD_THRESHOLD
+        self.batch_size = CNN_VAD_BATCH_SIZE
+        self.logger.logger.info("CNNVADModel initialized")
+
+    def detect_speech(
+        self,
+        audio_tensor: torch.Tensor,
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> list[dict[str, float]]:
+        if sample_rate not in self.allowed_sample_rates:
+            raise ValueError(
+                f"CNN VAD expects {self.allowed_sample_rates} Hz audio, got {sample_rate}"
+            )
+        try:
+            self.logger.logger.info("Starting CNN VAD processing")
+            probs = self.score_patches(audio_tensor, on_progress=on_progress)
+            speech_timestamps = self.intervals_from_patches(
+                (probs >= self.threshold).tolist(), audio_tensor.numel() / sample_rate
+            )
+            self.logger.logger.info(
+                f"Detected {len(speech_timestamps)} speech segments over {len(probs)} patches"
+            )
+            return speech_timestamps
+
+        except Exception as e:
+            self.logger.logger.error(f"Error during CNN VAD processing: {str(e)}")
+            raise
+
+    @torch.inference_mode()
+    def score_patches(
+        self,
+        audio_tensor: torch.Tensor,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> torch.Tensor:
+        """
+        Speech probability of every mel patch: one spectrogram of the whole
+        waveform, unfolded into 40x40 patches every PATCH_HOP frames (as views)
+        and scored `batch_size` at a time.
+        """
+        wave = audio_tensor.float().reshape(1, -1)
+        if wave.shape[1] < N_FFT:
+            return torch.empty(0)
+        mels = self.mel_spec(wave)  # (1, mel, frames)
+        if mels.shape[-1] < PATCH_FRAMES:
+            return torch.empty(0)
+        # (patches, 1, mel, time), the layout of the training data
+        patches = mels.unfold(-1, PATCH_FRAMES, PATCH_HOP).permute(2, 0, 1, 3)
+
+        probs = torch.empty(len(patches))
+        for start in range(0, len(patches), self.batch_size):
+            batch = patches[start : start + self.batch_size].contiguous()
+            probs[start : start + len(batch)] = self.model(batch).reshape(-1)
+
+            if on_progress is not None:
+                on_progress(100 * (start + len(batch)) / len(patches))
+        return probs
+
+    @staticmethod
+    def intervals_from_patches(speech: list[bool], duration_s: float) -> list[dict[str, float]]:
+        """
+        Turns patch decisions into {"start", "end"} intervals in seconds.
+
+        Patches overlap by half, so every PATCH_HOP_SECONDS hop is covered by
+        two of them. A patch was labelled speech in training if any of it
+        overlapped speech, so a hop is speech only when all patches covering
+        it say so. A hop (320 ms) is already longer than Silero's 300 ms
+        minimum silence/250 ms minimum speech, so runs need no further merging.
+        """
+        intervals = []
+        start = None
+        # one hop past the last patch, which closes a run still open there
+        for hop in range(len(speech) + 2):
+            covering = speech[max(hop - 1, 0) : hop + 1]
+            if covering and all(covering):
+                if start is None:
+                    start = hop * PATCH_HOP_SECONDS
+                continue
+            if start is not None:
+                intervals.append((start, hop * PATCH_HOP_SECONDS))
+                start = None
+
+        # seconds rounded like get_speech_timestamps(return_seconds=True)
+        return [
+            {"start": round(start, 1), "end": round(min(end, duration_s), 1)}
+            for start, end in intervals
+        ]
@@ -3,12 +3,16 @@ import boto3
 from pydantic import AnyHttpUrl
 from .logger_component import AppLogger
 import os
+import subprocess
 import tempfile
 from datetime import datetime
 from urllib.parse import urlparse
 from moviepy import VideoFileClip, CompositeVideoClip
 from pathlib import Path
 from ..dataclasses.inputs.caption_status import CaptionStatus, Status
+from .ranged_download import RangedDownload
+from .audio_decoder import mp4_audio_codec
+from .encoder_profiles import EncoderProfile, get_encoder_profile
 
 
 class AppDataLoader:
@@ -33,6 +37,10 @@ class AppDataLoader:
             ".mkv": "video/x-matroska",
             ".flv": "video/x-flv",
             ".wmv": "video/x-ms-wmv",
+            # subtitle-only outputs
+            ".srt": "application/x-subrip",
+            ".vtt": "text/vtt",
+            ".json": "application/json",
         }
         self.aws_upload_dir = "uploads"
         self.aws_downloads_dir = "downloads"
@@ -95,39 +103,113 @@ class AppDataLoader:
                 f"Error in trying to generate presigned URL: {str(e)}"
             )
 
-    def retrieve_video(self, s3_url: AnyHttpUrl) -> tuple[VideoFileClip, Path]:
-        key = ""
+    @staticmethod
+    def key_from_url(s3_url: AnyHttpUrl) -> str:
+        # AnyHttpUrl guarantees this is an http/https URL
+        # Extract the path component directly (e.g., "/uploads/video.mp4")
+        # Use .path to get just the path without query parameters
+        return urlparse(s3_url.unicode_string()).path.lstrip("/")
+
+    def probe_duration(self, s3_url: AnyHttpUrl, timeout: float = 15) -> float:
+        """
+        Video duration in seconds without downloading the object: ffprobe reads
+        the container header through a presigned GET URL (ranged reads only).
+        """
+        key = self.key_from_url(s3_url)
+        url = self.gen_s3_download_url(bucket=self.BUCKET, key=key, expiration=300)
         try:
-            # AnyHttpUrl guarantees this is an http/https URL
-            # Extract the path component directly (e.g., "/uploads/video.mp4")
-            # Use .path to get just the path without query parameters
-            key = urlparse(s3_url.unicode_string()).path.lstrip("/")
+            result = subprocess.run(
+                [
+                    "ffprobe",
+                    "-v",
+                    "error",
+                    "-show_entries",
+                    "format=duration",
+                    "-of",
+                    "default=noprint_wrappers=1:nokey=1",
+                    url,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=True,
+            )
+            duration = float(result.stdout.strip())
+        except Exception as e:
+            self.logger.logger.error(f"Error probing duration of {key}: {str(e)}")
+            raise
 
-            self.logger.logger.info(f"Retrieving video from S3: {key}")
-            if not key.lower().endswith(self.allowed_formats):
-                raise ValueError(
-                    f"For downloading, only {', '.join(self.allowed_formats)} files are supported. Given: {key}"
-                )
+        self.logger.logger.info(f"Probed duration of {key}: {duration:.1f}s")
+        return duration
 
-            file_ext = key[key.rfind(".") :]
+    def retrieve_video(self, s3_url: AnyHttpUrl) -> tuple[VideoFileClip, Path]:
+        temp_path = self.download_video(s3_url)
+        return self.open_video(temp_path), temp_path
 
-            # Create a temp file path in the logger's logs directory
-            temp_file = tempfile.NamedTemporaryFile(
-                suffix=file_ext, delete=False, dir=self.logger.log_root
+    def _video_temp_path(self, key: str) -> Path:
+        if not key.lower().endswith(self.allowed_formats):
+            raise ValueError(
+                f"For downloading, only {', '.join(self.allowed_formats)} files are supported. Given: {key}"
             )
-            temp_path = Path(temp_file.name)
-            temp_file.close()
 
-            self.temp_files.append(temp_path)
+        return self.new_temp_path(suffix=key[key.rfind(".") :])
+
+    def new_temp_path(self, suffix: str) -> Path:
+        """Empty temp file in the job's temp dir (the logger's logs directory), removed by cleanup_temp_files."""
+        temp_file = tempfile.NamedTemporaryFile(
+            suffix=suffix, delete=False, dir=self.logger.log_root
+        )
+        temp_path = Path(temp_file.name)
+        temp_file.close()
+
+        self.temp_files.append(temp_path)
+        return temp_path
+
+    def start_video_download(self, s3_url: AnyHttpUrl) -> RangedDownload:
+        """
+        Start downloading the uploaded video with parallel ranged GETs in the
+        background. The returned download's `iter_bytes()` streams the file in
+        order while it arrives and `wait()` returns its path once complete.
+        """
+        key = ""
+        try:
+            key = self.key_from_url(s3_url)
+            self.logger.logger.info(f"Streaming video from S3: {key}")
+            temp_path = self._video_temp_path(key)
+            return RangedDownload(
+                s3_client=self.s3_client,
+                bucket=self.BUCKET,
+                key=key,
+                dest_path=temp_path,
+                logger=self.logger,
+            ).start()
+        except self.s3_client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                self.logger.logger.error(f"Video not found in S3: {key}")
+                raise FileNotFoundError(
+                    f"Video not found, need to have been uploaded beforehand: {key}"
+                )
+            self.logger.logger.error(f"Error streaming video: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.logger.error(f"Error streaming video: {str(e)}")
+            raise
+
+    def download_video(self, s3_url: AnyHttpUrl) -> Path:
+        """Download the uploaded video to a temp file without decoding it."""
+        key = ""
+        try:
+            key = self.key_from_url(s3_url)
+
+            self.logger.logger.info(f"Retrieving video from S3: {key}")
+            temp_path = self._video_temp_path(key)
 
             # Stream download straight to disk
             with open(temp_path, "wb") as f:
                 self.s3_client.download_fileobj(self.BUCKET, key, f)
 
-            video_clip = VideoFileClip(temp_path)
-
             self.logger.logger.info(f"Successfully retrieved video: {key}")
-            return video_clip, temp_path
+            return temp_path
 
         except self.s3_client.exceptions.NoSuchKey:
             self.logger.logger.error(f"Video not found in S3: {key}")
@@ -138,7 +220,30 @@ class AppDataLoader:
             self.logger.logger.error(f"Error retrieving video: {str(e)}")
             raise
 
-    def save_captioned_disk(self, video: CompositeVideoClip) -> Path:
+    def open_video(self, video_path: Path) -> VideoFileClip:
+        try:
+            return VideoFileClip(video_path)
+        except Exception as e:
+            self.logger.logger.error(f"Error opening video {video_path}: {str(e)}")
+            raise
+
+    def save_captioned_disk(
+        self,
+        video: CompositeVideoClip,
+        progress_logger="bar",
+        audio_source: Path | None = None,
+        encoder_profile: EncoderProfile | None = None,
+        threads: int | None = None,
+    ) -> Path:
+        """
+        Encode `video` to mp4 with `encoder_profile`'s x264 settings (the
+        deployment default if None), on `threads` threads unless the profile
+        pins its own. With `audio_source` (the original upload) its audio
+        stream is copied into the output as-is instead of moviepy decoding it
+        to a temp sound file and re-encoding that to aac.
+        """
+        encode_options = (encoder_profile or get_encoder_profile()).moviepy_kwargs()
+        encode_options["threads"] = encode_options["threads"] or threads
         try:
             output_filename = (
                 f"captioned_{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}.mp4"
@@ -147,12 +252,27 @@ class AppDataLoader:
             # changed output to prevent weird behavior of writing to root directory which could break permissions on docker image
             output_path = Path(__file__).parent.parent / output_filename
 
-            self.logger.logger.info(f"Saving captioned video to: {output_path}")
-            video.write_videofile(str(output_path), codec="libx264", audio_codec="aac")
-
-            # make sure to delete afterwards
+            # make sure to delete afterwards (also covers a half-written file if the encode is aborted)
             self.temp_files.append(output_path)
 
+            encode_options["audio_codec"] = "aac"
+            if audio_source is not None:
+                # moviepy passes a file given as `audio` to ffmpeg as a second
+                # input, the maps keep its video stream out of the output
+                encode_options["audio"] = str(audio_source)
+                encode_options["audio_codec"] = mp4_audio_codec(audio_source)
+                encode_options["ffmpeg_params"] += ["-map", "0:v:0", "-map", "1:a:0?"]
+
+            self.logger.logger.info(
+                f"Saving captioned video to: {output_path} (preset {encode_options['preset']}, audio codec {encode_options['audio_codec']})"
+            )
+            video.write_videofile(
+                str(output_path),
+                codec="libx264",
+                logger=progress_logger,
+                **encode_options,
+            )
+
             self.logger.logger.info(
                 f"Successfully saved captioned video: {output_path}"
             )
@@ -251,20 +371,15 @@ class AppDataLoader:
             raise
 
     def get_caption_status(self, job_id: UUID) -> CaptionStatus:
+        """
+        The job's status as last written to S3, UNINITIATED if there is no
+        status file. S3 errors and unparsable files raise instead of turning
+        into a FAILED status: the job may well still be running.
+        """
         try:
             key = self.gen_status_file_key(job_id)
             obj = self.s3_client.get_object(Bucket=self.BUCKET, Key=key)
             content = obj["Body"].read().decode("utf-8")
-            try:
-                return CaptionStatus.model_validate_json(content)
-            except Exception as e:
-                self.logger.logger.error(f"Error parsing status file JSON: {str(e)}")
-                return CaptionStatus(
-                    job_id=job_id,
-                    status=Status.FAILED,
-                    message="Error parsing status file JSON",
-                )
-
         except self.s3_client.exceptions.NoSuchKey:
             return CaptionStatus(
                 job_id=job_id,
@@ -273,11 +388,13 @@ class AppDataLoader:
             )
         except Exception as e:
             self.logger.logger.error(f"Error retrieving status file from S3: {str(e)}")
-            return CaptionStatus(
-                job_id=job_id,
-                status=Status.FAILED,
-                message="Error retrieving status file from S3: " + str(e),
-            )
+            raise
+
+        try:
+            return CaptionStatus.model_validate_json(content)
+        except Exception as e:
+            self.logger.logger.error(f"Error parsing status file JSON: {str(e)}")
+            raise
 
     def gen_status_file_key(self, job_id: UUID) -> str:
         return f"{self.aws_upload_dir}/{str(job_id)}_status.txt"
\ No newline at end of file
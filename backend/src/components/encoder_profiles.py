@@ -0,0 +1,50 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    """libx264 settings for the captioned video, trading encode speed for size/quality."""
+
+    name: str
+    preset: str
+    crf: int
+    tune: Optional[str] = None
+    threads: Optional[int] = None  # None lets x264 (or the chunk split) decide
+
+    def x264_args(self) -> list[str]:
+        """ffmpeg output options after `-c:v libx264`."""
+        args = ["-preset", self.preset, "-crf", str(self.crf), "-pix_fmt", "yuv420p"]
+        if self.tune:
+            args += ["-tune", self.tune]
+        return args
+
+    def moviepy_kwargs(self) -> dict:
+        """The same settings as write_videofile arguments (moviepy sets the pixel format itself)."""
+        params = ["-crf", str(self.crf)]
+        if self.tune:
+            params += ["-tune", self.tune]
+        return {"preset": self.preset, "threads": self.threads, "ffmpeg_params": params}
+
+
+ENCODER_PROFILES: dict[str, EncoderProfile] = {
+    # quick turnaround at a somewhat larger file
+    "fast": EncoderProfile(name="fast", preset="veryfast", crf=23),
+    # x264's own defaults, what moviepy used before profiles existed
+    "balanced": EncoderProfile(name="balanced", preset="medium", crf=23),
+    # for keeping: slower, visually closer to the source
+    "archive": EncoderProfile(name="archive", preset="slow", crf=18),
+}
+
+# deployment default, jobs may pick another one with `encoder_profile`
+ENCODER_PROFILE = os.environ.get("MAC_ENCODER_PROFILE", "balanced")
+
+
+def get_encoder_profile(name: Optional[str] = None) -> EncoderProfile:
+    name = name or ENCODER_PROFILE
+    if name not in ENCODER_PROFILES:
+        raise ValueError(
+            f"Unknown encoder profile '{name}', expected one of {list(ENCODER_PROFILES)}"
+        )
+    return ENCODER_PROFILES[name]
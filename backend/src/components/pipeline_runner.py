@@ -1,14 +1,36 @@
 from .logger_component import AppLogger
 from .data_loader import AppDataLoader
 from .asr_model import ASRModel
-from .vad_model import VADModel
+from .vad_model import VADModel, STREAMING_VAD, STREAM_CHUNK_SECONDS
+from .vad_engine import VAD_ENGINE, VAD_ENGINES
+from .cnn_vad_model import CNNVADModel
 from .slid_model import SLIDModel
 from .video_processor import VideoProcessor, CompositeVideoClip
 from .translater import AppTranslater
+from .progress_reporter import ProgressReporter, EncodeProgressLogger
+from .cancellation import CancellationToken, JobCancelled
+from .result_cache import ResultCache, file_sha256, render_version
+from .checkpoint_store import CheckpointStore
+from .ranged_download import STREAMING_DOWNLOAD
+from .audio_decoder import StreamingAudioDecoder, PCM_MMAP
+from .subtitle_writer import SubtitleWriter, SUBTITLE_FORMATS
+from .subtitle_muxer import SubtitleMuxer
+from .encoder_profiles import get_encoder_profile
+from .caption_burner import (
+    CaptionBurner,
+    RENDER_ENGINE,
+    RENDER_ENGINES,
+    ENCODE_CHUNKS,
+    SMART_RENDER,
+)
 import logging
+import os
+import torch
+from concurrent.futures import ThreadPoolExecutor
 from moviepy import TextClip
 from ..dataclasses.audio_segment import AudioSegment
 from pydantic import AnyHttpUrl
+from pathlib import Path
 
 
 class PipelineRunner:
@@ -20,20 +42,99 @@ class PipelineRunner:
         asr_model,
         convert_to="",
         explicit_langs: list[str] = [],
+        num_threads: int = 0,
+        progress: ProgressReporter | None = None,
+        cancel_token: CancellationToken | None = None,
+        result_cache_dir: Path | None = None,
+        checkpoint_dir: Path | None = None,
+        streaming_download: bool = STREAMING_DOWNLOAD,
+        streaming_vad: bool = STREAMING_VAD,
+        vad_engine: str = VAD_ENGINE,
+        output_format: str = "video",
+        render_engine: str = RENDER_ENGINE,
+        encoder_profile: str | None = None,
         prod=False,
     ):
         self.prod = prod
         self.file_path = file_path
+        # reports stage transitions/counters to whoever polls the job, no-op by default
+        self.progress = progress or ProgressReporter()
+        # checked between stages/segments/frames, never cancelled by default
+        self.cancel_token = cancel_token or CancellationToken()
 
         self.logger = AppLogger(log_suffix="pipe", level=logging.INFO, prod=self.prod)
         self.loader = AppDataLoader(logger=self.logger, prod=self.prod)
-        self.vad_model = VADModel(model=vad_model, logger=self.logger, prod=self.prod)
+        # `vad_model` is whatever worker.load_vad_model loaded for this engine
+        if vad_engine not in VAD_ENGINES:
+            raise ValueError(
+                f"Unknown vad_engine '{vad_engine}', expected one of {list(VAD_ENGINES)}"
+            )
+        self.vad_engine = vad_engine
+        vad_class = CNNVADModel if vad_engine == "cnn" else VADModel
+        self.vad_model = vad_class(model=vad_model, logger=self.logger, prod=self.prod)
         self.slid_model = SLIDModel(
             model=slid_model, logger=self.logger, prod=self.prod
         )
-        self.asr_model = ASRModel(logger=self.logger, model=asr_model, prod=self.prod)
+        self.asr_model = ASRModel(
+            logger=self.logger,
+            model=asr_model,
+            max_workers=num_threads or None,
+            prod=self.prod,
+        )
         self.translater = AppTranslater(logger=self.logger, prod=self.prod)
         self.video_processor = VideoProcessor(logger=self.logger, prod=self.prod)
+        # "video" burns captions in, "video_soft" muxes them in as a subtitle track,
+        # srt/vtt/json only write timed text. Only "video" ever decodes a frame in Python,
+        # and only with the moviepy render engine.
+        if output_format not in ("video", "video_soft") and output_format not in SUBTITLE_FORMATS:
+            raise ValueError(
+                f"Unknown output_format '{output_format}', expected 'video', 'video_soft' or one of {list(SUBTITLE_FORMATS)}"
+            )
+        self.output_format = output_format
+        self.subtitle_writer = SubtitleWriter(logger=self.logger, prod=self.prod)
+        self.subtitle_muxer = SubtitleMuxer(logger=self.logger, prod=self.prod)
+        # how "video" output gets its captions burned in (see caption_burner)
+        if render_engine not in RENDER_ENGINES:
+            raise ValueError(
+                f"Unknown render_engine '{render_engine}', expected one of {list(RENDER_ENGINES)}"
+            )
+        self.render_engine = render_engine
+        self.caption_burner = CaptionBurner(logger=self.logger, prod=self.prod)
+        # threads this worker may use for encoding, all cores if the pool set no budget
+        self.num_threads = num_threads or os.cpu_count() or 1
+        # parallel encoders for the burn-in, by default one per two threads of that
+        # budget: each chunk's ffmpeg decodes and draws the ASS overlay next to
+        # x264, so a single thread each would leave its pipeline stalled
+        self.encode_chunks = ENCODE_CHUNKS or max(1, self.num_threads // 2)
+        self.smart_render = SMART_RENDER
+        # x264 preset/CRF for the captioned video, None = the deployment default
+        self.encoder_profile = get_encoder_profile(encoder_profile)
+        # overlap S3 transfer with audio decoding (ranged GETs feeding an ffmpeg pipe)
+        self.streaming_download = streaming_download
+        self.audio_decoder: StreamingAudioDecoder | None = None
+        # SLID/ASR start on each speech interval while VAD is still scanning
+        self.streaming_vad = streaming_vad
+        # decoded PCM lives in a memory-mapped temp file, so long videos don't pin it all in RSS
+        self.pcm_mmap = PCM_MMAP
+        self.pcm_path: Path | None = None
+        self.video_path: Path | None = None
+        # stage outputs of this job, lets a retried job skip what already finished
+        self.checkpoints = (
+            CheckpointStore(checkpoint_dir, logger=self.logger)
+            if checkpoint_dir is not None
+            else None
+        )
+        # identical (video, params) jobs reuse the earlier output, disabled without a dir
+        self.result_cache = (
+            ResultCache(
+                cache_dir=result_cache_dir,
+                logger=self.logger,
+                s3_client=self.loader.s3_client,
+                bucket=self.loader.BUCKET,
+            )
+            if result_cache_dir is not None
+            else None
+        )
 
         self.consolidated_langs = self.consolidate_sample_rates(
             [
@@ -82,8 +183,27 @@ class PipelineRunner:
 
         self.logger.logger.info("Runner initialized")
 
+    def _enter_stage(self, stage: str, total: int | None = None):
+        # stage boundaries are the cheapest place to honour a cancellation
+        self.cancel_token.raise_if_cancelled()
+        self.progress.start_stage(stage, total=total)
+
     # caption_color is a hex string like "#FFFFFF"
     def run(self, caption_color="#FFFFFF", font_size=48, stroke_width=4) -> str:
+        try:
+            return self._run(caption_color, font_size, stroke_width)
+        except JobCancelled:
+            self.logger.logger.info("Pipeline cancelled, cleaning up temporary files")
+            # unlike a normal run, always free disk here: the job will never be looked at again
+            self.loader.cleanup_temp_files()
+            self.logger.stop()
+            raise
+        finally:
+            # no-op once the decoder finished, stops ffmpeg on early exits
+            if self.audio_decoder is not None:
+                self.audio_decoder.close()
+
+    def _run(self, caption_color, font_size, stroke_width) -> str:
         # validate caption format parameters before running pipeline
         self.validate_caption_format(caption_color, font_size, stroke_width)
 
@@ -91,18 +211,167 @@ class PipelineRunner:
             f"Starting pipeline for file: {self.file_path} with allowed langs: {self.allowed_langs} and convert_to: {self.convert_to}"
         )
 
-        video, video_path = self.loader.retrieve_video(self.file_path)
-        self.logger.logger.info(
-            "Video is loaded as variable `video` in PipelineRunner.run(),"
-        )
-        self.logger.log_video_metrics(video)
+        uploaded = self.checkpoints.load("upload") if self.checkpoints else None
+        if uploaded is not None:
+            # died after uploading but before reporting, the output is already there
+            return self._finish(uploaded["bucket"], uploaded["key"])
+
+        transcribed = self.checkpoints.load("asr") if self.checkpoints else None
+
+        self._enter_stage("download")
+        if transcribed is None and self.pcm_mmap:
+            self.pcm_path = self.loader.new_temp_path(suffix=".pcm")
+
+        if self.streaming_download:
+            download = self.loader.start_video_download(self.file_path)
+            if transcribed is None:
+                # decode the audio track while the rest of the file is still arriving
+                self.audio_decoder = StreamingAudioDecoder(
+                    download.iter_bytes(),
+                    sample_rate=self.video_processor.pick_sample_rate(
+                        self.consolidated_langs
+                    ),
+                    logger=self.logger,
+                    pcm_path=self.pcm_path,
+                ).start()
+            try:
+                video_path = download.wait()
+            except Exception:
+                download.abort()
+                raise
+        else:
+            video_path = self.loader.download_video(self.file_path)
+
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(
+                file_sha256(video_path),
+                self.cache_params(caption_color, font_size, stroke_width),
+                render=render_version(
+                    self.render_path(),
+                    self.encoder_profile if self.output_format == "video" else None,
+                ),
+                vad=self.vad_model.version(streaming=self.streaming_vad),
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                # same video + params were captioned before, skip decoding entirely
+                self.logger.logger.info(f"Result cache hit for {cache_key}")
+                return self._finish(cached["bucket"], cached["key"])
+
+        self.video_path = video_path
+        video = None
+        if self.output_format == "video" and self.render_engine == "moviepy":
+            video = self.loader.open_video(video_path)
+            self.logger.logger.info(
+                "Video is loaded as variable `video` in PipelineRunner.run(),"
+            )
+            self.logger.log_video_metrics(video)
         self.logger.log_metrics_snapshot()
 
-        sample_rate, audio_tensor = self.video_processor.extract_audio(
-            video=video, allowed_sample_rates=self.consolidated_langs
+        if transcribed is not None:
+            # ASR finished in an earlier attempt, no need to touch the audio again
+            audio_segments = self.segments_from_checkpoint(transcribed)
+        else:
+            audio_segments = self._transcribe(video)
+
+        if not audio_segments and self.output_format in ("video", "video_soft"):
+            return self._upload_result(video_path, cache_key)
+
+        if self.convert_to != "":
+            translations = (
+                self.checkpoints.load("translate") if self.checkpoints else None
+            )
+            if translations is not None and len(translations) == len(audio_segments):
+                for seg, text in zip(audio_segments, translations):
+                    seg.text = text
+            else:
+                self._enter_stage("translate", total=len(audio_segments))
+                audio_segments = self.translater.translate_audio_segments(
+                    audio_segments=audio_segments,
+                    target_lang=self.convert_to,
+                    on_segment_done=self._on_segment_done,
+                )
+                self.logger.logger.info(
+                    "Translated language, logging the new transcription results "
+                )
+                self.logger.log_transcription_results(
+                    audio_segments=audio_segments, log_prefix="transcribed"
+                )
+                audio_segments = self.clean_audio_segments(audio_segments)
+                self._save_checkpoint("translate", [seg.text for seg in audio_segments])
+
+        if self.output_format in SUBTITLE_FORMATS:
+            self._enter_stage("render")
+            suffix, _ = SUBTITLE_FORMATS[self.output_format]
+            subtitle_path = self.subtitle_writer.write(
+                audio_segments,
+                self.output_format,
+                self.loader.new_temp_path(suffix=suffix),
+            )
+
+            return self._upload_result(subtitle_path, cache_key)
+
+        if self.output_format == "video_soft":
+            self._enter_stage("render")
+            srt_path = self.subtitle_writer.write(
+                audio_segments, "srt", self.loader.new_temp_path(suffix=".srt")
+            )
+
+            # stream copy of the original plus a subtitle track, no decode/encode
+            self._enter_stage("encode")
+            output_path = self.subtitle_muxer.mux(
+                video_path,
+                srt_path,
+                self.loader.new_temp_path(
+                    suffix=self.subtitle_muxer.output_suffix(video_path)
+                ),
+            )
+
+            return self._upload_result(output_path, cache_key)
+
+        if self.render_engine == "ffmpeg":
+            output_path = self._burn_captions(
+                video_path, audio_segments, caption_color, font_size, stroke_width
+            )
+            return self._upload_result(output_path, cache_key)
+
+        self._enter_stage("render")
+        captioned_video: CompositeVideoClip = self.video_processor.embed_captions(
+            video, audio_segments, caption_color, font_size, stroke_width
         )
 
-        voiced_segments = self.vad_model.detect_speech(audio_tensor, sample_rate)
+        self._enter_stage("encode")
+        output_path = self.loader.save_captioned_disk(
+            captioned_video,
+            progress_logger=EncodeProgressLogger(self.progress, self.cancel_token),
+            audio_source=video_path,
+            encoder_profile=self.encoder_profile,
+            threads=self.num_threads,
+        )
+
+        return self._upload_result(output_path, cache_key)
+
+    def _transcribe(self, video) -> list[AudioSegment]:
+        """extract audio -> VAD -> SLID -> chunk -> ASR, resuming from checkpoints where possible"""
+        voiced_segments = self.checkpoints.load("vad") if self.checkpoints else None
+        if voiced_segments == []:
+            return []  # known to have no speech, skip extracting audio at all
+
+        self._enter_stage("extract_audio")
+        sample_rate, audio_tensor = self._extract_audio(video)
+
+        if voiced_segments is None and self.streaming_vad:
+            return self._save_transcription(
+                self._transcribe_streaming(audio_tensor, sample_rate)
+            )
+
+        if voiced_segments is None:
+            self._enter_stage("vad")
+            voiced_segments = self.vad_model.detect_speech(
+                audio_tensor, sample_rate, on_progress=self._on_vad_progress
+            )
+            self._save_checkpoint("vad", voiced_segments)
 
         # break up tensor into audio segments
         audio_segments = self.video_processor.segment_audio(
@@ -113,56 +382,248 @@ class PipelineRunner:
         )
 
         if not audio_segments:
-            bucket, key = self.loader.save_captioned_s3(video_path=video_path)
-            s3_download_url = self.loader.gen_s3_download_url(bucket=bucket, key=key)
-            return s3_download_url
+            return []
 
-        self.logger.log_segments_visualization(
+        self._visualize_segments(
             log_prefix="init", video=video, audio_segments=audio_segments
         )
 
-        audio_segments = self.slid_model.classify_segments_language(
-            audio_segments=audio_segments, allowed_langs=self.allowed_langs
-        )
+        langs = self.checkpoints.load("slid") if self.checkpoints else None
+        if langs is not None and len(langs) == len(audio_segments):
+            for seg, lang in zip(audio_segments, langs):
+                seg.lang = lang
+        else:
+            self._enter_stage("slid", total=len(audio_segments))
+            audio_segments = self.slid_model.classify_segments_language(
+                audio_segments=audio_segments,
+                allowed_langs=self.allowed_langs,
+                on_segment_done=self._on_segment_done,
+            )
+            self._save_checkpoint("slid", [seg.lang for seg in audio_segments])
         audio_segments = self.clean_audio_segments(audio_segments)
 
-        self.logger.log_segments_visualization(
+        self._visualize_segments(
             log_prefix="classified", video=video, audio_segments=audio_segments
         )
 
         # chunk segments to max caption duration
+        self._enter_stage("chunk")
         audio_segments = self.video_processor.chunk_segments(audio_segments)
-        self.logger.log_segments_visualization(
+        self._visualize_segments(
             log_prefix="chunked_classified", video=video, audio_segments=audio_segments
         )
         audio_segments = self.clean_audio_segments(audio_segments)
 
-        audio_segments = self.asr_model.transcribe_segments(audio_segments)
+        self._enter_stage("asr", total=len(audio_segments))
+        audio_segments = self.asr_model.transcribe_segments(
+            audio_segments,
+            on_segment_done=self.progress.advance,
+            cancel_token=self.cancel_token,
+        )
+        return self._save_transcription(audio_segments)
+
+    def _transcribe_streaming(
+        self, audio_tensor: torch.Tensor, sample_rate: int
+    ) -> list[AudioSegment]:
+        """
+        VAD streams over the audio in fixed-size chunks, and every speech
+        interval goes through SLID -> chunk -> ASR on a side thread as soon as
+        it closes, so recognition of early speech overlaps the rest of the scan.
+        """
+        total_s = max(audio_tensor.numel() / sample_rate, 1e-9)
+        step = int(STREAM_CHUNK_SECONDS * sample_rate)
+        pcm_chunks = (
+            audio_tensor[offset : offset + step]
+            for offset in range(0, audio_tensor.numel(), step)
+        )
+
+        futures = []
+
+        def on_scanned(seconds: float):
+            self._on_vad_progress(100 * seconds / total_s)
+            self.cancel_token.raise_if_cancelled()
+            # a SLID/ASR failure fails the job now, not after the rest of the scan
+            for future in futures:
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+
+        self._enter_stage("vad")
+        voiced_segments: list[dict[str, float]] = []
+        speech_segments: list[AudioSegment] = []
+        # one consumer keeps SLID/ASR in order; ASR still fans out per chunk inside
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            for interval in self.vad_model.stream_speech(
+                pcm_chunks, sample_rate, on_progress=on_scanned
+            ):
+                voiced_segments.append(interval)
+                [segment] = self.video_processor.segment_audio(
+                    audio_tensor=audio_tensor,
+                    segments=[interval],
+                    sample_rate=sample_rate,
+                    orig_file=self.file_path,
+                )
+                speech_segments.append(segment)
+                futures.append(executor.submit(self._recognize_segment, segment))
+            self._save_checkpoint("vad", voiced_segments)
+
+            self._enter_stage("asr", total=len(futures))
+            audio_segments: list[AudioSegment] = []
+            for future in futures:
+                audio_segments.extend(future.result())
+                self.progress.advance()
+        finally:
+            # on errors/cancellation don't start what's still queued
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self._save_checkpoint("slid", [seg.lang for seg in speech_segments])
+        return audio_segments
+
+    def _recognize_segment(self, segment: AudioSegment) -> list[AudioSegment]:
+        """SLID -> chunk -> ASR for one speech interval (streaming VAD)."""
+        self.cancel_token.raise_if_cancelled()
+        [segment] = self.slid_model.classify_segments_language(
+            audio_segments=[segment], allowed_langs=self.allowed_langs
+        )
+        chunks = self.clean_audio_segments(
+            self.video_processor.chunk_segments(self.clean_audio_segments([segment]))
+        )
+        return self.asr_model.transcribe_segments(
+            chunks, cancel_token=self.cancel_token
+        )
+
+    def _save_transcription(
+        self, audio_segments: list[AudioSegment]
+    ) -> list[AudioSegment]:
         self.logger.log_transcription_results(
             audio_segments=audio_segments, log_prefix="transcribed"
         )
         audio_segments = self.clean_audio_segments(audio_segments)
 
-        if self.convert_to != "":
-            audio_segments = self.translater.translate_audio_segments(
-                audio_segments=audio_segments, target_lang=self.convert_to
+        self._save_checkpoint(
+            "asr",
+            [
+                {
+                    "start": seg.start_time,
+                    "end": seg.end_time,
+                    "lang": seg.lang,
+                    "text": seg.text,
+                }
+                for seg in audio_segments
+            ],
+        )
+        return audio_segments
+
+    def _visualize_segments(self, log_prefix: str, video, audio_segments):
+        # subtitle-only jobs never open the video, nothing to draw against
+        if video is not None:
+            self.logger.log_segments_visualization(
+                log_prefix=log_prefix, video=video, audio_segments=audio_segments
             )
+
+    def _burn_captions(
+        self,
+        video_path: Path,
+        audio_segments: list[AudioSegment],
+        caption_color: str,
+        font_size: int,
+        stroke_width: int,
+    ) -> Path:
+        """
+        render (keyframe-aligned chunks, one ASS script each) -> encode (the
+        chunks in parallel ffmpeg processes, joined without re-encoding).
+        With smart rendering, GOPs without captions are stream-copied.
+        """
+        self._enter_stage("render")
+        info = self.caption_burner.probe_video(video_path)
+        smart = self.smart_render and self.caption_burner.can_smart_render(info)
+        if self.smart_render and not smart:
             self.logger.logger.info(
-                "Translated language, logging the new transcription results "
+                f"Smart rendering needs limited-range 8-bit 4:2:0 h264, got {info['codec']} ({info['profile']}, {info['pix_fmt']}, {info['color_range']} range), re-encoding everything"
             )
-            self.logger.log_transcription_results(
-                audio_segments=audio_segments, log_prefix="transcribed"
+        chunks = self.caption_burner.plan_chunks(
+            video_path,
+            info["duration"],
+            chunks=self.encode_chunks,
+            audio_segments=audio_segments if smart else None,
+        )
+        scripts = [
+            None
+            if chunk.copy
+            else self.caption_burner.write_ass(
+                audio_segments,
+                self.loader.new_temp_path(suffix=".ass"),
+                width=info["width"],
+                height=info["height"],
+                caption_color=caption_color,
+                font_size=font_size,
+                stroke_width=stroke_width,
+                pick_font=self.video_processor.pick_font_for_text,
+                start=chunk.start,
+                end=chunk.end,
             )
-            audio_segments = self.clean_audio_segments(audio_segments)
+            for chunk in chunks
+        ]
+
+        self._enter_stage("encode")
+        return self.caption_burner.burn(
+            video_path,
+            list(zip(chunks, scripts)),
+            self.loader.new_temp_path(suffix=".mp4"),
+            fonts_dir=Path(self.video_processor.fonts[0]).parent,
+            fps=info["fps"],
+            total_frames=int(info["duration"] * info["fps"]) or None,
+            max_parallel=self.encode_chunks,
+            encoder_profile=self.encoder_profile,
+            threads=self.num_threads,
+            color_options=self.caption_burner.color_options(info),
+            on_progress=lambda done, total: self.progress.update(
+                completed=done, total=total
+            ),
+            cancel_token=self.cancel_token,
+        )
 
-        captioned_video: CompositeVideoClip = self.video_processor.embed_captions(
-            video, audio_segments, caption_color, font_size, stroke_width
+    def _extract_audio(self, video) -> tuple[int, torch.Tensor]:
+        if self.audio_decoder is not None:
+            try:
+                # usually done already, it ran alongside the download
+                return self.audio_decoder.sample_rate, self.audio_decoder.result()
+            except Exception as e:
+                self.logger.logger.warning(
+                    f"Streamed audio decode failed, decoding the downloaded file instead: {e}"
+                )
+        if video is None:
+            return self.video_processor.extract_audio_from_file(
+                self.video_path,
+                allowed_sample_rates=self.consolidated_langs,
+                pcm_path=self.pcm_path,
+            )
+        return self.video_processor.extract_audio(
+            video=video,
+            allowed_sample_rates=self.consolidated_langs,
+            pcm_path=self.pcm_path,
         )
 
-        output_path = self.loader.save_captioned_disk(captioned_video)
+    def segments_from_checkpoint(self, transcribed: list[dict]) -> list[AudioSegment]:
+        # rendering only needs timing + text, so the audio stays empty
+        return [
+            AudioSegment(
+                audio=torch.empty(0),
+                start_time=seg["start"],
+                end_time=seg["end"],
+                orig_file=self.file_path.unicode_string(),
+                sample_rate=0,
+                lang=seg["lang"],
+                text=seg["text"],
+            )
+            for seg in transcribed
+        ]
 
-        bucket, key = self.loader.save_captioned_s3(video_path=output_path)
+    def _save_checkpoint(self, stage: str, data):
+        if self.checkpoints is not None:
+            self.checkpoints.save(stage, data)
 
+    def _finish(self, bucket: str, key: str) -> str:
         s3_download_url = self.loader.gen_s3_download_url(bucket=bucket, key=key)
 
         self.logger.logger.info("Pipeline finished successfully.")
@@ -176,6 +637,55 @@ class PipelineRunner:
 
         return s3_download_url
 
+    def cache_params(self, caption_color, font_size, stroke_width) -> dict:
+        # everything from the request that changes the output, normalized
+        return {
+            "caption_color": caption_color.upper(),
+            "font_size": int(font_size),
+            "stroke_width": int(stroke_width),
+            "convert_to": self.convert_to,
+            "allowed_langs": sorted(self.allowed_langs),
+            "output_format": self.output_format,
+            "render_engine": self.render_engine,
+            "encoder_profile": self.encoder_profile.name,
+            "vad_engine": self.vad_engine,
+        }
+
+    def render_path(self) -> str:
+        # which code writes the output, see RENDER_VERSIONS
+        if self.output_format in SUBTITLE_FORMATS:
+            return "subtitles"
+        if self.output_format == "video_soft":
+            return "mux"
+        if self.render_engine == "ffmpeg":
+            return "ffmpeg-smart" if self.smart_render else "ffmpeg"
+        return "moviepy"
+
+    def _upload_result(self, output_path: Path, cache_key: str | None) -> str:
+        # every output format ends the same way: upload, checkpoint, cache, presign
+        self._enter_stage("upload")
+        bucket, key = self.loader.save_captioned_s3(video_path=output_path)
+        self._save_checkpoint("upload", {"bucket": bucket, "key": key})
+        self._remember(cache_key, bucket, key)
+        return self._finish(bucket, key)
+
+    def _remember(self, cache_key: str | None, bucket: str, key: str):
+        if cache_key is None:
+            return
+        try:
+            self.result_cache.put(cache_key, bucket, key)
+        except Exception as e:
+            # a cache write must never fail an otherwise finished job
+            self.logger.logger.warning(f"Could not store result cache entry: {e}")
+
+    def _on_segment_done(self):
+        self.progress.advance()
+        self.cancel_token.raise_if_cancelled()
+
+    def _on_vad_progress(self, percent: float):
+        self.progress.update(completed=int(percent), total=100)
+        self.cancel_token.raise_if_cancelled()
+
     def consolidate_sample_rates(self, sample_rates: list[list[int]]) -> list[int]:
         consolidated = set(rate for rates in sample_rates for rate in rates)
         return sorted(list(consolidated))
@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from proglog import ProgressBarLogger
+
+from .cancellation import CancellationToken
+
+# Pipeline stages in execution order, with the rough share of a job's wall time
+# each one takes. The weights only drive the overall progress/ETA estimate.
+STAGE_WEIGHTS: dict[str, float] = {
+    "download": 0.05,
+    "extract_audio": 0.04,
+    "vad": 0.08,
+    "slid": 0.08,
+    "chunk": 0.01,
+    "asr": 0.40,
+    "translate": 0.04,
+    "render": 0.03,
+    "encode": 0.25,
+    "upload": 0.02,
+}
+STAGES = list(STAGE_WEIGHTS.keys())
+
+
+class ProgressReporter:
+    """
+    Tracks which pipeline stage a job is in plus a per-stage counter
+    (e.g. "asr 37/120") and estimates overall progress and ETA.
+
+    Every change is handed to `on_update` as a dict; counter updates are
+    throttled to one per `min_interval` seconds, stage transitions are always
+    sent. Safe to call `advance()` from the ASR thread pool.
+    """
+
+    def __init__(
+        self,
+        on_update: Optional[Callable[[dict], None]] = None,
+        min_interval: float = 0.5,
+    ):
+        self.on_update = on_update
+        self.min_interval = min_interval
+
+        self.started_at = time.monotonic()
+        self.stage: Optional[str] = None
+        self.completed = 0
+        self.total: Optional[int] = None
+        self._done_stages: set[str] = set()
+        self._last_sent = 0.0
+        self._lock = threading.Lock()
+
+    def start_stage(self, stage: str, total: Optional[int] = None):
+        if stage not in STAGE_WEIGHTS:
+            raise ValueError(f"Unknown pipeline stage '{stage}', expected one of {STAGES}")
+
+        with self._lock:
+            if self.stage is not None:
+                self._done_stages.add(self.stage)
+            self.stage = stage
+            self.completed = 0
+            self.total = total
+        self._publish(force=True)
+
+    def set_total(self, total: int):
+        with self._lock:
+            self.total = total
+        self._publish()
+
+    def advance(self, n: int = 1):
+        with self._lock:
+            self.completed += n
+        self._publish()
+
+    def update(self, completed: int, total: Optional[int] = None):
+        with self._lock:
+            self.completed = completed
+            if total is not None:
+                self.total = total
+        self._publish()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            fraction = sum(STAGE_WEIGHTS[s] for s in self._done_stages)
+            if self.stage is not None and self.total:
+                fraction += STAGE_WEIGHTS[self.stage] * min(
+                    1.0, self.completed / self.total
+                )
+            fraction = min(fraction, 1.0)
+
+            elapsed = time.monotonic() - self.started_at
+            # too little signal early on to extrapolate from
+            eta = elapsed * (1 - fraction) / fraction if fraction >= 0.02 else None
+
+            return {
+                "stage": self.stage,
+                "stage_completed": self.completed,
+                "stage_total": self.total,
+                "progress": round(fraction, 4),
+                "eta_seconds": round(eta, 1) if eta is not None else None,
+            }
+
+    def _publish(self, force: bool = False):
+        if self.on_update is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_sent < self.min_interval:
+                return
+            self._last_sent = now
+        self.on_update(self.snapshot())
+
+
+class EncodeProgressLogger(ProgressBarLogger):
+    """
+    proglog logger for moviepy's write_videofile that feeds frame counts into a
+    ProgressReporter and aborts the encode (JobCancelled) once the job is cancelled.
+    """
+
+    def __init__(
+        self,
+        progress: ProgressReporter,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        super().__init__()
+        self.progress = progress
+        self.cancel_token = cancel_token
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+        # moviepy names the video frame bar "frame_index" (audio uses "chunk")
+        if bar != "frame_index" or attr != "index":
+            return
+        self.progress.update(completed=value, total=self.bars[bar].get("total"))
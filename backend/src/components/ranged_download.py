@@ -0,0 +1,153 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .logger_component import AppLogger
+
+# 8 MiB parts keep per-request overhead small while letting the first bytes
+# reach the decoder quickly
+DEFAULT_PART_SIZE = int(os.environ.get("MAC_DOWNLOAD_PART_SIZE", str(8 * 1024 * 1024)))
+DEFAULT_CONCURRENCY = int(os.environ.get("MAC_DOWNLOAD_CONCURRENCY", "8"))
+# decode audio while the video downloads instead of after
+STREAMING_DOWNLOAD = os.environ.get("MAC_STREAMING_DOWNLOAD", "1") == "1"
+
+
+class RangedDownload:
+    """
+    Downloads one S3 object to `dest_path` with parallel ranged GETs.
+
+    Parts are written in place as they arrive, and `iter_bytes()` hands
+    out the file's contiguous prefix in order while the download is still
+    running, so a decoder can consume the file as it streams in. Parts are
+    requested in order, so the prefix keeps growing at roughly the
+    aggregate transfer rate.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        key: str,
+        dest_path: Path,
+        logger: AppLogger,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.dest_path = Path(dest_path)
+        self.logger = logger
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+
+        self.size: Optional[int] = None
+        self._done_parts: set[int] = set()
+        # bytes [0, _contiguous) are on disk
+        self._contiguous = 0
+        self._error: Optional[BaseException] = None
+        self._aborted = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "RangedDownload":
+        self.size = self.s3_client.head_object(Bucket=self.bucket, Key=self.key)[
+            "ContentLength"
+        ]
+        # preallocate so every part can be written at its offset
+        with open(self.dest_path, "wb") as f:
+            f.truncate(self.size)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _num_parts(self) -> int:
+        return max(1, -(-self.size // self.part_size))
+
+    def _run(self):
+        fd = os.open(self.dest_path, os.O_WRONLY)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                futures = [
+                    executor.submit(self._fetch_part, fd, idx)
+                    for idx in range(self._num_parts())
+                ]
+                for future in futures:
+                    future.result()
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+                self._cond.notify_all()
+        finally:
+            os.close(fd)
+
+    def _fetch_part(self, fd: int, idx: int):
+        if self._aborted or self._error is not None:
+            return
+
+        start = idx * self.part_size
+        end = min(start + self.part_size, self.size) - 1
+        if end >= start:
+            body = self.s3_client.get_object(
+                Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{end}"
+            )["Body"]
+            offset = start
+            while chunk := body.read(1024 * 1024):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+            if offset != end + 1:
+                raise IOError(
+                    f"Short read for bytes {start}-{end} of {self.key}: got {offset - start}"
+                )
+
+        with self._cond:
+            self._done_parts.add(idx)
+            while (self._contiguous // self.part_size) in self._done_parts and (
+                self._contiguous < self.size
+            ):
+                self._contiguous = min(self._contiguous + self.part_size, self.size)
+            self._cond.notify_all()
+
+    def iter_bytes(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Yield the object's bytes in order, as soon as each range has landed on disk."""
+        position = 0
+        # unbuffered: a buffered reader could serve stale (not yet written) bytes after a seek
+        with open(self.dest_path, "rb", buffering=0) as f:
+            while position < self.size:
+                with self._cond:
+                    while (
+                        self._contiguous <= position
+                        and self._error is None
+                        and not self._aborted
+                    ):
+                        self._cond.wait()
+                    if self._error is not None:
+                        raise self._error
+                    if self._aborted:
+                        return
+                    available = self._contiguous
+
+                f.seek(position)
+                while position < available:
+                    chunk = f.read(min(chunk_size, available - position))
+                    position += len(chunk)
+                    yield chunk
+
+    def wait(self) -> Path:
+        """Block until the whole object is on disk."""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        self.logger.logger.info(
+            f"Downloaded s3://{self.bucket}/{self.key} ({self.size} bytes) in {self._num_parts()} ranged parts"
+        )
+        return self.dest_path
+
+    def abort(self):
+        # remaining parts are skipped, iter_bytes() stops
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .encoder_profiles import EncoderProfile
+from .logger_component import AppLogger
+
+# Everything besides the video and caption params that changes the output.
+# Bump an entry when a model changes so old results stop matching.
+# The "vad" entry comes from the VAD engine's version() instead.
+MODEL_VERSIONS: dict[str, str] = {
+    "slid": "speechbrain/lang-id-voxlingua107-ecapa",
+    "asr": "faster-whisper-small",
+    "translate": "deep-translator-google",
+}
+# The code that turns captions into the output, keyed by render path (see
+# PipelineRunner.render_path). Bump a path's entry whenever its output changes.
+RENDER_VERSIONS: dict[str, str] = {
+    "moviepy": "moviepy-libx264-2",
+    "ffmpeg": "ffmpeg-ass-libx264-2",
+    "ffmpeg-smart": "ffmpeg-ass-libx264-smart-2",
+    "mux": "ffmpeg-subtitle-mux-1",
+    "subtitles": "subtitle-writer-1",
+}
+
+RESULT_CACHE_ENABLED = os.environ.get("MAC_RESULT_CACHE", "1") == "1"
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("MAC_RESULT_CACHE_MAX_ENTRIES", "1000"))
+# mirror entries to S3 so other hosts (and fresh containers) can hit them too
+RESULT_CACHE_S3 = os.environ.get("MAC_RESULT_CACHE_S3", "0") == "1"
+
+
+def render_version(render_path: str, encoder_profile: Optional[EncoderProfile] = None) -> str:
+    """The "render" model version: the path's version plus the x264 settings it encodes with."""
+    version = RENDER_VERSIONS[render_path]
+    if encoder_profile is not None:
+        version += f"/{encoder_profile.preset}-crf{encoder_profile.crf}"
+        if encoder_profile.tune:
+            version += f"-{encoder_profile.tune}"
+    return version
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of finished captioned videos.
+
+    Keyed on the sha256 of the uploaded video plus the normalized caption
+    parameters, MODEL_VERSIONS and the job's render/VAD versions; each entry
+    is a small JSON file pointing at the captioned output in S3. Hits
+    refresh the file's mtime and the oldest
+    entries are evicted past `max_entries` (LRU). With `mirror_s3`, entries
+    are also written under `cache/` in the bucket.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        logger: AppLogger,
+        s3_client,
+        bucket: str,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        mirror_s3: bool = RESULT_CACHE_S3,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logger
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.max_entries = max_entries
+        self.mirror_s3 = mirror_s3
+        self.s3_prefix = "cache"
+
+    @staticmethod
+    def make_key(video_sha256: str, params: dict, render: str, vad: str) -> str:
+        """
+        `render` is render_version() of the path the job's output goes
+        through, `vad` the VAD engine's version() for the job.
+        """
+        models = {**MODEL_VERSIONS, "render": render, "vad": vad}
+        material = json.dumps(
+            {"video": video_sha256, "params": params, "models": models},
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns {"bucket", "key"} of the cached output or None."""
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text())
+            # mark as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            entry = self._get_s3(key)
+            if entry is None:
+                return None
+            self._write_local(key, entry)
+        except Exception as e:
+            self.logger.logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+        if not self._output_exists(entry):
+            # output was deleted (e.g. lifecycle rule), the entry is useless now
+            self.logger.logger.info(f"Cached output for {key} is gone, dropping entry")
+            self.delete(key)
+            return None
+
+        return entry
+
+    def put(self, key: str, bucket: str, s3_key: str):
+        entry = {"bucket": bucket, "key": s3_key, "created_at": time.time()}
+        self._write_local(key, entry)
+        self._evict()
+
+        if self.mirror_s3:
+            try:
+                self.s3_client.put_object(
+                    Body=json.dumps(entry),
+                    Bucket=self.bucket,
+                    Key=f"{self.s3_prefix}/{key}.json",
+                    ContentType="application/json",
+                )
+            except Exception as e:
+                # the local entry is enough for this host
+                self.logger.logger.warning(f"Could not mirror cache entry {key} to S3: {e}")
+
+    def delete(self, key: str):
+        self._entry_path(key).unlink(missing_ok=True)
+        if self.mirror_s3:
+            try:
+                self.s3_client.delete_object(
+                    Bucket=self.bucket, Key=f"{self.s3_prefix}/{key}.json"
+                )
+            except Exception as e:
+                self.logger.logger.warning(f"Could not delete mirrored cache entry {key}: {e}")
+
+    def _write_local(self, key: str, entry: dict):
+        # write-then-rename so concurrent workers never read a half written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._entry_path(key))
+
+    def _get_s3(self, key: str) -> Optional[dict]:
+        if not self.mirror_s3:
+            return None
+        try:
+            obj = self.s3_client.get_object(
+                Bucket=self.bucket, Key=f"{self.s3_prefix}/{key}.json"
+            )
+            return json.loads(obj["Body"].read().decode("utf-8"))
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            self.logger.logger.warning(f"Could not read mirrored cache entry {key}: {e}")
+            return None
+
+    def _output_exists(self, entry: dict) -> bool:
+        try:
+            self.s3_client.head_object(Bucket=entry["bucket"], Key=entry["key"])
+            return True
+        except Exception:
+            return False
+
+    def _evict(self):
+        entries = list(self.cache_dir.glob("*.json"))
+        if len(entries) <= self.max_entries:
+            return
+
+        def mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:  # evicted by another worker meanwhile
+                return 0.0
+
+        entries.sort(key=mtime)
+        for path in entries[: len(entries) - self.max_entries]:
+            # only local entries are evicted, the S3 mirror is bounded by bucket lifecycle rules
+            path.unlink(missing_ok=True)
+            self.logger.logger.info(f"Evicted cache entry {path.stem}")
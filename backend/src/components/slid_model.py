@@ -2,6 +2,7 @@ from .logger_component import AppLogger
 from ..dataclasses.audio_segment import AudioSegment
 import numpy as np
 import uuid
+from typing import Callable, Optional
 
 
 class SLIDModel:
@@ -14,7 +15,10 @@ class SLIDModel:
         self.logger.logger.info("SLIDModel initialized")
 
     def classify_segments_language(
-        self, audio_segments: list[AudioSegment], allowed_langs: list[str]
+        self,
+        audio_segments: list[AudioSegment],
+        allowed_langs: list[str],
+        on_segment_done: Optional[Callable[[], None]] = None,
     ) -> list[AudioSegment]:
         self.logger.logger.info(
             f"Beginning language classification for {len(audio_segments)} audio segments"
@@ -57,6 +61,9 @@ class SLIDModel:
                     seg.id, best_lang, top_k_preds, allowed_langs_set
                 )
 
+                if on_segment_done is not None:
+                    on_segment_done()
+
             except Exception as e:
                 self.logger.logger.error(
                     f"Error classifying language for segment {seg.id}: {str(e)}"
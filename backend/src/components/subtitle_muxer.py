@@ -0,0 +1,89 @@
+import subprocess
+from pathlib import Path
+
+from moviepy.config import FFMPEG_BINARY
+
+from .logger_component import AppLogger
+
+# containers that can carry a subtitle stream, and the codec it's written as
+SUBTITLE_CODECS: dict[str, str] = {
+    ".mp4": "mov_text",
+    ".mov": "mov_text",
+    ".mkv": "srt",
+}
+# everything else (avi, flv, wmv) is remuxed into mkv
+FALLBACK_CONTAINER = ".mkv"
+
+
+class SubtitleMuxer:
+    """
+    Adds captions as a player-toggleable subtitle track instead of burning
+    them in. Video and audio are stream-copied, so this takes about as long
+    as copying the file and the picture is untouched.
+    """
+
+    def __init__(self, logger: AppLogger, prod=False):
+        self.logger = logger
+        self.prod = prod
+
+    @staticmethod
+    def output_suffix(video_path: Path) -> str:
+        suffix = Path(video_path).suffix.lower()
+        return suffix if suffix in SUBTITLE_CODECS else FALLBACK_CONTAINER
+
+    def mux(self, video_path: Path, srt_path: Path, output_path: Path) -> Path:
+        """
+        Mux `srt_path` into a copy of `video_path`; `output_path` should use
+        output_suffix(). An SRT without cues (no segment had text) can't be
+        muxed, so then `video_path` itself is returned untouched.
+        """
+        if not Path(srt_path).read_text(encoding="utf-8").strip():
+            self.logger.logger.info(
+                f"No captions to mux into {video_path}, keeping the original"
+            )
+            return Path(video_path)
+
+        codec = SUBTITLE_CODECS[Path(output_path).suffix.lower()]
+        command = [
+            FFMPEG_BINARY,
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            str(video_path),
+            "-i",
+            str(srt_path),
+            # only streams every target container can hold, plus the new captions
+            "-map",
+            "0:v",
+            "-map",
+            "0:a?",
+            "-map",
+            "1:0",
+            "-c:v",
+            "copy",
+            "-c:a",
+            "copy",
+            "-c:s",
+            codec,
+            "-metadata:s:s:0",
+            "title=Captions",
+            "-disposition:s:0",
+            "default",
+        ]
+        if codec == "mov_text":
+            # index up front so players (and our streaming download) can start early
+            command += ["-movflags", "+faststart"]
+        command.append(str(output_path))
+
+        self.logger.logger.info(
+            f"Muxing {codec} subtitles into {video_path} -> {output_path}"
+        )
+        result = subprocess.run(command, capture_output=True)
+        if result.returncode != 0:
+            message = result.stderr.decode(errors="replace").strip()
+            self.logger.logger.error(f"Error muxing subtitles: {message}")
+            raise RuntimeError(f"ffmpeg failed to mux subtitles ({result.returncode}): {message}")
+
+        return Path(output_path)
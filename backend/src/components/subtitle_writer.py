@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+from .logger_component import AppLogger
+from ..dataclasses.audio_segment import AudioSegment
+
+# output_format -> (file suffix, content type)
+SUBTITLE_FORMATS: dict[str, tuple[str, str]] = {
+    "srt": (".srt", "application/x-subrip"),
+    "vtt": (".vtt", "text/vtt"),
+    "json": (".json", "application/json"),
+}
+
+
+class SubtitleWriter:
+    """Turns transcribed AudioSegments into SRT, WebVTT or segment-level JSON."""
+
+    def __init__(self, logger: AppLogger, prod=False):
+        self.logger = logger
+        self.prod = prod
+
+    @staticmethod
+    def format_timestamp(seconds: float, decimal_marker: str) -> str:
+        millis = max(0, round(seconds * 1000))
+        hours, millis = divmod(millis, 3_600_000)
+        minutes, millis = divmod(millis, 60_000)
+        secs, millis = divmod(millis, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal_marker}{millis:03d}"
+
+    @staticmethod
+    def _captioned(audio_segments: list[AudioSegment]) -> list[AudioSegment]:
+        # same rule as embed_captions: segments without text get no cue
+        return [seg for seg in audio_segments if seg.text]
+
+    def to_srt(self, audio_segments: list[AudioSegment]) -> str:
+        cues = []
+        for idx, seg in enumerate(self._captioned(audio_segments), start=1):
+            start = self.format_timestamp(seg.start_time, ",")
+            end = self.format_timestamp(seg.end_time, ",")
+            cues.append(f"{idx}\n{start} --> {end}\n{seg.text.strip()}\n")
+        return "\n".join(cues)
+
+    def to_vtt(self, audio_segments: list[AudioSegment]) -> str:
+        cues = ["WEBVTT\n"]
+        for seg in self._captioned(audio_segments):
+            start = self.format_timestamp(seg.start_time, ".")
+            end = self.format_timestamp(seg.end_time, ".")
+            cues.append(f"{start} --> {end}\n{seg.text.strip()}\n")
+        return "\n".join(cues)
+
+    def to_json(self, audio_segments: list[AudioSegment]) -> str:
+        return json.dumps(
+            {
+                "segments": [
+                    {
+                        "start": round(seg.start_time, 3),
+                        "end": round(seg.end_time, 3),
+                        "lang": seg.lang,
+                        "text": seg.text.strip(),
+                    }
+                    for seg in self._captioned(audio_segments)
+                ]
+            },
+            ensure_ascii=False,
+        )
+
+    def write(
+        self, audio_segments: list[AudioSegment], output_format: str, path: Path
+    ) -> Path:
+        if output_format not in SUBTITLE_FORMATS:
+            raise ValueError(
+                f"Unknown subtitle format '{output_format}', expected one of {list(SUBTITLE_FORMATS)}"
+            )
+
+        render = {"srt": self.to_srt, "vtt": self.to_vtt, "json": self.to_json}[
+            output_format
+        ]
+        Path(path).write_text(render(audio_segments), encoding="utf-8")
+        self.logger.logger.info(
+            f"Wrote {output_format} subtitles for {len(audio_segments)} segments to {path}"
+        )
+        return Path(path)
@@ -1,6 +1,7 @@
 from .logger_component import AppLogger
 from deep_translator import GoogleTranslator
 from ..dataclasses.audio_segment import AudioSegment
+from typing import Callable, Optional
 
 
 class AppTranslater:
@@ -31,7 +32,10 @@ class AppTranslater:
             raise
 
     def translate_audio_segments(
-        self, audio_segments: list[AudioSegment], target_lang: str
+        self,
+        audio_segments: list[AudioSegment],
+        target_lang: str,
+        on_segment_done: Optional[Callable[[], None]] = None,
     ) -> list[AudioSegment]:
         for seg in audio_segments:
             try:
@@ -76,6 +80,10 @@ class AppTranslater:
                     f"Error translating segment {seg.id}: {str(e)}"
                 )
                 raise
+            finally:
+                # also counts the segments skipped above
+                if on_segment_done is not None:
+                    on_segment_done()
 
         return audio_segments
 
@@ -0,0 +1,60 @@
+from .logger_component import AppLogger
+from abc import ABC, abstractmethod
+import os
+import torch
+from typing import Callable, Iterable, Iterator, Optional
+
+# which model finds the speech intervals: Silero, or the CNN trained under models/
+VAD_ENGINE = os.environ.get("MAC_VAD_ENGINE", "silero")
+VAD_ENGINES = ("silero", "cnn")
+
+
+class VADEngine(ABC):
+    """
+    What PipelineRunner needs from a VAD: speech intervals as
+    {"start", "end"} dicts in seconds for a mono 16 kHz waveform.
+    """
+
+    def __init__(self, model, logger: AppLogger, prod=False):
+        self.logger = logger
+        self.prod = prod
+        self.model = model
+        self.allowed_sample_rates = [16000]
+
+    @abstractmethod
+    def detect_speech(
+        self,
+        audio_tensor: torch.Tensor,
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> list[dict[str, float]]:
+        """`on_progress` gets the % of audio scanned and may raise to abort (cancellation)."""
+
+    def version(self, streaming: bool = False) -> str:
+        """
+        The result cache's "vad" version: changes whenever the settings this
+        engine runs with move its intervals. `streaming` = stream_speech.
+        """
+        return type(self).__name__
+
+    def stream_speech(
+        self,
+        chunks: Iterable[torch.Tensor],
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> Iterator[dict[str, float]]:
+        """
+        Engines without a streaming mode collect the chunks and run
+        detect_speech once at the end, so the streaming pipeline still works,
+        just without the overlap. `on_progress` gets the seconds collected.
+        """
+        collected = []
+        scanned = 0
+        for chunk in chunks:
+            collected.append(chunk.float())
+            scanned += len(chunk)
+            if on_progress is not None:
+                on_progress(scanned / sample_rate)
+        if not collected:
+            return
+        yield from self.detect_speech(torch.cat(collected), sample_rate)
@@ -1,27 +1,101 @@
 from .logger_component import AppLogger
-from silero_vad import get_speech_timestamps
+from .vad_engine import VADEngine
+from silero_vad import get_speech_timestamps, VADIterator
+import numpy as np
+import os
 import torch
+from typing import Callable, Iterable, Iterator, Optional
 
+# VAD streams over the audio and SLID/ASR start on each interval as it closes
+STREAMING_VAD = os.environ.get("MAC_STREAMING_VAD", "0") == "1"
+# seconds of PCM handed to the streaming VAD at a time
+STREAM_CHUNK_SECONDS = float(os.environ.get("MAC_VAD_STREAM_CHUNK_SECONDS", "10"))
+
+# samples Silero scores per call at 16 kHz
+WINDOW_SAMPLES = 512
+# same defaults get_speech_timestamps applies in detect_speech
+MIN_SILENCE_DURATION_MS = 300
+MIN_SPEECH_DURATION_S = 0.25
+
+# independent stretches of audio scored side by side as one batch, 1 = sequential
+VAD_BATCH_SIZE = int(os.environ.get("MAC_VAD_BATCH_SIZE", "32"))
+# audio each stretch re-reads before its own start so the model state has settled
+VAD_WARMUP_SECONDS = float(os.environ.get("MAC_VAD_WARMUP_SECONDS", "2"))
+
+# skip the neural VAD over long stretches an energy/spectral pre-pass finds silent
+VAD_PREGATE = os.environ.get("MAC_VAD_PREGATE", "1") == "1"
+# frames below this RMS (dBFS) are silent, -60 is digital silence/faint hiss
+PREGATE_SILENCE_DB = float(os.environ.get("MAC_VAD_PREGATE_DB", "-60"))
+# frames whose spectrum is flatter than this are noise: white noise scores ~0.9,
+# voiced speech stays under 0.8 until it is ~10 dB below the noise
+PREGATE_FLATNESS = float(os.environ.get("MAC_VAD_PREGATE_FLATNESS", "0.8"))
+# only silent runs at least this long are skipped
+PREGATE_MIN_SILENCE_S = float(os.environ.get("MAC_VAD_PREGATE_MIN_SILENCE_S", "2"))
+# audio kept on each side of a skipped run, so speech edges and the model state see real context
+PREGATE_MARGIN_S = 0.5
+# frames analysed per FFT call, bounds the pre-pass' memory on long files
+PREGATE_BLOCK_FRAMES = 4096
+
+
+class _ScoredFrames:
+    """
+    Stands in for the model inside get_speech_timestamps and replays frame
+    probabilities scored beforehand, so its thresholds, padding and
+    min-silence handling apply unchanged.
+    """
+
+    def __init__(self, probs: list[float]):
+        self.probs = probs
+        self.index = 0
+
+    def reset_states(self):
+        self.index = 0
+
+    def __call__(self, x: torch.Tensor, sample_rate: int) -> torch.Tensor:
+        prob = self.probs[self.index]
+        self.index += 1
+        return torch.tensor(prob)
+
+
+class VADModel(VADEngine):
+    """The "silero" VAD engine."""
 
-class VADModel:
     def __init__(self, model, logger: AppLogger, prod=False):
-        self.logger = logger
-        self.prod = prod
-        self.model = model
+        super().__init__(model=model, logger=logger, prod=prod)
         self.allowed_sample_rates = [16000]  # silero VAD compatible rates
         self.logger.logger.info("VADModel initialized")
 
     def detect_speech(
-        self, audio_tensor: torch.Tensor, sample_rate: int
+        self,
+        audio_tensor: torch.Tensor,
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+        batch_size: int = VAD_BATCH_SIZE,
+        pregate: bool = VAD_PREGATE,
     ) -> list[dict[str, float]]:
         try:
             self.logger.logger.info("Starting VAD processing")
+            model = self.model
+            regions = self.pregate_regions(audio_tensor, sample_rate) if pregate else None
+            if regions is not None:
+                probs = self.score_regions(
+                    audio_tensor, sample_rate, regions, batch_size, on_progress=on_progress
+                )
+            else:
+                probs = self.score_frames_batched(
+                    audio_tensor, sample_rate, batch_size, on_progress=on_progress
+                )
+            if probs is not None:
+                model = _ScoredFrames(probs)
+                on_progress = None  # already reported while scoring
             speech_timestamps = get_speech_timestamps(
                 audio=audio_tensor,
-                model=self.model,
+                model=model,
                 sampling_rate=sample_rate,
                 return_seconds=True,
-                min_silence_duration_ms=300,
+                min_silence_duration_ms=MIN_SILENCE_DURATION_MS,
+                # called with % of audio scanned, may raise to abort (cancellation)
+                progress_tracking_callback=on_progress,
             )
             log_speech_max_length = 10  # how many segments to log
 
@@ -33,3 +107,298 @@ class VADModel:
         except Exception as e:
             self.logger.logger.error(f"Error during VAD processing: {str(e)}")
             raise
+
+    def version(self, streaming: bool = False) -> str:
+        # "silero_vad" alone is the plain sequential get_speech_timestamps scan
+        if streaming:
+            return "silero_vad/stream"
+        version = "silero_vad"
+        if VAD_BATCH_SIZE > 1:
+            # batched stretches move boundaries by up to ~0.2 s
+            version += f"/batch{VAD_BATCH_SIZE}-warmup{VAD_WARMUP_SECONDS:g}"
+        if VAD_PREGATE:
+            # skipped frames score 0 and each region starts from a fresh state
+            version += (
+                f"/pregate{PREGATE_SILENCE_DB:g}db-flat{PREGATE_FLATNESS:g}"
+                f"-min{PREGATE_MIN_SILENCE_S:g}s-margin{PREGATE_MARGIN_S:g}s"
+            )
+        return version
+
+    @torch.inference_mode()
+    def score_frames_batched(
+        self,
+        audio_tensor: torch.Tensor,
+        sample_rate: int,
+        batch_size: int = VAD_BATCH_SIZE,
+        warmup_seconds: float = VAD_WARMUP_SECONDS,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> Optional[list[float]]:
+        """
+        Speech probability of every 512-sample frame, like get_speech_timestamps
+        computes one frame after another, but scored as `batch_size`
+        independent stretches of the audio in one batched model call per step.
+
+        Each stretch (but the first) starts `warmup_seconds` early and drops
+        those frames' scores, so its recurrent state has settled by the time
+        its own frames come. Returns None when the audio is too short for
+        batching to pay off (the caller then scores sequentially).
+        """
+        if sample_rate != 16000:
+            return None
+        num_frames = -(-audio_tensor.numel() // WINDOW_SAMPLES)
+        warmup = int(warmup_seconds * sample_rate / WINDOW_SAMPLES)
+        # stretches at least a few warm-ups long, or the re-read overhead dominates
+        batch_size = min(batch_size, num_frames // max(1, 4 * warmup))
+        if batch_size < 2:
+            return None
+
+        stretch = -(-num_frames // batch_size)
+        steps = stretch + warmup
+        # stretch 0 starts at frame 0 from a fresh state, exactly like the
+        # sequential scan, and reads on into stretch 1 instead of warming up
+        starts = torch.tensor(
+            [0] + [i * stretch - warmup for i in range(1, batch_size)]
+        )
+
+        full_frames = audio_tensor.numel() // WINDOW_SAMPLES
+        # a view, nothing is copied out of the (possibly memory-mapped) audio
+        frames = audio_tensor[: full_frames * WINDOW_SAMPLES].view(-1, WINDOW_SAMPLES)
+        tail = torch.nn.functional.pad(
+            audio_tensor[full_frames * WINDOW_SAMPLES :].float(),
+            (0, WINDOW_SAMPLES - audio_tensor.numel() % WINDOW_SAMPLES),
+        )
+
+        self.logger.logger.info(
+            f"Scoring {num_frames} VAD frames as {batch_size} stretches of {stretch} (+{warmup} warm-up)"
+        )
+        self.model.reset_states()
+        scores = torch.empty(batch_size, steps)
+        try:
+            for step in range(steps):
+                index = starts + step
+                in_range = index < full_frames
+                batch = frames[torch.where(in_range, index, 0)].float()
+                # past the last full frame: the zero-padded tail once, then silence
+                batch[~in_range] = 0
+                batch[index == full_frames] = tail
+                scores[:, step] = self.model(batch, sample_rate).reshape(-1)
+
+                if on_progress is not None:
+                    on_progress(100 * (step + 1) / steps)
+        finally:
+            self.model.reset_states()
+
+        probs = torch.cat([scores[0, :stretch], scores[1:, warmup:].reshape(-1)])
+        return probs[:num_frames].tolist()
+
+    @staticmethod
+    def silent_frames(audio: np.ndarray) -> np.ndarray:
+        """
+        Per 512-sample frame (the frames Silero scores), True where it is
+        quieter than PREGATE_SILENCE_DB or spectrally flatter than
+        PREGATE_FLATNESS. Vectorized over PREGATE_BLOCK_FRAMES frames at a time.
+        """
+        num_frames = -(-len(audio) // WINDOW_SAMPLES)
+        window = np.hanning(WINDOW_SAMPLES).astype(np.float32)
+        silent = np.empty(num_frames, dtype=bool)
+        for first in range(0, num_frames, PREGATE_BLOCK_FRAMES):
+            block = audio[first * WINDOW_SAMPLES : (first + PREGATE_BLOCK_FRAMES) * WINDOW_SAMPLES]
+            frames = np.pad(block, (0, -len(block) % WINDOW_SAMPLES)).reshape(-1, WINDOW_SAMPLES)
+
+            rms_db = 10 * np.log10(np.mean(frames**2, axis=1) + 1e-12)
+            power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+            # pooled into 32 bands of 250 Hz first, a raw periodogram of white
+            # noise only averages a flatness of ~0.56
+            power = power[:, 1:].reshape(len(frames), 32, -1).mean(axis=2) + 1e-12
+            # geometric over arithmetic mean of the power spectrum
+            flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+            silent[first : first + len(frames)] = (rms_db < PREGATE_SILENCE_DB) | (
+                flatness > PREGATE_FLATNESS
+            )
+        return silent
+
+    @staticmethod
+    def regions_to_score(
+        silent: np.ndarray, min_silence_frames: int, margin_frames: int
+    ) -> list[tuple[int, int]]:
+        """
+        [start, end) frame ranges left for the neural VAD once every silent run
+        of at least `min_silence_frames` is cut out, minus `margin_frames` of
+        it kept on each side. A run touching the start/end of the audio keeps
+        no margin there.
+        """
+        edges = np.diff(np.concatenate([[0], silent.astype(np.int8), [0]]))
+        run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        long_runs = run_ends - run_starts >= min_silence_frames
+
+        regions = []
+        cursor = 0
+        for start, end in zip(run_starts[long_runs], run_ends[long_runs]):
+            skip_from = start + margin_frames if start > 0 else 0
+            skip_to = end - margin_frames if end < len(silent) else end
+            if skip_to <= skip_from:
+                continue
+            if skip_from > cursor:
+                regions.append((cursor, int(skip_from)))
+            cursor = int(skip_to)
+        if cursor < len(silent):
+            regions.append((cursor, len(silent)))
+        return regions
+
+    def pregate_regions(
+        self, audio_tensor: torch.Tensor, sample_rate: int
+    ) -> Optional[list[tuple[int, int]]]:
+        """Frame ranges worth scoring, None when the pre-pass would skip nothing."""
+        if sample_rate != 16000:
+            return None
+        frames_per_s = sample_rate / WINDOW_SAMPLES
+        silent = self.silent_frames(audio_tensor.numpy())
+        regions = self.regions_to_score(
+            silent,
+            min_silence_frames=int(PREGATE_MIN_SILENCE_S * frames_per_s),
+            margin_frames=int(PREGATE_MARGIN_S * frames_per_s),
+        )
+        kept = sum(end - start for start, end in regions)
+        if kept == len(silent):
+            return None
+        self.logger.logger.info(
+            f"VAD pre-gate skips {len(silent) - kept} of {len(silent)} frames as silence, scoring {len(regions)} regions"
+        )
+        return regions
+
+    @torch.inference_mode()
+    def score_regions(
+        self,
+        audio_tensor: torch.Tensor,
+        sample_rate: int,
+        regions: list[tuple[int, int]],
+        batch_size: int = VAD_BATCH_SIZE,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> list[float]:
+        """
+        Frame probabilities for the whole audio with only `regions` run through
+        the model (each from a fresh state, batched where long enough) and 0
+        everywhere else, so get_speech_timestamps still sees absolute positions.
+        """
+        num_frames = -(-audio_tensor.numel() // WINDOW_SAMPLES)
+        probs = np.zeros(num_frames, dtype=np.float32)
+        total = max(sum(end - start for start, end in regions), 1)
+        done = 0
+        for start, end in regions:
+            region = audio_tensor[start * WINDOW_SAMPLES : end * WINDOW_SAMPLES]
+
+            def region_progress(percent: float, done=done, length=end - start):
+                if on_progress is not None:
+                    on_progress(100 * (done + length * percent / 100) / total)
+
+            region_probs = self.score_frames_batched(
+                region, sample_rate, batch_size, on_progress=region_progress
+            )
+            if region_probs is None:
+                region_probs = self.score_frames_sequential(
+                    region, sample_rate, on_progress=region_progress
+                )
+            probs[start:end] = region_probs
+            done += end - start
+        return probs.tolist()
+
+    @torch.inference_mode()
+    def score_frames_sequential(
+        self,
+        audio_tensor: torch.Tensor,
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> list[float]:
+        """Frame probabilities the way get_speech_timestamps scores them, one after another."""
+        self.model.reset_states()
+        probs = []
+        try:
+            for offset in range(0, audio_tensor.numel(), WINDOW_SAMPLES):
+                frame = audio_tensor[offset : offset + WINDOW_SAMPLES].float()
+                if len(frame) < WINDOW_SAMPLES:
+                    frame = torch.nn.functional.pad(frame, (0, WINDOW_SAMPLES - len(frame)))
+                probs.append(self.model(frame, sample_rate).item())
+
+                if on_progress is not None:
+                    on_progress(100 * min(offset + WINDOW_SAMPLES, audio_tensor.numel()) / audio_tensor.numel())
+        finally:
+            self.model.reset_states()
+        return probs
+
+    def stream_speech(
+        self,
+        chunks: Iterable[torch.Tensor],
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> Iterator[dict[str, float]]:
+        """
+        Streaming counterpart of detect_speech built on Silero's VADIterator.
+        Consumes mono PCM `chunks` of any size and yields each speech interval
+        ({"start", "end"} in seconds) as soon as the 300 ms of silence closing
+        it has been seen, so only the current chunk is ever held.
+
+        `on_progress` gets the seconds of audio scanned so far and may raise
+        to abort (cancellation).
+        """
+        iterator = VADIterator(
+            self.model,
+            sampling_rate=sample_rate,
+            min_silence_duration_ms=MIN_SILENCE_DURATION_MS,
+        )
+        self.logger.logger.info("Starting streaming VAD processing")
+
+        pending = torch.empty(0)
+        scanned = 0
+        speech_start = None
+        found = 0
+
+        def on_event(event: Optional[dict], end_of_audio: float) -> Optional[dict]:
+            """Track the open interval, return it once it closes."""
+            nonlocal speech_start, found
+            if event is not None and "start" in event:
+                speech_start = event["start"]
+                return None
+            if event is None or speech_start is None:
+                return None
+            end = min(event["end"], end_of_audio)
+            interval = None
+            # drop blips like get_speech_timestamps' min_speech_duration_ms does
+            if end - speech_start >= MIN_SPEECH_DURATION_S:
+                interval = {"start": speech_start, "end": end}
+                found += 1
+            speech_start = None
+            return interval
+
+        try:
+            for chunk in chunks:
+                pending = torch.cat([pending, chunk.float()])
+                scanned += len(chunk)
+                usable = len(pending) // WINDOW_SAMPLES * WINDOW_SAMPLES
+                for offset in range(0, usable, WINDOW_SAMPLES):
+                    event = iterator(
+                        pending[offset : offset + WINDOW_SAMPLES], return_seconds=True
+                    )
+                    if (interval := on_event(event, scanned / sample_rate)) is not None:
+                        yield interval
+                pending = pending[usable:]
+
+                if on_progress is not None:
+                    on_progress(scanned / sample_rate)
+
+            end_of_audio = round(scanned / sample_rate, 1)
+            if len(pending):
+                # zero-pad the last partial window, as get_speech_timestamps does
+                event = iterator(
+                    torch.nn.functional.pad(pending, (0, WINDOW_SAMPLES - len(pending))),
+                    return_seconds=True,
+                )
+                if (interval := on_event(event, end_of_audio)) is not None:
+                    yield interval
+            # speech running into the end of the audio
+            if (interval := on_event({"end": end_of_audio}, end_of_audio)) is not None:
+                yield interval
+        finally:
+            iterator.reset_states()
+
+        self.logger.logger.info(f"Streaming VAD found {found} speech segments")
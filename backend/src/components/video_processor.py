@@ -4,7 +4,8 @@ from .data_loader import AppDataLoader
 from moviepy import VideoFileClip, TextClip, CompositeVideoClip
 import torch
 from bisect import bisect_right
-import torchaudio.transforms as T
+from .audio_decoder import decode_audio_file, decode_audio_to_pcm_file
+from pathlib import Path
 from ..dataclasses.audio_segment import AudioSegment, unknown_language, unknown_text
 import math
 import numpy as np
@@ -33,8 +34,24 @@ class VideoProcessor:
                         )
                     )
 
+    @staticmethod
+    def pick_sample_rate(
+        allowed_sample_rates: list[int], original_sample_rate: float | None = None
+    ) -> int:
+        # highest allowed rate not above the source's; unknown source rate means "high enough"
+        allowed_sample_rates.sort()
+        if original_sample_rate is None:
+            return allowed_sample_rates[-1]
+        target_sample_rate_ind = max(
+            bisect_right(allowed_sample_rates, original_sample_rate) - 1, 0
+        )
+        return allowed_sample_rates[target_sample_rate_ind]
+
     def extract_audio(
-        self, video: VideoFileClip, allowed_sample_rates: list[int]
+        self,
+        video: VideoFileClip,
+        allowed_sample_rates: list[int],
+        pcm_path: Path | None = None,
     ) -> tuple[int, torch.Tensor]:
         try:
             if video.audio is None:
@@ -43,39 +60,51 @@ class VideoProcessor:
             if not allowed_sample_rates:
                 raise ValueError("allowed_sample_rates cannot be empty")
 
-            # Extract audio as numpy array, audio_array  shape: (n_samples, n_channels) or (n_samples,) for mono
-            audio_array = video.audio.to_soundarray()
+            return self.extract_audio_from_file(
+                video.filename,
+                allowed_sample_rates=allowed_sample_rates,
+                original_sample_rate=video.audio.fps,
+                expected_duration_s=video.duration,
+                pcm_path=pcm_path,
+            )
 
-            # Convert to torch tensor
-            audio_tensor = torch.from_numpy(audio_array).float()
+        except Exception as e:
+            self.logger.logger.error(f"Error extracting audio from video: {str(e)}")
+            raise
 
-            if audio_tensor.ndim == 2:
-                audio_tensor = audio_tensor.mean(
-                    dim=1
-                )  # Convert to mono by averaging channels
-                self.logger.logger.debug(
-                    f"Converted stereo audio to mono for {video.filename}"
+    def extract_audio_from_file(
+        self,
+        path: Path,
+        allowed_sample_rates: list[int],
+        original_sample_rate: float | None = None,
+        expected_duration_s: float | None = None,
+        pcm_path: Path | None = None,
+    ) -> tuple[int, torch.Tensor]:
+        """Same as extract_audio but straight from the file, without opening a VideoFileClip."""
+        try:
+            if not allowed_sample_rates:
+                raise ValueError("allowed_sample_rates cannot be empty")
+
+            # ffmpeg downmixes and resamples while decoding, straight into one float32 buffer
+            # (to_soundarray() would hold the whole track as float64 stereo at the source rate first)
+            target_sample_rate = self.pick_sample_rate(
+                allowed_sample_rates, original_sample_rate
+            )
+            if pcm_path is not None:
+                # memory-mapped, segments become views that page in on demand
+                audio_tensor = decode_audio_to_pcm_file(
+                    path, sample_rate=target_sample_rate, pcm_path=pcm_path
                 )
             else:
-                self.logger.logger.debug(
-                    f"Video audio is already mono for {video.filename}"
+                audio_tensor = decode_audio_file(
+                    path,
+                    sample_rate=target_sample_rate,
+                    expected_duration_s=expected_duration_s,
                 )
 
-            # Resample if necessary
-            original_sample_rate = video.audio.fps
-            allowed_sample_rates.sort()
-            target_sample_rate_ind = max(
-                bisect_right(allowed_sample_rates, original_sample_rate) - 1, 0
-            )
-            target_sample_rate = allowed_sample_rates[target_sample_rate_ind]
-
             if original_sample_rate != target_sample_rate:
-                audio_tensor = T.Resample(
-                    orig_freq=original_sample_rate, new_freq=target_sample_rate
-                )(audio_tensor)
-
                 self.logger.logger.info(
-                    f"Resampled audio from {original_sample_rate} Hz to {target_sample_rate} Hz for {video.filename}"
+                    f"Resampled audio from {original_sample_rate or 'source rate'} Hz to {target_sample_rate} Hz for {path}"
                 )
 
             self.logger.logger.info(
@@ -85,7 +114,7 @@ class VideoProcessor:
             return target_sample_rate, audio_tensor
 
         except Exception as e:
-            self.logger.logger.error(f"Error extracting audio from video: {str(e)}")
+            self.logger.logger.error(f"Error extracting audio from {path}: {str(e)}")
             raise
 
     def segment_audio(
@@ -5,6 +5,7 @@ from ...components.consolidator import Consolidator
 from ...components.slid_model import SLIDModel
 from ...components.asr_model import ASRModel
 from ...components.translater import AppTranslater
+from ...components.encoder_profiles import ENCODER_PROFILES
 
 ALLOWED_LANGS = tuple(
     Consolidator.consolidate_allowed_langs(
@@ -24,6 +25,11 @@ class CaptionInput(BaseModel):
     stroke_width: int = Field(default=4, ge=0, le=10)
     convert_to: str = Field(default="")
     explicit_langs: list[str] = Field(default_factory=list)
+    # "video" burns captions into the video, "video_soft" adds them as a toggleable
+    # subtitle track (stream copy), the others only return timed text
+    output_format: Literal["video", "video_soft", "srt", "vtt", "json"] = "video"
+    # x264 speed/quality trade-off for burned-in video, "" = the deployment default
+    encoder_profile: str = Field(default="")
 
     @field_validator("caption_color")
     @classmethod
@@ -38,3 +44,12 @@ class CaptionInput(BaseModel):
         if v and v not in ALLOWED_LANGS:
             raise ValueError(f"convert_to must be one of {ALLOWED_LANGS}, got '{v}'")
         return v
+
+    @field_validator("encoder_profile")
+    @classmethod
+    def validate_encoder_profile(cls, v: str) -> str:
+        if v and v not in ENCODER_PROFILES:
+            raise ValueError(
+                f"encoder_profile must be one of {list(ENCODER_PROFILES)}, got '{v}'"
+            )
+        return v
@@ -9,5 +9,11 @@ class CaptionStatus(BaseModel):
     status: Status = Status.UNINITIATED
     output_url: Optional[str] = None
     message: Optional[str] = None
+    # live progress while PENDING, see components/progress_reporter.py
+    stage: Optional[str] = None
+    stage_completed: Optional[int] = None
+    stage_total: Optional[int] = None
+    progress: Optional[float] = None
+    eta_seconds: Optional[float] = None
 
 
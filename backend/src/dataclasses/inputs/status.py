@@ -6,3 +6,9 @@ class Status(Enum):
     FAILED = "FAILED"
     COMPLETED = "COMPLETED"
     UNINITIATED = "UNINITIATED"
+    CANCELLED = "CANCELLED"
+
+    @property
+    def is_terminal(self) -> bool:
+        # terminal statuses never change again
+        return self in (Status.COMPLETED, Status.FAILED, Status.CANCELLED)
@@ -0,0 +1,85 @@
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from .bench_streaming_download import make_test_video
+
+# Peak memory / time of audio extraction: the old moviepy to_soundarray() path
+# vs decoding with ffmpeg straight to 16 kHz mono float32. Each run happens in
+# a fresh process so ru_maxrss is that method's own peak.
+
+SAMPLE_RATE = 16000
+
+
+def _extract_soundarray(video_path: Path) -> int:
+    import torch
+    import torchaudio.transforms as T
+    from moviepy import VideoFileClip
+
+    video = VideoFileClip(str(video_path))
+    audio = torch.from_numpy(video.audio.to_soundarray()).float().mean(dim=1)
+    audio = T.Resample(orig_freq=video.audio.fps, new_freq=SAMPLE_RATE)(audio)
+    return audio.numel()
+
+
+def _extract_ffmpeg(video_path: Path) -> int:
+    from moviepy import VideoFileClip
+
+    from ..components.audio_decoder import decode_audio_file
+
+    video = VideoFileClip(str(video_path))
+    audio = decode_audio_file(video_path, SAMPLE_RATE, expected_duration_s=video.duration)
+    return audio.numel()
+
+
+def _measure(method: str, video_path: Path, results):
+    extract = {"soundarray": _extract_soundarray, "ffmpeg": _extract_ffmpeg}[method]
+    # baseline after imports so only the extraction itself is counted
+    import torch  # noqa: F401
+    import moviepy  # noqa: F401
+
+    before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    samples = extract(video_path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((samples, elapsed, (peak_kb - before_kb) / 1024))
+
+
+def run_once(method: str, video_path: Path) -> tuple[int, float, float]:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(method, video_path, results))
+    proc.start()
+    result = results.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark audio extraction memory and time"
+    )
+    parser.add_argument("--input", type=Path, help="video to decode (default: generate one)")
+    parser.add_argument("--duration", type=int, default=1800, help="seconds of generated video")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.input
+        if video is None:
+            video = Path(tmp) / "bench.mp4"
+            print(f"Generating {args.duration}s test video...")
+            make_test_video(video, args.duration)
+
+        for method in ("soundarray", "ffmpeg"):
+            samples, elapsed, peak_mb = run_once(method, video)
+            print(
+                f"{method:>10}: {elapsed:.2f}s, +{peak_mb:.0f} MB peak RSS, {samples} samples"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from .bench_render import make_segments
+from .bench_streaming_download import make_test_video
+from ..components.caption_burner import BurnChunk, CaptionBurner
+from ..components.encoder_profiles import ENCODER_PROFILES
+from ..components.video_processor import VideoProcessor
+
+# Encode fps and output size of each encoder profile, burning the same
+# captions into the same reference clip in a single ffmpeg pass.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark encoder profiles")
+    parser.add_argument("--input", type=Path, help="reference clip (default: generate one)")
+    parser.add_argument("--duration", type=int, default=60, help="seconds of generated video")
+    args = parser.parse_args()
+
+    logger = SimpleNamespace(logger=logging.getLogger("bench"))
+    processor = VideoProcessor(logger=logger)
+    burner = CaptionBurner(logger=logger)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.input
+        if video is None:
+            video = Path(tmp) / "bench.mp4"
+            print(f"Generating {args.duration}s test video...")
+            make_test_video(video, args.duration)
+
+        info = burner.probe_video(video)
+        frames = int(info["duration"] * info["fps"])
+        ass_path = burner.write_ass(
+            make_segments(int(info["duration"])),
+            Path(tmp) / "captions.ass",
+            width=info["width"],
+            height=info["height"],
+            caption_color="#FFFFFF",
+            font_size=48,
+            stroke_width=4,
+            pick_font=processor.pick_font_for_text,
+        )
+
+        source_mb = video.stat().st_size / 2**20
+        print(f"reference: {info['width']}x{info['height']}, {frames} frames, {source_mb:.1f} MB")
+        for name, profile in ENCODER_PROFILES.items():
+            out = Path(tmp) / f"{name}.mp4"
+            start = time.perf_counter()
+            burner.burn(
+                video,
+                [(BurnChunk(start=0.0, end=None), ass_path)],
+                out,
+                fonts_dir=Path(processor.fonts[0]).parent,
+                encoder_profile=profile,
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>9} ({profile.preset}, crf {profile.crf}): {elapsed:.2f}s, "
+                f"{frames / elapsed:.1f} fps, {out.stat().st_size / 2**20:.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
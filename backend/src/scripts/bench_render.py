@@ -0,0 +1,198 @@
+import argparse
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+from .bench_streaming_download import make_test_video
+from ..components.caption_burner import CaptionBurner
+from ..components.video_processor import VideoProcessor
+from ..dataclasses.audio_segment import AudioSegment
+
+# Burn-in throughput (fps) of moviepy compositing vs ffmpeg's ass filter, plus
+# how close the two outputs look: PSNR between them and the caption's bounding
+# box in each, sampled in the middle of a few captions. ffmpeg runs once as a
+# single pass, once split into --chunks parallel encoders and once smart
+# (only GOPs with captions re-encoded, see --speech-fraction).
+
+CAPTIONS = [
+    "Hello and welcome to the show",
+    "This line is long enough that it has to wrap onto a second line at 80% of the width",
+    "こんにちは、元気ですか",
+    "مرحبا بكم",
+]
+
+
+def make_segments(duration_s: int, speech_fraction: float = 1.0) -> list[AudioSegment]:
+    # a caption every 3s over the first `speech_fraction` of the video, silence after
+    segments = []
+    start = 0.5
+    while start + 2 < duration_s * speech_fraction:
+        text = CAPTIONS[len(segments) % len(CAPTIONS)]
+        segments.append(
+            AudioSegment(
+                audio=torch.empty(0),
+                start_time=start,
+                end_time=start + 2,
+                orig_file="bench.mp4",
+                sample_rate=16000,
+                lang="en",
+                text=text,
+            )
+        )
+        start += 3
+    return segments
+
+
+def render_moviepy(processor, video_path, segments, out, **style) -> float:
+    from moviepy import VideoFileClip
+
+    start = time.perf_counter()
+    video = VideoFileClip(str(video_path))
+    captioned = processor.embed_captions(video, segments, **style)
+    # audio handled like save_captioned_disk, so only the video path differs
+    captioned.write_videofile(
+        str(out),
+        codec="libx264",
+        audio=str(video_path),
+        audio_codec="copy",
+        ffmpeg_params=["-map", "0:v:0", "-map", "1:a:0?"],
+        logger=None,
+    )
+    return time.perf_counter() - start
+
+
+def render_ffmpeg(
+    processor, burner, video_path, segments, out, tmp, chunks, smart=False, **style
+) -> float:
+    start = time.perf_counter()
+    info = burner.probe_video(video_path)
+    plan = burner.plan_chunks(
+        video_path,
+        info["duration"],
+        chunks=chunks,
+        audio_segments=segments if smart else None,
+    )
+    scripts = [
+        None
+        if chunk.copy
+        else burner.write_ass(
+            segments,
+            Path(tmp) / f"captions_{i}.ass",
+            width=info["width"],
+            height=info["height"],
+            pick_font=processor.pick_font_for_text,
+            start=chunk.start,
+            end=chunk.end,
+            **style,
+        )
+        for i, chunk in enumerate(plan)
+    ]
+    burner.burn(
+        video_path,
+        list(zip(plan, scripts)),
+        out,
+        fonts_dir=Path(processor.fonts[0]).parent,
+        fps=info["fps"],
+        max_parallel=chunks,
+    )
+    return time.perf_counter() - start
+
+
+def grab_frame(path: Path, t: float, width: int, height: int) -> np.ndarray:
+    raw = subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-ss", f"{t:.3f}", "-i", str(path),
+            "-frames:v", "1", "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1",
+        ],
+        capture_output=True,
+        check=True,
+    ).stdout
+    return np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 3).astype(np.float32)
+
+
+def psnr(a: np.ndarray, b: np.ndarray) -> float:
+    mse = float(np.mean((a - b) ** 2))
+    return float("inf") if mse == 0 else 10 * np.log10(255**2 / mse)
+
+
+def caption_box(frame: np.ndarray, source: np.ndarray) -> tuple[int, int, int, int] | None:
+    # pixels the captions changed noticeably, as (top, bottom, left, right)
+    changed = np.abs(frame - source).max(axis=2) > 48
+    rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+    if rows.size == 0:
+        return None
+    return int(rows[0]), int(rows[-1]), int(cols[0]), int(cols[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark caption burn-in: moviepy compositing vs ffmpeg ass filter"
+    )
+    parser.add_argument("--input", type=Path, help="video to caption (default: generate one)")
+    parser.add_argument("--duration", type=int, default=60, help="seconds of generated video")
+    parser.add_argument("--samples", type=int, default=4, help="captions to compare frames of")
+    parser.add_argument(
+        "--chunks", type=int, default=os.cpu_count() or 1, help="parallel encoders for ffmpeg_chunked/smart"
+    )
+    parser.add_argument(
+        "--speech-fraction", type=float, default=1.0, help="share of the timeline with captions"
+    )
+    args = parser.parse_args()
+
+    logger = SimpleNamespace(logger=logging.getLogger("bench"))
+    processor = VideoProcessor(logger=logger)
+    burner = CaptionBurner(logger=logger)
+    style = {"caption_color": "#FFFFFF", "font_size": 48, "stroke_width": 4}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.input
+        if video is None:
+            video = Path(tmp) / "bench.mp4"
+            print(f"Generating {args.duration}s test video...")
+            make_test_video(video, args.duration)
+
+        info = burner.probe_video(video)
+        frames = int(info["duration"] * info["fps"])
+        segments = make_segments(int(info["duration"]), args.speech_fraction)
+
+        outputs = {}
+        for engine in ("moviepy", "ffmpeg", "ffmpeg_chunked", "ffmpeg_smart"):
+            out = Path(tmp) / f"{engine}.mp4"
+            if engine == "moviepy":
+                elapsed = render_moviepy(processor, video, segments, out, **style)
+            else:
+                chunks = 1 if engine == "ffmpeg" else args.chunks
+                smart = engine == "ffmpeg_smart"
+                elapsed = render_ffmpeg(
+                    processor, burner, video, segments, out, tmp, chunks, smart, **style
+                )
+            outputs[engine] = out
+            print(f"{engine:>14}: {elapsed:.2f}s, {frames / elapsed:.1f} fps")
+
+        w, h = info["width"], info["height"]
+        for seg in segments[: args.samples]:
+            t = (seg.start_time + seg.end_time) / 2
+            source = grab_frame(video, t, w, h)
+            moviepy_frame = grab_frame(outputs["moviepy"], t, w, h)
+            ffmpeg_frame = grab_frame(outputs["ffmpeg"], t, w, h)
+            chunked_frame = grab_frame(outputs["ffmpeg_chunked"], t, w, h)
+            smart_frame = grab_frame(outputs["ffmpeg_smart"], t, w, h)
+            print(
+                f"t={t:6.2f}s PSNR {psnr(moviepy_frame, ffmpeg_frame):5.1f} dB "
+                f"(chunked vs single {psnr(chunked_frame, ffmpeg_frame):5.1f} dB, "
+                f"smart vs single {psnr(smart_frame, ffmpeg_frame):5.1f} dB), "
+                f"caption box moviepy {caption_box(moviepy_frame, source)} "
+                f"ffmpeg {caption_box(ffmpeg_frame, source)}  ({seg.text[:24]})"
+            )
+
+
+if __name__ == "__main__":
+    main()
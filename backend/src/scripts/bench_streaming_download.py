@@ -0,0 +1,152 @@
+import argparse
+import logging
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from ..components.audio_decoder import StreamingAudioDecoder
+from ..components.ranged_download import RangedDownload
+
+# Download + audio decode benchmark against a throttled local S3 stand-in.
+# "sequential" waits for the whole object and then decodes the file (today's
+# path), "streaming" feeds ffmpeg from the ranged download as bytes arrive.
+# Both use the same ranged transfer, so the difference is the overlap.
+
+SAMPLE_RATE = 16000
+
+
+class _ThrottledBody:
+    def __init__(self, f, remaining: int, bytes_per_s: float, latency_s: float):
+        self.f = f
+        self.remaining = remaining
+        self.bytes_per_s = bytes_per_s
+        self.sent = 0
+        time.sleep(latency_s)  # time to first byte
+        self.started = time.monotonic()
+
+    def read(self, n: int = -1) -> bytes:
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        chunk = self.f.read(n)
+        self.remaining -= len(chunk)
+        self.sent += len(chunk)
+        # hold the connection to its bandwidth cap
+        ahead = self.sent / self.bytes_per_s - (time.monotonic() - self.started)
+        if ahead > 0:
+            time.sleep(ahead)
+        if not chunk:
+            self.f.close()
+        return chunk
+
+
+class ThrottledLocalS3:
+    """The slice of the boto3 S3 client RangedDownload uses, serving one local file at `bytes_per_s` per connection."""
+
+    def __init__(self, path: Path, bytes_per_s: float, latency_s: float):
+        self.path = path
+        self.bytes_per_s = bytes_per_s
+        self.latency_s = latency_s
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        return {"ContentLength": self.path.stat().st_size}
+
+    def get_object(self, Bucket: str, Key: str, Range: str) -> dict:
+        start, end = (int(x) for x in Range.removeprefix("bytes=").split("-"))
+        f = open(self.path, "rb")
+        f.seek(start)
+        return {
+            "Body": _ThrottledBody(
+                f, end - start + 1, self.bytes_per_s, self.latency_s
+            )
+        }
+
+
+def make_test_video(path: Path, duration_s: int):
+    # faststart puts the mp4 index up front, which decoding from a pipe needs
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "testsrc=size=1280x720:rate=30",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000",
+            "-t", str(duration_s),
+            "-c:v", "libx264", "-preset", "ultrafast", "-b:v", "4M",
+            "-c:a", "aac", "-ac", "2",
+            "-movflags", "+faststart",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def _iter_file(path: Path, chunk_size: int = 1024 * 1024):
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def run_once(video: Path, s3: ThrottledLocalS3, streaming: bool, concurrency: int) -> float:
+    logger = SimpleNamespace(logger=logging.getLogger("bench"))
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        download = RangedDownload(
+            s3_client=s3,
+            bucket="bench",
+            key=video.name,
+            dest_path=Path(tmp) / video.name,
+            logger=logger,
+            max_concurrency=concurrency,
+        ).start()
+
+        if streaming:
+            decoder = StreamingAudioDecoder(
+                download.iter_bytes(), SAMPLE_RATE, logger
+            ).start()
+            download.wait()
+        else:
+            path = download.wait()
+            decoder = StreamingAudioDecoder(_iter_file(path), SAMPLE_RATE, logger).start()
+
+        audio = decoder.result()
+        elapsed = time.perf_counter() - start
+
+    assert audio.numel() > 0, "decoded no audio"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark sequential vs streaming S3 download + audio decode"
+    )
+    parser.add_argument("--input", type=Path, help="video to serve (default: generate one)")
+    parser.add_argument("--duration", type=int, default=300, help="seconds of generated video")
+    parser.add_argument("--mbps", type=float, default=200, help="bandwidth per connection in Mbit/s")
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.input
+        if video is None:
+            video = Path(tmp) / "bench.mp4"
+            print(f"Generating {args.duration}s test video...")
+            make_test_video(video, args.duration)
+
+        s3 = ThrottledLocalS3(video, args.mbps * 1e6 / 8, args.latency_ms / 1000)
+        size_mb = video.stat().st_size / 1e6
+        print(
+            f"{video.name}: {size_mb:.0f} MB, {args.concurrency} x {args.mbps:.0f} Mbit/s connections"
+        )
+
+        for mode, streaming in (("sequential", False), ("streaming", True)):
+            times = [
+                run_once(video, s3, streaming, args.concurrency)
+                for _ in range(args.repeat)
+            ]
+            best = min(times)
+            print(f"{mode:>10}: best {best:.2f}s  ({size_mb / best:.0f} MB/s end to end)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import torch
+from silero_vad import load_silero_vad
+
+from ..components.audio_decoder import decode_audio_file
+from ..components.vad_model import VAD_WARMUP_SECONDS, VADModel
+
+# VAD wall time scoring frames one after another (batch size 1) vs as batched
+# independent stretches, and how far the detected intervals move.
+
+SAMPLE_RATE = 16000
+SPEECH = Path(__file__).resolve().parent.parent / "tests" / "files" / "japanese.mp3"
+
+
+def make_audio(minutes: int) -> torch.Tensor:
+    speech = decode_audio_file(SPEECH, SAMPLE_RATE)
+    turn = torch.cat([speech, torch.zeros(2 * SAMPLE_RATE)])
+    repeats = -(-minutes * 60 * SAMPLE_RATE // turn.numel())
+    return turn.repeat(repeats)[: minutes * 60 * SAMPLE_RATE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs batched VAD")
+    parser.add_argument("--minutes", type=int, default=30, help="minutes of generated audio")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: torch's)")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    vad = VADModel(
+        model=load_silero_vad(), logger=SimpleNamespace(logger=logging.getLogger("bench"))
+    )
+    audio = make_audio(args.minutes)
+    print(
+        f"{args.minutes} min of audio, {torch.get_num_threads()} threads, "
+        f"{VAD_WARMUP_SECONDS}s warm-up per stretch"
+    )
+
+    start = time.perf_counter()
+    # batching alone, without the silence pre-gate
+    reference = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=False)
+    baseline = time.perf_counter() - start
+    print(f"{'sequential':>10}: {baseline:.2f}s, {len(reference)} intervals")
+
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        intervals = vad.detect_speech(audio, SAMPLE_RATE, batch_size=batch_size, pregate=False)
+        elapsed = time.perf_counter() - start
+        drift = max(
+            (
+                max(abs(a["start"] - b["start"]), abs(a["end"] - b["end"]))
+                for a, b in zip(intervals, reference)
+            ),
+            default=0.0,
+        )
+        print(
+            f"{'batch ' + str(batch_size):>10}: {elapsed:.2f}s ({baseline / elapsed:.1f}x), "
+            f"{len(intervals)} intervals, max boundary drift {drift:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import logging
+import time
+from types import SimpleNamespace
+
+import torch
+from silero_vad import load_silero_vad
+
+from .bench_vad_batched import SAMPLE_RATE, make_audio
+from ..components.cnn_vad_model import CNNVADModel, load_cnn_vad
+from ..components.vad_model import VADModel
+
+# Latency of each VAD engine on the same audio, and how well the CNN's speech
+# intervals agree with Silero's (taken as the reference) on a 10 ms grid.
+
+GRID_S = 0.01
+
+
+def speech_mask(intervals: list[dict[str, float]], duration_s: float) -> torch.Tensor:
+    mask = torch.zeros(int(duration_s / GRID_S) + 1, dtype=torch.bool)
+    for interval in intervals:
+        mask[int(interval["start"] / GRID_S) : int(interval["end"] / GRID_S)] = True
+    return mask
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Silero and CNN VAD engines")
+    parser.add_argument("--minutes", type=int, default=30, help="minutes of generated audio")
+    args = parser.parse_args()
+
+    logger = SimpleNamespace(logger=logging.getLogger("bench"))
+    engines = {
+        "silero": VADModel(model=load_silero_vad(), logger=logger),
+        "cnn": CNNVADModel(model=load_cnn_vad(), logger=logger),
+    }
+    audio = make_audio(args.minutes)
+    duration_s = audio.numel() / SAMPLE_RATE
+    print(f"{args.minutes} min of audio, {torch.get_num_threads()} threads")
+
+    masks = {}
+    for name, engine in engines.items():
+        start = time.perf_counter()
+        intervals = engine.detect_speech(audio, SAMPLE_RATE)
+        elapsed = time.perf_counter() - start
+        masks[name] = speech_mask(intervals, duration_s)
+        print(
+            f"{name:>6}: {elapsed:.2f}s ({duration_s / elapsed:.0f}x realtime), "
+            f"{len(intervals)} intervals, {masks[name].float().mean():.1%} speech"
+        )
+
+    reference, cnn = masks["silero"], masks["cnn"]
+    agreement = (reference == cnn).float().mean()
+    iou = (reference & cnn).sum() / max(int((reference | cnn).sum()), 1)
+    missed = (reference & ~cnn).sum() / max(int(reference.sum()), 1)
+    print(f"agreement {agreement:.1%}, speech IoU {iou:.1%}, Silero speech missed by CNN {missed:.1%}")
+
+
+if __name__ == "__main__":
+    main()
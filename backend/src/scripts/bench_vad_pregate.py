@@ -0,0 +1,58 @@
+import argparse
+import logging
+import time
+from types import SimpleNamespace
+
+import torch
+from silero_vad import load_silero_vad
+
+from .bench_vad_batched import SAMPLE_RATE, SPEECH
+from ..components.audio_decoder import decode_audio_file
+from ..components.vad_model import VADModel
+
+# VAD wall time with and without the energy/spectral pre-gate on silence-heavy
+# audio (speech turns between long gaps of digital silence or white noise, like
+# a screen recording), and whether the detected speech changes.
+
+
+def make_audio(minutes: int, gap_s: float) -> torch.Tensor:
+    speech = decode_audio_file(SPEECH, SAMPLE_RATE)
+    gap = int(gap_s * SAMPLE_RATE)
+    noise = 0.02 * torch.randn(gap, generator=torch.Generator().manual_seed(0))
+    turn = torch.cat([speech, torch.zeros(gap), speech, noise])
+    repeats = -(-minutes * 60 * SAMPLE_RATE // turn.numel())
+    return turn.repeat(repeats)[: minutes * 60 * SAMPLE_RATE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VAD silence pre-gate")
+    parser.add_argument("--minutes", type=int, default=30, help="minutes of generated audio")
+    parser.add_argument("--gap", type=float, default=30, help="seconds of silence/noise between turns")
+    args = parser.parse_args()
+
+    vad = VADModel(
+        model=load_silero_vad(), logger=SimpleNamespace(logger=logging.getLogger("bench"))
+    )
+    audio = make_audio(args.minutes, args.gap)
+    print(f"{args.minutes} min of audio, {args.gap:.0f}s gaps, {torch.get_num_threads()} threads")
+
+    results = {}
+    for pregate in (False, True):
+        start = time.perf_counter()
+        results[pregate] = vad.detect_speech(audio, SAMPLE_RATE, pregate=pregate)
+        elapsed = time.perf_counter() - start
+        print(f"pre-gate {'on ' if pregate else 'off'}: {elapsed:.2f}s, {len(results[pregate])} intervals")
+
+    drift = max(
+        (
+            max(abs(a["start"] - b["start"]), abs(a["end"] - b["end"]))
+            for a, b in zip(results[True], results[False])
+        ),
+        default=0.0,
+    )
+    same = len(results[True]) == len(results[False])
+    print(f"same interval count: {same}, max boundary drift {drift:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from ..app.job_broker import JobBroker, worker_lease_id
+from ..app.worker_pool import WorkerPool
+
+# Throughput benchmark for the inference WorkerPool.
+# Workers run a fixed CPU-bound synthetic job instead of the real pipeline so
+# the numbers reflect the pool's dispatch/scaling and not S3 or model variance.
+
+
+def _bench_worker_main(
+    worker_id: int, stop_event, num_threads: int, db_path: Path, boot_id: str, parent_pid: int
+):
+    broker = JobBroker(db_path)
+    lease_id = worker_lease_id(os.getpid(), boot_id)
+    while not stop_event.is_set():
+        job = broker.claim(lease_id)
+        if job is None:
+            stop_event.wait(0.005)
+            continue
+        try:
+            acc = 0
+            for i in range(job["payload"]["work"]):
+                acc += i * i
+        finally:
+            broker.finish(job["job_id"])
+
+
+def _drain(broker: JobBroker):
+    while True:
+        backlog = broker.backlog()
+        if backlog["queued"] + backlog["running"] == 0:
+            break
+        time.sleep(0.01)
+
+
+def _submit(broker: JobBroker, work: int):
+    broker.submit(
+        job_id=str(uuid4()),
+        payload={"work": work},
+        prod_mode=False,
+        est_cost=work,
+        num_workers=1,
+        max_wait_s=float("inf"),
+    )
+
+
+def run_once(num_workers: int, num_jobs: int, work: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite3"
+        broker = JobBroker(db_path)
+        pool = WorkerPool(
+            num_workers=num_workers,
+            threads_per_worker=1,
+            db_path=db_path,
+            target=_bench_worker_main,
+        )
+        pool.start()
+        # warm-up so process spawn time isn't counted
+        for _ in range(num_workers):
+            _submit(broker, 1)
+        _drain(broker)
+
+        start = time.perf_counter()
+        for _ in range(num_jobs):
+            _submit(broker, work)
+        _drain(broker)
+        elapsed = time.perf_counter() - start
+
+        pool.shutdown(timeout=10)
+    return num_jobs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Largest pool size to benchmark (doubles from 1 up to this)",
+    )
+    parser.add_argument("--jobs", type=int, default=64, help="Jobs per run")
+    parser.add_argument(
+        "--work", type=int, default=2_000_000, help="Loop iterations per job"
+    )
+    args = parser.parse_args()
+
+    sizes = []
+    n = 1
+    while n < args.max_workers:
+        sizes.append(n)
+        n *= 2
+    sizes.append(args.max_workers)
+
+    print(f"{'workers':>8} {'jobs/s':>10} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    for num_workers in sizes:
+        throughput = run_once(num_workers, args.jobs, args.work)
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+        print(
+            f"{num_workers:>8} {throughput:>10.2f} {speedup:>8.2f} {speedup / num_workers:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def logger():
+    # components only ever call .logger on their AppLogger
+    return SimpleNamespace(logger=logging.getLogger("test"))
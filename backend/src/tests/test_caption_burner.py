@@ -0,0 +1,216 @@
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ..components.caption_burner import BurnChunk, CaptionBurner
+from .test_subtitle_writer import make_segment
+
+FONT = str(
+    Path(__file__).resolve().parent.parent.parent / "assets" / "fonts" / "NotoSans-Regular.ttf"
+)
+
+
+@pytest.fixture
+def burner(logger) -> CaptionBurner:
+    return CaptionBurner(logger=logger)
+
+
+def test_ass_color_is_bgr():
+    assert CaptionBurner.ass_color("#FF8000") == "&H000080FF"
+
+
+def test_escape_text():
+    assert CaptionBurner.escape_text(" a {\\b1} b\nc ") == "a \\{\\\u200bb1\\} b\\Nc"
+
+
+def test_to_ass_layout(burner):
+    script = burner.to_ass(
+        [make_segment(0.5, 2.25, "Hello there"), make_segment(3.0, 4.0, "")],
+        width=1920,
+        height=1080,
+        caption_color="#FFFF00",
+        font_size=48,
+        stroke_width=4,
+        pick_font=lambda text: FONT,
+    )
+
+    assert "PlayResX: 1920\nPlayResY: 1080" in script
+    style = next(line for line in script.splitlines() if line.startswith("Style:"))
+    fields = style.split(",")
+    assert fields[0] == "Style: Caption0"
+    assert fields[1] == "Noto Sans"
+    assert float(fields[2]) > 48  # em size scaled up to libass' ascent + descent
+    assert fields[3] == "&H0000FFFF"
+    assert fields[16] == "4"  # outline = stroke_width
+    # bottom center, 10% side margins and 8% bottom margin plus the TextClip margin
+    assert fields[18:22] == ["2", "202", "202", "96"]
+
+    dialogues = [line for line in script.splitlines() if line.startswith("Dialogue:")]
+    assert dialogues == ["Dialogue: 0,0:00:00.50,0:00:02.25,Caption0,,0,0,0,,Hello there"]
+
+
+def test_split_at_keyframes():
+    keyframes = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    chunks = CaptionBurner.split_at_keyframes(keyframes, 11.0, 3, min_chunk_seconds=0)
+    assert chunks == [BurnChunk(0.0, 4.0), BurnChunk(4.0, 8.0), BurnChunk(8.0, None)]
+    # too short to be worth splitting
+    assert CaptionBurner.split_at_keyframes(keyframes, 11.0, 3, min_chunk_seconds=20) == [
+        BurnChunk(0.0, None)
+    ]
+
+
+def test_cut_points_skip_open_gop_keyframes():
+    # decode order: IDR, P, B, B, then an open-GOP I-frame whose leading
+    # B-frames (pts 4, 5) come after it, then a P and a clean IDR
+    framecrc = "\n".join(
+        [
+            "#tb 0: 1/25",
+            "0,         -2,          0,        1,      900, 0x00000000",
+            "0,         -1,          3,        1,      100, 0x00000000, F=0x0",
+            "0,          0,          1,        1,       50, 0x00000000, F=0x0",
+            "0,          1,          2,        1,       50, 0x00000000, F=0x0",
+            "0,          2,          6,        1,      800, 0x00000000",
+            "0,          3,          4,        1,       50, 0x00000000, F=0x0",
+            "0,          4,          5,        1,       50, 0x00000000, F=0x0",
+            "0,          5,          7,        1,      100, 0x00000000, F=0x0",
+            "0,          6,          8,        1,      900, 0x00000000",
+            "0,          7,          9,        1,      100, 0x00000000, F=0x0",
+        ]
+    )
+    assert CaptionBurner.cut_points(framecrc) == [0.0, 8 / 25]
+
+
+def test_smart_render_needs_limited_range_yuv420p():
+    phone = CaptionBurner.parse_color(
+        "Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), "
+        "yuvj420p(pc, bt470bg/bt709/bt709, progressive), 1920x1080 [SAR 1:1 DAR 16:9]"
+    )
+    assert phone == {
+        "pix_fmt": "yuvj420p",
+        "color_range": "pc",
+        "colorspace": "bt470bg",
+        "color_primaries": "bt709",
+        "color_trc": "bt709",
+    }
+    assert not CaptionBurner.can_smart_render({"codec": "h264", "profile": "High", **phone})
+
+    plain = CaptionBurner.parse_color("Video: h264 (High), yuv420p(progressive), 320x240")
+    assert CaptionBurner.can_smart_render({"codec": "h264", "profile": "High", **plain})
+    assert CaptionBurner.color_options(plain) == []
+    assert CaptionBurner.color_options(phone) == [
+        "-colorspace", "bt470bg", "-color_primaries", "bt709", "-color_trc", "bt709",
+    ]
+
+
+def test_split_by_captions():
+    keyframes = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    plan = [BurnChunk(0.0, 6.0), BurnChunk(6.0, None)]
+    segments = [make_segment(0.5, 1.0, "a"), make_segment(4.5, 5.0, "b"), make_segment(9.0, 9.5, "c")]
+    assert CaptionBurner.split_by_captions(plan, keyframes, segments) == [
+        BurnChunk(0.0, 2.0),
+        BurnChunk(2.0, 4.0, copy=True),
+        BurnChunk(4.0, 6.0),
+        BurnChunk(6.0, 8.0, copy=True),
+        BurnChunk(8.0, 10.0),
+        BurnChunk(10.0, None, copy=True),
+    ]
+
+
+def test_to_ass_chunk_is_shifted(burner):
+    script = burner.to_ass(
+        [make_segment(1.0, 2.0, "before"), make_segment(3.5, 4.5, "across")],
+        width=640,
+        height=360,
+        caption_color="#FFFFFF",
+        font_size=24,
+        stroke_width=2,
+        pick_font=lambda text: FONT,
+        start=4.0,
+        end=None,
+    )
+    dialogues = [line for line in script.splitlines() if line.startswith("Dialogue:")]
+    assert dialogues == ["Dialogue: 0,0:00:00.00,0:00:00.50,Caption0,,0,0,0,,across"]
+
+
+def frame_times(path: Path) -> list[float]:
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", str(path), "-map", "0:v:0", "-vf", "showinfo", "-f", "null", "-"],
+        capture_output=True,
+        check=True,
+    )
+    return [float(t) for t in re.findall(r"pts_time:\s*([\d.]+)", result.stderr.decode())]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+@pytest.mark.parametrize("open_gop", [False, True])
+@pytest.mark.parametrize("smart", [False, True])
+def test_chunked_burn_has_continuous_timestamps(tmp_path, burner, smart, open_gop):
+    source = tmp_path / "source.mp4"
+    # a keyframe every second, 3 B-frames; open GOP makes the later ones
+    # non-IDR I-frames with leading B-frames, which can't be cut at
+    x264_params = "bframes=3:scenecut=0" + (":open-gop=1" if open_gop else "")
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "testsrc=size=320x240:rate=25",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000",
+            "-t", "6", "-c:v", "libx264", "-g", "25", "-x264-params", x264_params,
+            "-c:a", "aac",
+            str(source),
+        ],
+        check=True,
+    )
+    segments = [make_segment(1.5, 2.5, "first"), make_segment(1.8, 4.4, "second")]
+    b = burner
+    keyframes = b.keyframe_times(source)
+    assert keyframes == ([0.0] if open_gop else [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+    chunks = CaptionBurner.split_at_keyframes(keyframes, 6.0, 3, min_chunk_seconds=0)
+    if smart:
+        chunks = CaptionBurner.split_by_captions(chunks, keyframes, segments)
+        # [0, 1) and [5, 6) get stream-copied when there are clean cut points
+        expected = [False] if open_gop else [True, False, False, False, True]
+        assert [c.copy for c in chunks] == expected
+    scripts = [
+        None
+        if chunk.copy
+        else b.write_ass(
+            segments,
+            tmp_path / f"chunk_{i}.ass",
+            width=320,
+            height=240,
+            caption_color="#FFFFFF",
+            font_size=24,
+            stroke_width=2,
+            pick_font=lambda text: FONT,
+            start=chunk.start,
+            end=chunk.end,
+        )
+        for i, chunk in enumerate(chunks)
+    ]
+
+    output = b.burn(
+        source,
+        list(zip(chunks, scripts)),
+        tmp_path / "output.mp4",
+        fonts_dir=Path(FONT).parent,
+        fps=25,
+    )
+
+    times = frame_times(output)
+    assert len(times) == len(frame_times(source)) == 150
+    steps = [b - a for a, b in zip(times, times[1:])]
+    assert all(abs(step - 1 / 25) < 1e-3 for step in steps)
+
+    decoded = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-v", "error", "-i", str(output), "-f", "null", "-"],
+        capture_output=True,
+        check=True,
+    )
+    assert decoded.stderr == b""
+    if any(c.copy for c in chunks):
+        # copied and x264 pieces each keep their own SPS/PPS in-band
+        probe = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(output)], capture_output=True)
+        assert b"avc3" in probe.stderr
@@ -0,0 +1,32 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ..components.cnn_vad_model import CNNVADModel, load_cnn_vad
+
+SPEECH = Path(__file__).resolve().parent / "files" / "japanese.mp3"
+
+
+def test_intervals_from_patches():
+    # patch i covers hops i and i+1 (0.32 s each), a hop needs every covering patch
+    speech = [False, True, True, True, False, False, True, True]
+    assert CNNVADModel.intervals_from_patches(speech, 3.0) == [
+        {"start": 0.6, "end": 1.3},
+        {"start": 2.2, "end": 2.9},
+    ]
+    # a run still open at the last patch ends with it, capped at the audio length
+    assert CNNVADModel.intervals_from_patches([True, True], 0.9) == [{"start": 0.0, "end": 0.9}]
+    assert CNNVADModel.intervals_from_patches([], 0.1) == []
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_shipped_model_finds_speech(logger):
+    from ..components.audio_decoder import decode_audio_file
+
+    audio = decode_audio_file(SPEECH, 16000)
+    vad = CNNVADModel(model=load_cnn_vad(), logger=logger)
+    intervals = vad.detect_speech(audio, 16000)
+
+    assert intervals
+    assert all(0 <= i["start"] < i["end"] <= round(audio.numel() / 16000, 1) for i in intervals)
@@ -0,0 +1,44 @@
+from uuid import uuid4
+
+from ..app import job_broker
+from ..app.job_broker import JobBroker, worker_lease_id
+
+
+def submit(broker: JobBroker) -> str:
+    job_id = str(uuid4())
+    broker.submit(
+        job_id=job_id,
+        payload={},
+        prod_mode=False,
+        est_cost=1,
+        num_workers=1,
+        max_wait_s=float("inf"),
+    )
+    return job_id
+
+
+def test_lease_is_held_by_one_worker_process(tmp_path):
+    broker = JobBroker(tmp_path / "broker.sqlite3")
+    job_id = submit(broker)
+    # same pool slot, different process: the replacement must not touch the orphan's lease
+    orphan, replacement = worker_lease_id(101, "aaaa"), worker_lease_id(202, "bbbb")
+
+    assert broker.claim(orphan)["job_id"] == job_id
+    assert broker.heartbeat(job_id, orphan)
+    assert not broker.heartbeat(job_id, replacement)
+    assert not broker.finish(job_id, worker_id=replacement)
+    assert broker.finish(job_id, worker_id=orphan)
+
+
+def test_takeover_requeues_only_expired_leases(tmp_path, monkeypatch):
+    broker = JobBroker(tmp_path / "broker.sqlite3")
+    live, stale = submit(broker), submit(broker)
+    broker.claim(worker_lease_id(101, "aaaa"))
+    monkeypatch.setattr(job_broker, "LEASE_SECONDS", -1)
+    broker.claim(worker_lease_id(102, "aaaa"))  # lease already expired
+
+    assert broker.requeue_expired() == 1
+    assert broker.backlog()["running"] == 1
+    assert broker.claim(worker_lease_id(303, "cccc"))["job_id"] == stale
+    # the live job was left running under its worker's lease
+    assert broker.finish(live, worker_id=worker_lease_id(101, "aaaa"))
@@ -0,0 +1,73 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ..components.subtitle_muxer import SubtitleMuxer
+from ..components.subtitle_writer import SubtitleWriter
+from .test_subtitle_writer import make_segment
+
+
+def test_no_cues_keeps_original(tmp_path, logger):
+    segments = [make_segment(0.5, 2.0, ""), make_segment(3.0, 4.0, "")]
+    srt_path = SubtitleWriter(logger=logger).write(segments, "srt", tmp_path / "captions.srt")
+    video_path = tmp_path / "source.mp4"
+
+    output = SubtitleMuxer(logger=logger).mux(video_path, srt_path, tmp_path / "output.mp4")
+
+    assert output == video_path
+    assert not (tmp_path / "output.mp4").exists()
+
+
+@pytest.mark.parametrize("suffix", [".avi", ".flv", ".wmv", ".AVI"])
+def test_output_suffix_falls_back_to_mkv(suffix):
+    assert SubtitleMuxer.output_suffix(Path("upload" + suffix)) == ".mkv"
+    assert SubtitleMuxer.output_suffix(Path("upload.MP4")) == ".mp4"
+
+
+def packet_hashes(path: Path, stream: str) -> list[str]:
+    # one md5 per packet, timestamps left out since containers rescale them
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", str(path), "-map", stream, "-c", "copy", "-f", "framemd5", "-"],
+        capture_output=True,
+        check=True,
+    )
+    lines = result.stdout.decode().splitlines()
+    return [line.rsplit(",", 1)[1].strip() for line in lines if not line.startswith("#")]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+@pytest.mark.parametrize(
+    "source_suffix, audio_codec, subtitle_codec",
+    [(".mp4", "aac", "mov_text"), (".mkv", "aac", "subrip"), (".avi", "pcm_s16le", "subrip")],
+)
+def test_mux_adds_track_and_copies_streams(
+    tmp_path, logger, source_suffix, audio_codec, subtitle_codec
+):
+    source = tmp_path / f"source{source_suffix}"
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "testsrc=size=320x240:rate=25",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000",
+            "-t", "3", "-c:v", "libx264", "-c:a", audio_codec,
+            str(source),
+        ],
+        check=True,
+    )
+    segments = [make_segment(0.5, 1.5, "Hello there"), make_segment(2.0, 2.5, "General")]
+    srt_path = SubtitleWriter(logger=logger).write(segments, "srt", tmp_path / "captions.srt")
+    m = SubtitleMuxer(logger=logger)
+
+    output = m.mux(source, srt_path, tmp_path / f"output{m.output_suffix(source)}")
+
+    assert output.suffix == (".mp4" if source_suffix == ".mp4" else ".mkv")
+    probe = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(output)], capture_output=True)
+    assert f"Subtitle: {subtitle_codec}".encode() in probe.stderr
+    if source_suffix == ".avi":
+        # avi keeps h264 in Annex B, which mkv stores length-prefixed: same
+        # frames, different packet bytes
+        return
+    for stream in ("0:v:0", "0:a:0"):
+        assert packet_hashes(output, stream) == packet_hashes(source, stream)
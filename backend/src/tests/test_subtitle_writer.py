@@ -0,0 +1,57 @@
+import json
+
+import pytest
+import torch
+
+from ..components.subtitle_writer import SubtitleWriter
+from ..dataclasses.audio_segment import AudioSegment
+
+
+def make_segment(start: float, end: float, text: str, lang: str = "en") -> AudioSegment:
+    return AudioSegment(
+        audio=torch.empty(0),
+        start_time=start,
+        end_time=end,
+        orig_file="test.mp4",
+        sample_rate=16000,
+        lang=lang,
+        text=text,
+    )
+
+
+SEGMENTS = [
+    make_segment(0.5, 2.25, "Hello there"),
+    make_segment(3.0, 4.0, ""),  # silence after cleaning, gets no cue
+    make_segment(3661.007, 3662.5, "こんにちは", lang="ja"),
+]
+
+
+@pytest.fixture
+def writer(logger) -> SubtitleWriter:
+    return SubtitleWriter(logger=logger)
+
+
+def test_srt(writer):
+    assert writer.to_srt(SEGMENTS) == (
+        "1\n00:00:00,500 --> 00:00:02,250\nHello there\n"
+        "\n"
+        "2\n01:01:01,007 --> 01:01:02,500\nこんにちは\n"
+    )
+
+
+def test_vtt(writer):
+    assert writer.to_vtt(SEGMENTS) == (
+        "WEBVTT\n"
+        "\n"
+        "00:00:00.500 --> 00:00:02.250\nHello there\n"
+        "\n"
+        "01:01:01.007 --> 01:01:02.500\nこんにちは\n"
+    )
+
+
+def test_json(writer):
+    data = json.loads(writer.to_json(SEGMENTS))
+    assert data["segments"] == [
+        {"start": 0.5, "end": 2.25, "lang": "en", "text": "Hello there"},
+        {"start": 3661.007, "end": 3662.5, "lang": "ja", "text": "こんにちは"},
+    ]
@@ -0,0 +1,70 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import torch
+from silero_vad import load_silero_vad
+
+from ..components.audio_decoder import decode_audio_file
+from ..components.vad_model import VADModel
+
+SPEECH = Path(__file__).resolve().parent / "files" / "japanese.mp3"
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture(scope="module")
+def audio() -> torch.Tensor:
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("needs ffmpeg")
+    speech = decode_audio_file(SPEECH, SAMPLE_RATE)
+    silence = torch.zeros(int(1.5 * SAMPLE_RATE))
+    # ~1 min of speech/silence turns, long enough to be split into stretches
+    return torch.cat([torch.cat([speech, silence]) for _ in range(8)])
+
+
+@pytest.fixture(scope="module")
+def vad(logger) -> VADModel:
+    return VADModel(model=load_silero_vad(), logger=logger)
+
+
+def test_batched_scores_match_sequential(vad, audio):
+    sequential = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=False)
+    batched = vad.detect_speech(audio, SAMPLE_RATE, batch_size=8, pregate=False)
+
+    assert sequential, "test audio should contain speech"
+    assert len(batched) == len(sequential)
+    for b, s in zip(batched, sequential):
+        assert abs(b["start"] - s["start"]) <= 0.2
+        assert abs(b["end"] - s["end"]) <= 0.2
+
+
+def test_stream_speech_matches_batch(vad, audio):
+    # odd sizes, most of them not a multiple of the 512-sample window
+    sizes = [1000, 512, 4097, 333, 16000, 7]
+    chunks, offset = [], 0
+    while offset < audio.numel():
+        size = sizes[len(chunks) % len(sizes)]
+        chunks.append(audio[offset : offset + size])
+        offset += size
+
+    streamed = list(vad.stream_speech(iter(chunks), SAMPLE_RATE))
+    vad.model.reset_states()
+    batch = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=False)
+
+    assert batch, "test audio should contain speech"
+    # same rules, but VADIterator pads and rounds (to 0.1 s) per event, so
+    # boundaries may land a step or two apart
+    assert len(streamed) == len(batch)
+    for s, b in zip(streamed, batch):
+        assert abs(s["start"] - b["start"]) <= 0.2
+        assert abs(s["end"] - b["end"]) <= 0.2
+
+
+def test_first_stretch_is_exact(vad, audio):
+    probs = vad.score_frames_batched(audio, SAMPLE_RATE, batch_size=8, warmup_seconds=1)
+    assert probs is not None and len(probs) == -(-audio.numel() // 512)
+
+    vad.model.reset_states()
+    with torch.inference_mode():
+        first = [vad.model(audio[i * 512 : (i + 1) * 512], SAMPLE_RATE).item() for i in range(100)]
+    assert probs[:100] == pytest.approx(first, abs=1e-4)
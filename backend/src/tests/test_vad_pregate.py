@@ -0,0 +1,97 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+
+from ..components.vad_model import VADModel
+
+SPEECH = Path(__file__).resolve().parent / "files" / "japanese.mp3"
+SAMPLE_RATE = 16000
+
+
+def test_silent_frames():
+    n = 32 * 512  # whole frames, a zero-padded last frame would be quieter
+    t = np.arange(n, dtype=np.float32) / SAMPLE_RATE
+    # harmonic-rich, like voiced speech
+    voiced = sum(0.1 / k * np.sin(2 * np.pi * 130 * k * t) for k in range(1, 25))
+    noise = 0.05 * np.random.default_rng(0).standard_normal(n)
+
+    assert VADModel.silent_frames(np.zeros(n, dtype=np.float32)).all()
+    assert VADModel.silent_frames(noise.astype(np.float32)).all()
+    assert not VADModel.silent_frames(voiced.astype(np.float32)).any()
+    assert not VADModel.silent_frames((voiced + noise).astype(np.float32)).any()
+
+
+def test_regions_to_score():
+    silent = np.array([0] * 10 + [1] * 100 + [0] * 10 + [1] * 5 + [0] * 3 + [1] * 50, dtype=bool)
+    # the 100-frame run is skipped but for 15 frames each side, the 50-frame run is too short
+    assert VADModel.regions_to_score(silent, min_silence_frames=60, margin_frames=15) == [
+        (0, 25),
+        (95, 178),
+    ]
+    # trailing run: no margin kept after it
+    assert VADModel.regions_to_score(silent, min_silence_frames=40, margin_frames=15) == [
+        (0, 25),
+        (95, 143),
+    ]
+    assert VADModel.regions_to_score(np.ones(10, dtype=bool), 5, 2) == []
+    assert VADModel.regions_to_score(np.zeros(10, dtype=bool), 5, 2) == [(0, 10)]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_pregate_keeps_detected_speech(logger):
+    from silero_vad import load_silero_vad
+
+    from ..components.audio_decoder import decode_audio_file
+
+    speech = decode_audio_file(SPEECH, SAMPLE_RATE)
+    silence = torch.zeros(10 * SAMPLE_RATE)
+    noise = 0.05 * torch.randn(10 * SAMPLE_RATE, generator=torch.Generator().manual_seed(0))
+    audio = torch.cat([silence, speech, silence, speech, noise, speech, silence])
+
+    vad = VADModel(model=load_silero_vad(), logger=logger)
+    assert vad.pregate_regions(audio, SAMPLE_RATE) is not None
+
+    gated = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=True)
+    full = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=False)
+    assert full
+    assert len(gated) == len(full)
+    for g, f in zip(gated, full):
+        assert abs(g["start"] - f["start"]) <= 0.1
+        assert abs(g["end"] - f["end"]) <= 0.1
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_pregate_keeps_speech_under_noise(logger):
+    from silero_vad import load_silero_vad
+
+    from ..components.audio_decoder import decode_audio_file
+
+    speech = decode_audio_file(SPEECH, SAMPLE_RATE)
+    lead = 10 * SAMPLE_RATE
+    # the same 0.05-std noise the flatness gate skips on its own, now under the speech too
+    audio = 0.05 * torch.randn(lead + len(speech) + lead, generator=torch.Generator().manual_seed(0))
+    audio[lead : lead + len(speech)] += speech
+
+    vad = VADModel(model=load_silero_vad(), logger=logger)
+    regions = vad.pregate_regions(audio, SAMPLE_RATE)
+    assert regions is not None, "the noise-only lead-in and tail should be skipped"
+
+    full = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=False)
+    assert full
+    # every interval the full scan finds lies in a region the pre-gate scores
+    seconds_per_frame = 512 / SAMPLE_RATE
+    for interval in full:
+        assert any(
+            start * seconds_per_frame <= interval["start"] + 0.1
+            and interval["end"] - 0.1 <= end * seconds_per_frame
+            for start, end in regions
+        )
+
+    gated = vad.detect_speech(audio, SAMPLE_RATE, batch_size=1, pregate=True)
+    assert len(gated) == len(full)
+    for g, f in zip(gated, full):
+        assert abs(g["start"] - f["start"]) <= 0.1
+        assert abs(g["end"] - f["end"]) <= 0.1
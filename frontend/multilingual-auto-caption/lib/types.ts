@@ -6,6 +6,11 @@ export interface CaptionInput {
   stroke_width?: number
   convert_to?: string
   explicit_langs?: string[]
+  // "video" burns captions in, "video_soft" adds a toggleable subtitle track,
+  // the others return only a subtitle file
+  output_format?: "video" | "video_soft" | "srt" | "vtt" | "json"
+  // x264 speed/quality trade-off for burned-in video, server default if omitted
+  encoder_profile?: "fast" | "balanced" | "archive"
 }
 
 // Mirroring backend/src/dataclasses/inputs/presigned.py
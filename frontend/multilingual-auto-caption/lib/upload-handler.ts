@@ -14,9 +14,14 @@ export interface UploadResponse {
 
 export interface JobStatus {
   job_id: string
-  status: "PENDING" | "COMPLETED" | "FAILED" | "UNINITIATED"
+  status: "PENDING" | "COMPLETED" | "FAILED" | "UNINITIATED" | "CANCELLED"
   message?: string
   output_url?: string
+  stage?: string
+  stage_completed?: number
+  stage_total?: number
+  progress?: number
+  eta_seconds?: number
 }
 
 export async function checkBackendHealth(): Promise<boolean> {
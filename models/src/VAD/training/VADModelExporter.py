@@ -0,0 +1,99 @@
+import copy
+import time
+import torch
+from torch.utils.data import DataLoader
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+from pathlib import Path
+
+class VADModelExporter:
+    """
+    Exports the trained VADModel as TorchScript, float32 and statically quantized int8,
+    so the backend can run it with torch.jit.load and without the Python model class.
+    """
+    def __init__(self, model, calibration_ds_path, test_ds_path, logger, batch_size, max_accuracy_drop: float = 0.01, num_calibration_batches: int = 32):
+        self.logger = logger
+        self.batch_size = batch_size
+        self.max_accuracy_drop = max_accuracy_drop
+        self.num_calibration_batches = num_calibration_batches
+
+        # exports are for CPU inference, leave the trainer's copy where it is
+        self.model = copy.deepcopy(model).cpu().eval()
+        self.example_input = torch.zeros(1, 1, 40, 40)
+
+        try:
+            assert Path(calibration_ds_path).is_file(), f"Calibration dataset file not found at {calibration_ds_path}"
+            assert Path(test_ds_path).is_file(), f"Test dataset file not found at {test_ds_path}"
+            calibration_ds = torch.utils.data.TensorDataset(*torch.load(calibration_ds_path, weights_only=True))
+            test_ds = torch.utils.data.TensorDataset(*torch.load(test_ds_path, weights_only=True))
+            self.calibration_dl = DataLoader(calibration_ds, batch_size=self.batch_size, shuffle=True)
+            self.test_dl = DataLoader(test_ds, batch_size=self.batch_size, shuffle=False)
+        except Exception as e:
+            self.logger.log(f"Error loading .pt files at {calibration_ds_path} or {test_ds_path}: {e}")
+            raise
+
+    def export(self, export_dir: Path) -> dict[str, Path]:
+        """Writes vad_model.ts and vad_model_int8.ts, after checking neither loses too much test accuracy."""
+        export_dir.mkdir(parents=True, exist_ok=True)
+        exported = {
+            "float32": torch.jit.trace(self.model, self.example_input),
+            "int8": torch.jit.trace(self.quantize(), self.example_input),
+        }
+
+        baseline = self.evaluate(self.model)
+        self.logger.log(f"Export baseline test accuracy: {baseline:.4f}")
+        for name, module in exported.items():
+            accuracy = self.evaluate(module)
+            self.logger.log(f"Export {name} test accuracy: {accuracy:.4f} (drop {baseline - accuracy:.4f})")
+            if baseline - accuracy > self.max_accuracy_drop:
+                raise RuntimeError(f"{name} export loses {baseline - accuracy:.4f} test accuracy, more than the allowed {self.max_accuracy_drop}")
+
+        paths = {}
+        for name, module in exported.items():
+            path = export_dir / ("vad_model.ts" if name == "float32" else f"vad_model_{name}.ts")
+            torch.jit.save(module, str(path))
+            self.logger.log(f"Exported {name} TorchScript model to {path}")
+            paths[name] = path
+
+        for name, module in exported.items():
+            for batch_size, ms in self.benchmark(module).items():
+                self.logger.log(f"Export {name} CPU latency at batch {batch_size}: {ms:.2f} ms ({ms / batch_size:.3f} ms/patch)")
+        return paths
+
+    def quantize(self) -> torch.nn.Module:
+        """Post-training static int8 quantization, calibrated on a few batches of the calibration split."""
+        # dynamic quantization would only cover the final Linear, the convolutions are where the time goes
+        qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+        prepared = prepare_fx(copy.deepcopy(self.model), qconfig_mapping, example_inputs=(self.example_input,))
+        with torch.no_grad():
+            for i, (x_batch, _) in enumerate(self.calibration_dl):
+                if i == self.num_calibration_batches:
+                    break
+                prepared(x_batch)
+        return convert_fx(prepared)
+
+    def evaluate(self, model) -> float:
+        test_acc = 0.0
+        tot_samples = 0
+        with torch.no_grad():
+            for x_batch, y_batch in self.test_dl:
+                y_batch = y_batch.squeeze(1)
+
+                pred = model(x_batch)[:, 0]
+                is_correct = ((pred>=0.5).float() == y_batch).float()
+                test_acc += is_correct.sum().item()
+                tot_samples += y_batch.size(0)
+        return test_acc / tot_samples
+
+    def benchmark(self, model, batch_sizes: tuple[int, ...] = (1, 32, 256, 1024), repeats: int = 20) -> dict[int, float]:
+        """Mean milliseconds per forward pass on CPU for each batch size."""
+        latencies = {}
+        with torch.no_grad():
+            for batch_size in batch_sizes:
+                x = torch.randn(batch_size, 1, 40, 40)
+                model(x)  # warm-up
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    model(x)
+                latencies[batch_size] = (time.perf_counter() - start) / repeats * 1000
+        return latencies
@@ -9,6 +9,7 @@ from .VADPipelineLogger import VADPipelineLogger
 from .MelSpecPipeline import MelSpecPipeline
 from .VADModel import VADModel
 from .VADModelTrainer import VADModelTrainer
+from .VADModelExporter import VADModelExporter
 
 import torch
 from torch.utils.data import TensorDataset
@@ -36,7 +37,10 @@ class VADPipeline(VADPipelineAbstractClass):
     
     model: VADModel = VADModel()
     model_definition_path: Path = Path(__file__).resolve().parent / "VADModel.py"
+    mel_spec_definition_path: Path = Path(__file__).resolve().parent / "MelSpecPipeline.py"
     model_weight_save_path: Path = Path(__file__).resolve().parent.parent / "data" / "vad_model.pth"
+    model_export_dir: Path = Path(__file__).resolve().parent.parent / "data"
+    model_export_paths: dict[str, Path] = {}
     
     backend_model_root: Path = Path(__file__).resolve().parent.parent.parent.parent.parent / "backend" / "model"
     
@@ -312,6 +316,7 @@ class VADPipeline(VADPipelineAbstractClass):
         self.logger.blog_save_model()
 
         self.trainer.save_model(self.model_weight_save_path)
+        self._export_model()
 
         self.tester.atest_save_model(self)
         self.logger.alog_save_model()
@@ -319,6 +324,17 @@ class VADPipeline(VADPipelineAbstractClass):
         self._copy_model_to_backend()
         self.logger.log("Model copied to backend successfully.")
     
+    def _export_model(self) -> None:
+        """Exports TorchScript float32 + int8 variants of the model next to its weights"""
+        exporter = VADModelExporter(
+            model=self.model,
+            calibration_ds_path=str(self.preprocessed_files[1]),
+            test_ds_path=str(self.preprocessed_files[2]),
+            logger=self.logger.logger,
+            batch_size=256
+        )
+        self.model_export_paths = exporter.export(self.model_export_dir)
+
     def _copy_model_to_backend(self):
         """Copies model weights + model definition into backend for inference use."""
         backend_root = self.backend_model_root
@@ -332,10 +348,16 @@ class VADPipeline(VADPipelineAbstractClass):
         shutil.copy2(src_weights, dst_weights)
         self.logger.log(f"Copied model weights to backend at {dst_weights}")
 
-        # Copy model definition file
-        src_def = self.model_definition_path
-        dst_def = backend_root / src_def.name  # "VADModel.py"
-        if not src_def.exists():
-            raise FileNotFoundError(f"Model definition not found at {src_def}")
-        shutil.copy2(src_def, dst_def)
-        self.logger.log(f"Copied model definition to backend at {dst_def}")
\ No newline at end of file
+        # Copy model definition files, the backend's CNN VAD engine needs the mel front end too
+        for src_def in (self.model_definition_path, self.mel_spec_definition_path):
+            dst_def = backend_root / src_def.name  # "VADModel.py", "MelSpecPipeline.py"
+            if not src_def.exists():
+                raise FileNotFoundError(f"Model definition not found at {src_def}")
+            shutil.copy2(src_def, dst_def)
+            self.logger.log(f"Copied model definition to backend at {dst_def}")
+
+        # Copy TorchScript exports, which the backend prefers over the state_dict
+        for src_export in self.model_export_paths.values():
+            dst_export = backend_root / src_export.name
+            shutil.copy2(src_export, dst_export)
+            self.logger.log(f"Copied exported model to backend at {dst_export}")
\ No newline at end of file
@@ -0,0 +1,15 @@
+import torch
+
+from .VADPipeline import VADPipeline
+
+def main():
+    # re-export the saved weights without retraining, needs the preprocessed splits
+    pipeline = VADPipeline()
+    pipeline.model.load_state_dict(torch.load(pipeline.model_weight_save_path, map_location="cpu", weights_only=True))
+    pipeline._export_model()
+    pipeline._copy_model_to_backend()
+
+    print("Finished exporting model")
+
+if __name__ == '__main__':
+    main()
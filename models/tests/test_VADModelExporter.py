@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import torch
+
+from ..src.VAD.training.VADModel import VADModel
+from ..src.VAD.training.VADModelExporter import VADModelExporter
+
+def _exporter(tmp_path):
+    torch.manual_seed(0)
+    ds_path = tmp_path / "ds.pt"
+    X = torch.rand(64, 1, 40, 40)
+    y = torch.randint(0, 2, (64, 1)).float()
+    torch.save((X, y), ds_path)
+    return VADModelExporter(
+        model=VADModel(),
+        calibration_ds_path=str(ds_path),
+        test_ds_path=str(ds_path),
+        logger=SimpleNamespace(log=lambda text: None),
+        batch_size=16,
+        # random weights, the accuracy check itself is not under test here
+        max_accuracy_drop=1.0
+    )
+
+def test_export_round_trip(tmp_path):
+    exporter = _exporter(tmp_path)
+    paths = exporter.export(tmp_path / "export")
+    assert sorted(p.name for p in paths.values()) == ["vad_model.ts", "vad_model_int8.ts"]
+
+    x = torch.rand(8, 1, 40, 40)
+    with torch.no_grad():
+        expected = exporter.model(x)
+        float_out = torch.jit.load(str(paths["float32"]))(x)
+        int8_out = torch.jit.load(str(paths["int8"]))(x)
+    assert torch.allclose(float_out, expected, atol=1e-6)
+    assert torch.allclose(int8_out, expected, atol=0.1)
+
+def test_benchmark_covers_batch_sizes(tmp_path):
+    exporter = _exporter(tmp_path)
+    latencies = exporter.benchmark(exporter.model, batch_sizes=(1, 4), repeats=2)
+    assert set(latencies) == {1, 4} and all(ms > 0 for ms in latencies.values())